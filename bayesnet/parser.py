@@ -1,10 +1,24 @@
 import os
+from functools import lru_cache
+from typing import Optional
 from lark import Lark
+import settings
+from utils import build_lalr_parser
 from .transformer import NetworkTransformer
 
 GRAMMAR_FILE_PATH = os.path.dirname(os.path.abspath(__file__)) + "/bif-syntax.lark"
 
 
+@lru_cache(maxsize=None)
+def get_lark_parser(cpt_tolerance: float, cache_dir: Optional[str] = None) -> Lark:
+    """
+    Returns the LALR parser for BIF files. It is only built once per process, tolerance and cache directory.
+    """
+    return build_lalr_parser(
+        GRAMMAR_FILE_PATH, NetworkTransformer(cpt_tolerance), cache_dir
+    )
+
+
 class BifParser:
     """
     Parsers which takes a .bif source file and returns the program into internal representation."
@@ -21,11 +35,6 @@ class BifParser:
 
     def parse_file(self, filepath: str):
         with open(filepath) as file:
-            with open(GRAMMAR_FILE_PATH) as grammar_file:
-                parser = Lark(
-                    grammar_file,
-                    transformer=NetworkTransformer(self.cpt_tolerance),
-                    parser="lalr",
-                )
-                network = parser.parse(file.read())
+            parser = get_lark_parser(self.cpt_tolerance, settings.cache_dir)
+            network = parser.parse(file.read())
         return network
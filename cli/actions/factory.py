@@ -1,20 +1,14 @@
 from argparse import Namespace
 
-from cli.actions.termination_action import TerminationAction
-
-from .bayesian_network_action import BayesNetworkAction
-from .sensitivity_action import SensitivityAction
-from .simulation_action import Action, SimulationAction
-from .plot_action import PlotAction
-from .gram_charlier_action import GramCharlierAction
-from .cornish_fisher_action import CornishFisherAction
-from .synth_unsolv_inv_action import SynthUnsolvInvAction
-from .print_benchmark_action import PrintBenchmarkAction
-from .synth_solv_loop_action import SynthSolvLoopAction
-from .goals_action import GoalsAction
+from .action import Action
 
 
 class ActionFactory:
+    """
+    Creates the action selected by the CLI arguments. The action modules are only imported once they are
+    selected, such that the heavy dependencies of other actions (e.g. matplotlib for plots) are never loaded.
+    """
+
     @classmethod
     def create_action(cls, cli_args: Namespace) -> Action:
         if (
@@ -22,23 +16,45 @@ class ActionFactory:
             or cli_args.exact_inference
             or cli_args.bif_to_prob
         ):
+            from .bayesian_network_action import BayesNetworkAction
+
             return BayesNetworkAction(cli_args)
         if cli_args.simulate:
+            from .simulation_action import SimulationAction
+
             return SimulationAction(cli_args)
         if cli_args.sensitivity_analysis or cli_args.sensitivity_analysis_diff:
+            from .sensitivity_action import SensitivityAction
+
             return SensitivityAction(cli_args)
         if cli_args.goals or cli_args.invariants:
+            from .goals_action import GoalsAction
+
             return GoalsAction(cli_args)
         if cli_args.plot:
+            from .plot_action import PlotAction
+
             return PlotAction(cli_args)
         if cli_args.gram_charlier:
+            from .gram_charlier_action import GramCharlierAction
+
             return GramCharlierAction(cli_args)
         if cli_args.cornish_fisher:
+            from .cornish_fisher_action import CornishFisherAction
+
             return CornishFisherAction(cli_args)
         if cli_args.synth_unsolv_inv is not None:
+            from .synth_unsolv_inv_action import SynthUnsolvInvAction
+
             return SynthUnsolvInvAction(cli_args)
         if cli_args.synth_solv_loop is not None:
+            from .synth_solv_loop_action import SynthSolvLoopAction
+
             return SynthSolvLoopAction(cli_args)
         if cli_args.termination:
+            from .termination_action import TerminationAction
+
             return TerminationAction(cli_args)
+        from .print_benchmark_action import PrintBenchmarkAction
+
         return PrintBenchmarkAction(cli_args)
@@ -1,3 +1,6 @@
+import json
+import sys
+import time
 from argparse import Namespace
 from typing import Dict
 from symengine.lib.symengine_wrapper import Expr
@@ -13,13 +16,14 @@ from inputparser import (
 )
 from recurrences import RecBuilder
 from recurrences.solver import RecurrenceSolver
-from sympy import N, Symbol
+from sympy import N, Symbol, srepr
 from utils import (
     indent_string,
     raw_moments_to_cumulants,
     raw_moments_to_centrals,
     eval_re,
     unpack_piecewise,
+    get_max_case_in_piecewise,
 )
 from termcolor import colored
 from cli.common import (
@@ -30,10 +34,16 @@ from cli.common import (
     print_is_exact,
     prettify_piecewise,
     transform_to_after_loop,
+    phase_timings,
+    reset_phase_timings,
+    get_required_monomials,
+    prepare_solvers,
+    get_moment_bounds,
 )
 from program import normalize_program
 from inputparser import parse_program
 from invariants import InvariantIdeal
+import settings
 
 
 class GoalsAction(Action):
@@ -41,12 +51,14 @@ class GoalsAction(Action):
     solvers: Dict[Expr, RecurrenceSolver]
     rec_builder: RecBuilder
     program: Program
+    benchmark: str = None
 
     def __init__(self, cli_args: Namespace):
         self.cli_args = cli_args
 
     def __call__(self, *args, **kwargs):
         benchmark = args[0]
+        self.benchmark = benchmark
         program = parse_program(benchmark)
         program = normalize_program(program)
         rec_builder = RecBuilder(program)
@@ -69,47 +81,175 @@ class GoalsAction(Action):
         return goals
 
     def handle_all_goals(self):
-        print(colored("-------------------", "cyan"))
-        print(colored("- Analysis Result -", "cyan"))
-        print(colored("-------------------", "cyan"))
-        print()
+        ndjson = self.cli_args.output_format == "ndjson"
+        if not ndjson:
+            print(colored("-------------------", "cyan"))
+            print(colored("- Analysis Result -", "cyan"))
+            print(colored("-------------------", "cyan"))
+            print()
 
         closed_forms = {}
-        for goal_type, goal_data in self.parse_goals():
+        goals = self.parse_goals()
+        # the time for the shared system of recurrences is attributed to the first goal
+        reset_phase_timings()
+        start = time.time()
+        self.prepare_all_goals(goals)
+        for goal, (goal_type, goal_data) in zip(self.cli_args.goals, goals):
             if goal_type == MOMENT:
                 moment, is_exact = self.handle_moment_goal(goal_data)
-                self.print_moment_goal(
-                    goal_data[0],
-                    moment,
-                    is_exact,
-                    is_probabilistic=self.program.is_probabilistic,
-                )
                 id = (
                     f"E({goal_data[0]})"
                     if self.program.is_probabilistic
                     else str(goal_data[0])
                 )
                 closed_forms[id] = moment
+                if ndjson:
+                    self.print_record(goal, "moment", id, moment, is_exact, start)
+                else:
+                    self.print_moment_goal(
+                        goal_data[0],
+                        moment,
+                        is_exact,
+                        is_probabilistic=self.program.is_probabilistic,
+                    )
             elif goal_type == CUMULANT:
                 cumulant, is_exact = self.handle_cumulant_goal(goal_data)
-                self.print_cumulant_goal(goal_data[0], goal_data[1], cumulant, is_exact)
-                closed_forms[f"k{goal_data[0]}({goal_data[1]})"] = cumulant
+                id = f"k{goal_data[0]}({goal_data[1]})"
+                closed_forms[id] = cumulant
+                if ndjson:
+                    self.print_record(goal, "cumulant", id, cumulant, is_exact, start)
+                else:
+                    self.print_cumulant_goal(
+                        goal_data[0], goal_data[1], cumulant, is_exact
+                    )
             elif goal_type == CENTRAL:
                 cmoment, is_exact = self.handle_central_moment_goal(goal_data)
-                self.print_central_moment_goal(
-                    goal_data[0], goal_data[1], cmoment, is_exact
-                )
-                closed_forms[f"c{goal_data[0]}({goal_data[1]})"] = cmoment
+                id = f"c{goal_data[0]}({goal_data[1]})"
+                closed_forms[id] = cmoment
+                if ndjson:
+                    self.print_record(goal, "central", id, cmoment, is_exact, start)
+                else:
+                    self.print_central_moment_goal(
+                        goal_data[0], goal_data[1], cmoment, is_exact
+                    )
             elif goal_type == TAIL_BOUND_UPPER:
-                self.handle_tail_bound_upper_goal(goal_data)
+                bounds, is_exact = self.handle_tail_bound_upper_goal(goal_data)
+                if ndjson:
+                    id = f"P({goal_data[0]} >= {goal_data[1]})"
+                    self.print_record(
+                        goal, "tail_bound_upper", id, bounds, is_exact, start
+                    )
+                else:
+                    self.print_tail_bound_upper_goal(
+                        goal_data[0], goal_data[1], bounds, is_exact
+                    )
             elif goal_type == TAIL_BOUND_LOWER:
-                self.handle_tail_bound_lower_goal(goal_data)
+                bound, is_exact = self.handle_tail_bound_lower_goal(goal_data)
+                if ndjson:
+                    id = f"P({goal_data[0]} > {goal_data[1]})"
+                    self.print_record(
+                        goal, "tail_bound_lower", id, bound, is_exact, start
+                    )
+                else:
+                    self.print_tail_bound_lower_goal(
+                        goal_data[0], goal_data[1], bound, is_exact
+                    )
             else:
                 raise RuntimeError(f"Goal type {goal_type} does not exist.")
+            reset_phase_timings()
+            start = time.time()
 
         if self.cli_args.invariants:
             self.handle_invariants(closed_forms)
 
+    def prepare_all_goals(self, goals):
+        """
+        Collects the monomials required by all goals, such that a single system of recurrences
+        is constructed and solved for all of them.
+        """
+        monomials = set()
+        for goal_type, goal_data in goals:
+            if goal_type == MOMENT:
+                monom, powers = goal_data[0], [1]
+            elif goal_type in (CUMULANT, CENTRAL):
+                monom, powers = goal_data[1], range(1, goal_data[0] + 1)
+            elif goal_type == TAIL_BOUND_UPPER:
+                monom = goal_data[0]
+                powers = range(1, self.cli_args.tail_bound_moments + 1)
+            elif goal_type == TAIL_BOUND_LOWER:
+                monom, powers = goal_data[0], [1, 2]
+            else:
+                continue
+            monomials |= get_required_monomials(
+                monom, powers, self.cli_args, self.program
+            )
+        prepare_solvers(
+            monomials, self.solvers, self.rec_builder, self.cli_args, self.program
+        )
+
+    def print_record(self, goal, goal_type, id, result, is_exact, start):
+        """
+        Prints the result of a goal as a single JSON line. For upper tail bounds, the result is the list of all
+        bounds and the value at n is the minimum of the bounds (if it exists).
+        """
+        record = {
+            "benchmark": self.benchmark,
+            "goal": goal,
+            "type": goal_type,
+            "id": id,
+        }
+        if isinstance(result, list):
+            record["bounds"] = [self.get_expression_record(r) for r in result]
+        else:
+            record.update(self.get_expression_record(result))
+        record["is_exact"] = is_exact
+
+        at_n_start = time.time()
+        record["at_n"] = None
+        if self.cli_args.at_n >= 0:
+            if isinstance(result, list):
+                values = [eval_re(self.cli_args.at_n, r).expand() for r in result]
+                if all([not v.free_symbols for v in values]):
+                    values = [min(values)]
+                values = [self.get_value_record(v) for v in values]
+                value = values[0] if len(values) == 1 else values
+            else:
+                value = self.get_value_record(
+                    eval_re(self.cli_args.at_n, result).expand()
+                )
+            record["at_n"] = {"n": self.cli_args.at_n, **value}
+        at_n_time = time.time() - at_n_start
+
+        record["timings"] = {
+            **phase_timings,
+            "at_n": at_n_time,
+            "total": time.time() - start,
+        }
+        print(json.dumps(record))
+        sys.stdout.flush()
+
+    def get_expression_record(self, expression):
+        """
+        Splits a closed form into the cases for the first iterations and the general case.
+        """
+        max_case = get_max_case_in_piecewise(expression)
+        initial_cases = [
+            str(expression.subs({Symbol("n", integer=True): n}))
+            for n in range(max_case + 1)
+        ]
+        return {
+            "closed_form": str(unpack_piecewise(expression)),
+            "initial_cases": initial_cases,
+            "srepr": srepr(expression),
+        }
+
+    def get_value_record(self, value):
+        numeric = N(value)
+        return {
+            "value": str(value),
+            "numeric": float(numeric) if numeric.is_real else None,
+        }
+
     def handle_moment_goal(self, goal_data):
         monom = goal_data[0]
         if self.cli_args.after_loop:
@@ -137,8 +277,26 @@ class GoalsAction(Action):
                 else f"{monom} | n={self.cli_args.at_n}"
             )
             print(f"{prefix}{id} = {moment_at_n} ≅ {N(moment_at_n)}")
+            bounds = self.get_bounds(monom)
+            if bounds is not None:
+                print(f"{prefix}{id} ∈ {bounds}")
         print()
 
+    def get_bounds(self, monom):
+        """
+        Returns certified bounds for the moment of the monomial at --at_n if its solver provides them
+        """
+        if settings.precision is None or self.cli_args.after_loop:
+            return None
+        return get_moment_bounds(
+            monom,
+            self.cli_args.at_n,
+            self.solvers,
+            self.rec_builder,
+            self.cli_args,
+            self.program,
+        )
+
     def handle_cumulant_goal(self, goal_data):
         number = goal_data[0]
         monom = goal_data[1]
@@ -239,6 +397,9 @@ class GoalsAction(Action):
         bounds.reverse()
         if self.cli_args.after_loop:
             bounds = transform_to_after_loop(bounds)
+        return bounds, is_exact
+
+    def print_tail_bound_upper_goal(self, monom, a, bounds, is_exact):
         print(f"Assuming {monom} is non-negative.")
         print(f"P({monom} >= {a}) <= minimum of")
         count = 1
@@ -277,6 +438,9 @@ class GoalsAction(Action):
         bound = bound.simplify()
         if self.cli_args.after_loop:
             bound = transform_to_after_loop(bound)
+        return bound, is_exact
+
+    def print_tail_bound_lower_goal(self, monom, a, bound, is_exact):
         print(f"Assuming {monom - a} is non-negative.")
         print(f"P({monom} > {a}) >= {prettify_piecewise(bound)}")
         print_is_exact(is_exact)
@@ -288,6 +452,17 @@ class GoalsAction(Action):
         print()
 
     def handle_invariants(self, closed_forms):
+        if self.cli_args.output_format == "ndjson":
+            basis = InvariantIdeal(closed_forms).compute_basis()
+            record = {
+                "benchmark": self.benchmark,
+                "type": "invariants",
+                "basis": [f"{b} = 0" for b in basis],
+            }
+            print(json.dumps(record))
+            sys.stdout.flush()
+            return
+
         print()
         print(colored("-------------------", "cyan"))
         print(colored("-   Invariants    -", "cyan"))
@@ -3,9 +3,8 @@ from .action import Action
 from inputparser import Parser
 from recurrences import RecBuilder
 from symengine.lib.symengine_wrapper import sympify
-from simulation import Simulator
 from plots import StatesPlot, RunsPlot
-from cli.common import get_moment
+from cli.common import get_moment, get_simulator
 from program import normalize_program
 from inputparser import parse_program
 import settings
@@ -19,6 +18,13 @@ class PlotAction(Action):
 
     def __call__(self, *args, **kwargs):
         benchmark = args[0]
+        if (
+            self.cli_args.simulation_streaming
+            or self.cli_args.simulation_tolerance is not None
+        ):
+            raise Exception(
+                "Plots require all runs and don't support streaming or adaptive simulation."
+            )
         monom = sympify(self.cli_args.plot)
         first_moment = second_moment = None
         if self.cli_args.plot_expectation or self.cli_args.plot_std:
@@ -28,6 +34,7 @@ class PlotAction(Action):
             solvers = {}
             settings.numeric_croots = True
             settings.numeric_roots = True
+            settings.numeric_solver = True
             if self.cli_args.plot_std:
                 second_moment, _ = get_moment(
                     monom**2, solvers, rec_builder, self.cli_args, program
@@ -37,7 +44,7 @@ class PlotAction(Action):
             )
 
         program = Parser().parse_file(benchmark)
-        simulator = Simulator(self.cli_args.simulation_iter)
+        simulator = get_simulator(self.cli_args)
         result = simulator.simulate(program, [monom], self.cli_args.number_samples)
         if self.cli_args.states_plot:
             p = StatesPlot(
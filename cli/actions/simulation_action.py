@@ -2,7 +2,7 @@ from argparse import Namespace
 from .action import Action
 from inputparser import Parser, GoalParser, MOMENT, TAIL_BOUND_LOWER, TAIL_BOUND_UPPER
 from symengine.lib.symengine_wrapper import Piecewise
-from simulation import Simulator
+from cli.common import get_simulator
 from termcolor import colored
 
 
@@ -32,7 +32,7 @@ class SimulationAction(Action):
             if goal_type == TAIL_BOUND_LOWER:
                 goals.append(Piecewise((1, goal_data[0] > goal_data[1]), (0, True)))
 
-        simulator = Simulator(self.cli_args.simulation_iter)
+        simulator = get_simulator(self.cli_args)
         result = simulator.simulate(program, goals, self.cli_args.number_samples)
 
         print(colored("---------------------", "cyan"))
@@ -40,10 +40,26 @@ class SimulationAction(Action):
         print(colored("---------------------", "cyan"))
         print()
 
+        half_widths = None
+        if self.cli_args.simulation_tolerance is not None:
+            half_widths = result.get_confidence_half_widths(
+                self.cli_args.simulation_confidence
+            )
+            print(f"Number of samples: {result.number_samples}")
+
         for goal, mean in result.get_average_goals().items():
             if isinstance(goal, Piecewise):
-                print(f"P({goal.args[1]}) = {mean}")
+                id = f"P({goal.args[1]})"
             else:
                 id = f"E({goal})" if program.is_probabilistic else str(goal)
+            if half_widths is None:
                 print(f"{id} = {mean}")
+                continue
+            half_width = half_widths[goal]
+            color = (
+                "green"
+                if half_width <= self.cli_args.simulation_tolerance
+                else "yellow"
+            )
+            print(f"{id} = {mean} ± " + colored(str(half_width), color))
         print()
@@ -1,5 +1,6 @@
 from argparse import ArgumentParser as ArgParser
 import glob
+import os
 
 import settings
 
@@ -12,8 +13,13 @@ def _set_settings(args):
     settings.numeric_roots = args.numeric_roots
     settings.numeric_croots = args.numeric_croots
     settings.numeric_eps = args.numeric_eps
+    settings.numeric_solver = args.numeric_solver
+    settings.precision = args.precision
     settings.trivial_guard = args.trivial_guard
     settings.exact_func_moments = args.exact_func_moments
+    settings.cache_dir = None if args.no_cache else args.cache_dir
+    settings.cache_max_size = args.cache_size * 1024 * 1024
+    settings.recurrence_workers = args.recurrence_workers
 
 
 class ArgumentParser:
@@ -25,7 +31,7 @@ class ArgumentParser:
             "benchmarks",
             metavar="benchmarks",
             type=str,
-            nargs="+",
+            nargs="*",
             help="A list of benchmarks to run Polar on",
         )
         self.argument_parser.add_argument(
@@ -35,6 +41,12 @@ class ArgumentParser:
             type=int,
             help="Iteration number to evaluate the expressions at",
         )
+        self.argument_parser.add_argument(
+            "--at_n_direct",
+            action="store_true",
+            default=False,
+            help="If set the goals are only evaluated at the iteration given by --at_n by powering the recurrence matrix, without computing closed forms",
+        )
         self.argument_parser.add_argument(
             "--simulate",
             action="store_true",
@@ -54,6 +66,70 @@ class ArgumentParser:
             type=int,
             help="Number of iterations after which the simulation stops.",
         )
+        self.argument_parser.add_argument(
+            "--simulation_engine",
+            dest="simulation_engine",
+            default="sequential",
+            choices=["sequential", "vectorized"],
+            help="The simulation engine to use. 'vectorized' advances all samples together as NumPy arrays.",
+        )
+        self.argument_parser.add_argument(
+            "--simulation_workers",
+            dest="simulation_workers",
+            default=1,
+            type=int,
+            help="Number of worker processes simulating shards of the samples in parallel. "
+            "Not supported together with --simulation_tolerance.",
+        )
+        self.argument_parser.add_argument(
+            "--simulation_seed",
+            dest="simulation_seed",
+            default=None,
+            type=int,
+            help="Seed for the simulation. Results are reproducible independently of the number of workers.",
+        )
+        self.argument_parser.add_argument(
+            "--simulation_streaming",
+            action="store_true",
+            default=False,
+            help="If set the simulation only keeps running moments of the goals instead of all runs.",
+        )
+        self.argument_parser.add_argument(
+            "--simulation_tolerance",
+            dest="simulation_tolerance",
+            default=None,
+            type=float,
+            help="If set, batches of samples are simulated until the confidence intervals of all goals at the "
+            "last iteration have at most this half-width. --number_samples is then the maximum number of samples.",
+        )
+        self.argument_parser.add_argument(
+            "--simulation_confidence",
+            dest="simulation_confidence",
+            default=0.95,
+            type=float,
+            help="The confidence level of the confidence intervals for --simulation_tolerance.",
+        )
+        self.argument_parser.add_argument(
+            "--simulation_batch_size",
+            dest="simulation_batch_size",
+            default=1000,
+            type=int,
+            help="The number of samples simulated in between checks of --simulation_tolerance.",
+        )
+        self.argument_parser.add_argument(
+            "--simulation_max_time",
+            dest="simulation_max_time",
+            default=None,
+            type=float,
+            help="Maximum time in seconds for simulating with --simulation_tolerance.",
+        )
+        self.argument_parser.add_argument(
+            "--simulation_storage_dir",
+            dest="simulation_storage_dir",
+            default=None,
+            type=str,
+            help="If set the simulated runs are stored in temporary memory-mapped files in this directory.",
+        )
         self.argument_parser.add_argument(
             "--number_samples",
             dest="number_samples",
@@ -61,6 +137,54 @@ class ArgumentParser:
             type=int,
             help="The number of samples to simulate.",
         )
+        self.argument_parser.add_argument(
+            "--server",
+            action="store_true",
+            default=False,
+            help="If set Polar runs as a server answering JSON-RPC requests (one per line) on stdin",
+        )
+        self.argument_parser.add_argument(
+            "--server_socket",
+            dest="server_socket",
+            default=None,
+            type=str,
+            help="If set Polar runs as a server answering JSON-RPC requests on a Unix socket at the given path",
+        )
+        self.argument_parser.add_argument(
+            "--batch",
+            action="store_true",
+            default=False,
+            help="If set every benchmark is run in its own process and a JSON summary of the outcomes is written",
+        )
+        self.argument_parser.add_argument(
+            "--batch_workers",
+            dest="batch_workers",
+            default=os.cpu_count(),
+            type=int,
+            help="The number of benchmarks run in parallel in batch mode",
+        )
+        self.argument_parser.add_argument(
+            "--batch_timeout",
+            dest="batch_timeout",
+            default=None,
+            type=float,
+            help="Wall-clock limit in seconds for every benchmark in batch mode",
+        )
+        self.argument_parser.add_argument(
+            "--batch_memory",
+            dest="batch_memory",
+            default=None,
+            type=int,
+            help="Memory limit in megabytes for every benchmark in batch mode",
+        )
+        self.argument_parser.add_argument(
+            "--batch_summary",
+            dest="batch_summary",
+            default=None,
+            type=str,
+            help="File to write the JSON summary of batch mode to. If not set, it is printed to stdout "
+            "and the progress is printed to stderr.",
+        )
         self.argument_parser.add_argument(
             "--goals",
             dest="goals",
@@ -69,6 +193,13 @@ class ArgumentParser:
             nargs="+",
             help="A list of goals Polar should compute or simulate",
         )
+        self.argument_parser.add_argument(
+            "--output_format",
+            dest="output_format",
+            default="text",
+            choices=["text", "ndjson"],
+            help="The output format for goals. 'ndjson' prints one JSON record per goal as soon as it is computed",
+        )
         self.argument_parser.add_argument(
             "--gram_charlier",
             dest="gram_charlier",
@@ -199,6 +330,19 @@ class ArgumentParser:
             default=settings.numeric_croots,
             help="If set the complex roots in the recurrence computation will be computed numerically",
         )
+        self.argument_parser.add_argument(
+            "--numeric_solver",
+            action="store_true",
+            default=settings.numeric_solver,
+            help="If set recurrences without symbolic constants are solved in floating-point arithmetic",
+        )
+        self.argument_parser.add_argument(
+            "--precision",
+            dest="precision",
+            default=settings.precision,
+            type=int,
+            help="If set the roots of characteristic polynomials are computed numerically with this many significant digits and values at --at_n come with certified bounds",
+        )
         self.argument_parser.add_argument(
             "--numeric_eps",
             dest="numeric_eps",
@@ -231,6 +375,36 @@ class ArgumentParser:
             default=settings.exact_func_moments,
             help="If set, moments of functions of distributions which would be transcendental won't be approximated by rationals",
         )
+        self.argument_parser.add_argument(
+            "--cache_dir",
+            dest="cache_dir",
+            default=os.path.join(
+                os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+                "polar",
+            ),
+            type=str,
+            help="Directory of the persistent cache of recurrences and their solutions",
+        )
+        self.argument_parser.add_argument(
+            "--cache_size",
+            dest="cache_size",
+            default=256,
+            type=int,
+            help="Maximum size of the persistent cache in megabytes",
+        )
+        self.argument_parser.add_argument(
+            "--recurrence_workers",
+            dest="recurrence_workers",
+            default=1,
+            type=int,
+            help="Number of worker processes constructing the recurrences of monomials in parallel. The recurrences are identical for any number of workers.",
+        )
+        self.argument_parser.add_argument(
+            "--no_cache",
+            action="store_true",
+            default=False,
+            help="If set the persistent cache of recurrences and their solutions is not used",
+        )
         self.argument_parser.add_argument(
             "--solvability_check",
             action="store_true",
@@ -305,13 +479,64 @@ class ArgumentParser:
         args = self.argument_parser.parse_args()
         args.benchmarks = [b for bs in map(glob.glob, args.benchmarks) for b in bs]
 
-        if len(args.benchmarks) == 0:
+        is_server = args.server or args.server_socket is not None
+        if len(args.benchmarks) == 0 and not is_server:
             raise Exception(
                 "No benchmark given. Run with '--help' for more information."
             )
 
+        self.check_args(args)
         _set_settings(args)
         return args
 
+    def check_args(self, args):
+        """
+        Raises an exception if the given options can't be combined
+        """
+        if args.at_n_direct and args.at_n < 0:
+            raise Exception("--at_n_direct requires a non-negative --at_n.")
+        if args.at_n_direct and args.after_loop:
+            raise Exception("--at_n_direct cannot be combined with --after_loop.")
+        if args.simulation_tolerance is not None and args.simulation_workers > 1:
+            raise Exception(
+                "--simulation_tolerance cannot be combined with --simulation_workers."
+            )
+
+    def convert_value(self, name: str, value):
+        """
+        Converts a value given for the option with the given destination (e.g. from a JSON request) like argparse
+        would convert it on the command line. Raises a ValueError if the value is not valid for the option.
+        """
+        actions = [a for a in self.argument_parser._actions if a.dest == name]
+        if not actions or name == "help":
+            raise ValueError(f"Unknown option '{name}'")
+        action = actions[0]
+        if action.nargs == 0:
+            if not isinstance(value, bool):
+                raise ValueError(f"'{name}' has to be a boolean")
+            return value
+        if value is None and action.default is None:
+            return None
+        if action.nargs in ["*", "+"]:
+            values = value if isinstance(value, list) else [value]
+            if action.nargs == "+" and not values:
+                raise ValueError(f"'{name}' requires at least one value")
+            return [self._convert_single_value(action, v) for v in values]
+        return self._convert_single_value(action, value)
+
+    def _convert_single_value(self, action, value):
+        if isinstance(value, (bool, list, dict)) or value is None:
+            raise ValueError(f"Invalid value {value!r} for '{action.dest}'")
+        if action.type is not None:
+            try:
+                value = action.type(str(value))
+            except ValueError:
+                raise ValueError(f"Invalid value {value!r} for '{action.dest}'")
+        if action.choices is not None and value not in action.choices:
+            raise ValueError(
+                f"Invalid value {value!r} for '{action.dest}', choose from {list(action.choices)}"
+            )
+        return value
+
     def get_defaults(self):
         return self.argument_parser.parse_args({"benchmarks": []})
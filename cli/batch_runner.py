@@ -0,0 +1,154 @@
+import io
+import json
+import multiprocessing
+import resource
+import sys
+import time
+import traceback
+from argparse import Namespace
+from contextlib import redirect_stdout, redirect_stderr
+from multiprocessing.connection import wait
+from typing import List, Optional
+from termcolor import colored
+from cli.actions import ActionFactory
+
+OK = "ok"
+TIMEOUT = "timeout"
+ERROR = "error"
+
+STATUS_COLORS = {OK: "green", TIMEOUT: "yellow", ERROR: "red"}
+
+
+class BatchRunner:
+    """
+    Runs the action given by the CLI arguments on many benchmarks. Every benchmark is run in its own process
+    with a wall-clock limit (in seconds) and a memory limit (in MB). At most "workers" benchmarks run at the
+    same time. The outcome of every benchmark is collected as soon as it finishes.
+    """
+
+    cli_args: Namespace
+    workers: int
+    timeout: Optional[float]
+    memory_limit: Optional[int]
+
+    def __init__(
+        self,
+        cli_args: Namespace,
+        workers: int = 1,
+        timeout: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+    ):
+        self.cli_args = cli_args
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+
+    def run(self, benchmarks: List[str], verbose: bool = True):
+        """
+        Returns a list with one entry per benchmark (in the given order) holding the benchmark, its status
+        (ok/timeout/error), the elapsed time, the output and the error message (if any).
+        """
+        # the children are forked such that they inherit the settings and loaded modules
+        context = multiprocessing.get_context("fork")
+        pending = list(reversed(benchmarks))
+        running = {}
+        results = {}
+        while pending or running:
+            while pending and len(running) < self.workers:
+                benchmark = pending.pop()
+                receiver, sender = context.Pipe(duplex=False)
+                process = context.Process(
+                    target=self._run_benchmark, args=(benchmark, sender), daemon=True
+                )
+                process.start()
+                sender.close()
+                running[receiver] = (benchmark, process, time.time())
+
+            for receiver in wait(list(running.keys()), self._get_wait_time(running)):
+                benchmark, process, start = running.pop(receiver)
+                try:
+                    result = receiver.recv()
+                except EOFError:
+                    result = {
+                        "status": ERROR,
+                        "output": "",
+                        "error": f"Process exited with code {process.exitcode}",
+                    }
+                receiver.close()
+                process.join()
+                results[benchmark] = self._finish(benchmark, result, start, verbose)
+
+            if self.timeout is None:
+                continue
+            for receiver, (benchmark, process, start) in list(running.items()):
+                if time.time() - start >= self.timeout:
+                    process.kill()
+                    process.join()
+                    receiver.close()
+                    del running[receiver]
+                    result = {
+                        "status": TIMEOUT,
+                        "output": "",
+                        "error": f"Exceeded the time limit of {self.timeout} s",
+                    }
+                    results[benchmark] = self._finish(benchmark, result, start, verbose)
+
+        return [results[b] for b in benchmarks]
+
+    def _get_wait_time(self, running):
+        if self.timeout is None:
+            return None
+        now = time.time()
+        deadlines = [start + self.timeout for _, _, start in running.values()]
+        return max(0, min(deadlines) - now)
+
+    def _finish(self, benchmark, result, start, verbose):
+        result = {"benchmark": benchmark, "time": time.time() - start, **result}
+        if verbose:
+            status = colored(result["status"], STATUS_COLORS[result["status"]])
+            # stdout is reserved for the JSON summary
+            print(f"{benchmark}: {status} ({result['time']:.2f} s)", file=sys.stderr)
+        return result
+
+    def _run_benchmark(self, benchmark, sender):
+        """
+        Runs in the child process. Sends the result of the benchmark back to the parent.
+        """
+        if self.memory_limit is not None:
+            limit = self.memory_limit * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        output = io.StringIO()
+        result = {"status": OK, "error": None}
+        try:
+            with redirect_stdout(output), redirect_stderr(output):
+                action = ActionFactory.create_action(self.cli_args)
+                action(benchmark)
+        except MemoryError:
+            result = {
+                "status": ERROR,
+                "error": f"Exceeded the memory limit of {self.memory_limit} MB",
+            }
+        except BaseException as e:
+            result = {
+                "status": ERROR,
+                "error": "".join(traceback.format_exception_only(type(e), e)).strip(),
+            }
+        result["output"] = output.getvalue()
+        sender.send(result)
+        sender.close()
+
+
+def write_summary(results, filename: Optional[str] = None):
+    """
+    Writes the results of a batch run as JSON to the given file or to stdout if no file is given.
+    """
+    summary = {
+        "total": len(results),
+        **{s: sum(r["status"] == s for r in results) for s in [OK, TIMEOUT, ERROR]},
+        "benchmarks": results,
+    }
+    if filename is None:
+        print(json.dumps(summary, indent=2))
+        return
+    with open(filename, "w") as file:
+        json.dump(summary, file, indent=2)
@@ -1,5 +1,12 @@
-from recurrences import RecBuilder
-from recurrences.solver import RecurrenceSolver
+import time
+from contextlib import contextmanager
+from recurrences import RecBuilder, get_disk_cache, get_cache_key, get_content_key
+from recurrences.solver import (
+    RecurrenceSolver,
+    DirectSolver,
+    NumericRecurrenceSolver,
+)
+from recurrences.solver.precision_solver import interval_dps
 from symengine.lib.symengine_wrapper import sympify
 from sympy import limit_seq, Symbol
 from sympy import sympify as sympy_sympify
@@ -11,23 +18,166 @@ from utils import (
     get_max_case_in_piecewise,
 )
 from termcolor import colored
+from simulation import (
+    Simulator,
+    VectorizedSimulator,
+    ShardedSimulator,
+    AdaptiveSimulator,
+)
 from program.condition.not_cond import Not
 from utils.expressions import get_monoms
+import settings
+
+
+# Accumulated time (in seconds) spent in the phases of computing moments since the last reset
+phase_timings = {}
+
+
+def reset_phase_timings():
+    phase_timings.clear()
+
+
+@contextmanager
+def time_phase(phase: str):
+    start = time.time()
+    try:
+        yield
+    finally:
+        phase_timings[phase] = phase_timings.get(phase, 0) + time.time() - start
+
+
+def _get_solution_key(monom, cli_args, program):
+    kind = "solution"
+    if cli_args.at_n_direct:
+        kind = f"solution at n={cli_args.at_n}"
+    return get_cache_key(program, kind, monom)
+
+
+def _get_component_solution_key(monom, solver, cli_args):
+    """
+    Returns the key of the solution of a monomial which only depends on the part of the system of recurrences
+    it depends on. After an edit of the program, the solutions of unaffected components are reused.
+    """
+    kind = "component solution"
+    if cli_args.at_n_direct:
+        kind = f"component solution at n={cli_args.at_n}"
+    kind += f" by {type(solver).__name__}"
+    return get_content_key(kind, solver.recurrences.get_fingerprint(monom))
+
+
+def _create_solver(recurrences, cli_args):
+    if cli_args.at_n_direct:
+        return DirectSolver(recurrences, cli_args.at_n)
+    if settings.numeric_solver and NumericRecurrenceSolver.is_applicable(recurrences):
+        return NumericRecurrenceSolver(recurrences)
+    return RecurrenceSolver(recurrences)
+
+
+def get_required_monomials(monom, powers, cli_args, program):
+    """
+    Returns the monomials whose moments are needed for the moments of the given powers of a monomial,
+    i.e. the monomials get_moment is called with by get_all_moments (or get_all_moments_given_termination).
+    """
+    if not cli_args.after_loop:
+        return {monom**i for i in powers}
+
+    negated_loop_guard = Not(program.original_loop_guard).to_arithm(program)
+    polys = [negated_loop_guard] + [monom**i * negated_loop_guard for i in powers]
+    return {m for poly in polys for _, m in get_monoms(poly.expand())}
+
+
+def prepare_solvers(monomials, solvers, rec_builder, cli_args, program):
+    """
+    Constructs a single system of recurrences for all given monomials which do not have a solver yet and solves
+    it once. Monomials which are cached or not solvable are left to get_moment.
+    """
+    cache = get_disk_cache()
+    missing = set()
+    for monom in monomials:
+        if monom in solvers:
+            continue
+        if cli_args.solvability_check and not is_solvable(monom, program):
+            continue
+        if cache is not None:
+            with time_phase("cache"):
+                cached = cache.get(_get_solution_key(monom, cli_args, program))
+            if cached is not None:
+                continue
+        missing.add(monom)
+
+    if not missing:
+        return
+    with time_phase("recurrences"):
+        recurrences = rec_builder.get_combined_recurrences(frozenset(missing))
+    with time_phase("solving"):
+        s = _create_solver(recurrences, cli_args)
+    solvers.update({sympify(m): s for m in recurrences.monomials})
 
 
 def get_moment(monom, solvers, rec_builder, cli_args, program):
     if cli_args.solvability_check and not is_solvable(monom, program):
         raise Exception(f"{monom} is not effective/solvable.")
 
-    if monom not in solvers:
-        recurrences = rec_builder.get_recurrences(monom)
-        s = RecurrenceSolver(recurrences)
-        solvers.update({sympify(m): s for m in recurrences.monomials})
+    cache = get_disk_cache()
+    if cache is not None:
+        with time_phase("cache"):
+            key = _get_solution_key(monom, cli_args, program)
+            cached = cache.get(key)
+        if cached is not None:
+            return cached
 
-    moment, is_exact = rec_builder.get_solution(monom, solvers)
+    _prepare_solver(monom, solvers, rec_builder, cli_args)
+    if cache is not None:
+        with time_phase("cache"):
+            component_key = _get_component_solution_key(monom, solvers[monom], cli_args)
+            cached = cache.get(component_key)
+        if cached is not None:
+            with time_phase("cache"):
+                cache.put(key, cached)
+            return cached
+
+    with time_phase("solving"):
+        moment, is_exact = rec_builder.get_solution(monom, solvers)
+    if cache is not None:
+        with time_phase("cache"):
+            cache.put_all({key: (moment, is_exact), component_key: (moment, is_exact)})
     return moment, is_exact
 
 
+def _prepare_solver(monom, solvers, rec_builder, cli_args):
+    if monom in solvers:
+        return
+    with time_phase("recurrences"):
+        recurrences = rec_builder.get_recurrences(monom)
+    with time_phase("solving"):
+        s = _create_solver(recurrences, cli_args)
+    solvers.update({sympify(m): s for m in recurrences.monomials})
+
+
+def get_moment_bounds(monom, n, solvers, rec_builder, cli_args, program):
+    """
+    Returns certified bounds (as string) for the moment of a monomial after n iterations or None if its solver
+    can't certify any. The bounds are cached like the moments, such that they don't require a solver if the
+    moment itself comes from the cache.
+    """
+    cache = get_disk_cache()
+    if cache is not None:
+        with time_phase("cache"):
+            key = get_cache_key(program, f"bounds at n={n}", monom)
+            cached = cache.get(key)
+        if cached is not None:
+            return cached[0]
+
+    _prepare_solver(monom, solvers, rec_builder, cli_args)
+    with time_phase("solving"), interval_dps(settings.precision):
+        bounds = solvers[monom].get_bounds(monom, n)
+        bounds = None if bounds is None else str(bounds)
+    if cache is not None:
+        with time_phase("cache"):
+            cache.put(key, (bounds,))
+    return bounds
+
+
 def get_moment_poly(poly, solvers, rec_builder, cli_args, program):
     expanded_poly = poly.expand()
     monoms = get_monoms(expanded_poly)
@@ -115,6 +265,38 @@ def transform_to_after_loop(element):
         return trans_single(element)
 
 
+def get_simulator(cli_args):
+    if cli_args.simulation_engine == "vectorized":
+        simulator = VectorizedSimulator(
+            cli_args.simulation_iter, storage_dir=cli_args.simulation_storage_dir
+        )
+    else:
+        simulator = Simulator(
+            cli_args.simulation_iter, storage_dir=cli_args.simulation_storage_dir
+        )
+    if cli_args.simulation_tolerance is not None:
+        return AdaptiveSimulator(
+            simulator,
+            cli_args.simulation_tolerance,
+            cli_args.simulation_confidence,
+            cli_args.simulation_batch_size,
+            cli_args.simulation_max_time,
+            cli_args.simulation_seed,
+        )
+    if (
+        cli_args.simulation_workers > 1
+        or cli_args.simulation_seed is not None
+        or cli_args.simulation_streaming
+    ):
+        simulator = ShardedSimulator(
+            simulator,
+            cli_args.simulation_workers,
+            cli_args.simulation_seed,
+            streaming=cli_args.simulation_streaming,
+        )
+    return simulator
+
+
 def print_is_exact(is_exact):
     if is_exact:
         print(colored("Solution is exact", "green"))
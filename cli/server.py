@@ -0,0 +1,207 @@
+import copy
+import io
+import json
+import os
+import socketserver
+import sys
+import tempfile
+from argparse import Namespace
+from collections import OrderedDict
+from contextlib import redirect_stdout
+from typing import Optional
+from cli.actions import ActionFactory
+from cli.actions.goals_action import GoalsAction
+from cli.argument_parser import ArgumentParser, _set_settings
+from inputparser import Parser
+from program import normalize_program
+from recurrences import RecBuilder
+from recurrences.disk_cache import KEY_SETTINGS
+import settings
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+
+class RequestException(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+class AnalysisServer:
+    """
+    Long-lived server answering JSON-RPC 2.0 requests, one JSON object per line.
+    Because the process stays alive, imports and all in-memory caches stay warm across requests. In particular,
+    the normalized programs together with their RecBuilder and solvers are kept for the most recently used
+    programs.
+
+    Methods:
+    - "goals": params "program" (the source code) and "goals" plus optional CLI arguments (e.g. "at_n").
+      The result holds one record per goal as in the NDJSON output of GoalsAction.
+    - "run": params "program" plus CLI arguments. Runs the action given by the arguments and returns its output.
+    - "shutdown": stops the server.
+    """
+
+    default_args: Namespace
+    argument_parser: ArgumentParser
+    programs: OrderedDict
+    max_programs: int
+    running: bool
+
+    def __init__(self, default_args: Namespace, max_programs: int = 64):
+        self.default_args = default_args
+        self.argument_parser = ArgumentParser()
+        self.programs = OrderedDict()
+        self.max_programs = max_programs
+        self.running = True
+
+    def handle_line(self, line: str) -> Optional[str]:
+        """
+        Handles a single request given as JSON string and returns the response as JSON string
+        (or None for notifications).
+        """
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            return json.dumps(self._error_response(None, PARSE_ERROR, str(e)))
+        response = self.handle_request(request)
+        return None if response is None else json.dumps(response)
+
+    def handle_request(self, request) -> Optional[dict]:
+        request_id = request.get("id") if isinstance(request, dict) else None
+        try:
+            if not isinstance(request, dict) or "method" not in request:
+                raise RequestException(INVALID_REQUEST, "Invalid request")
+            result = self._dispatch(request["method"], request.get("params", {}))
+        except RequestException as e:
+            return self._error_response(request_id, e.code, str(e))
+        except Exception as e:
+            return self._error_response(
+                request_id, SERVER_ERROR, f"{type(e).__name__}: {e}"
+            )
+        if "id" not in request:
+            return None
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    def _error_response(self, request_id, code: int, message: str):
+        return {
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "error": {"code": code, "message": message},
+        }
+
+    def _dispatch(self, method: str, params):
+        if not isinstance(params, dict):
+            raise RequestException(INVALID_PARAMS, "Params have to be an object")
+        if method == "goals":
+            return self.handle_goals(params)
+        if method == "run":
+            return self.handle_run(params)
+        if method == "shutdown":
+            self.running = False
+            return None
+        raise RequestException(METHOD_NOT_FOUND, f"Unknown method {method}")
+
+    def _get_args(self, params) -> Namespace:
+        if "program" not in params:
+            raise RequestException(INVALID_PARAMS, "Missing param 'program'")
+        args = copy.deepcopy(self.default_args)
+        for name, value in params.items():
+            if name == "program":
+                continue
+            if not hasattr(args, name):
+                raise RequestException(INVALID_PARAMS, f"Unknown param '{name}'")
+            try:
+                value = self.argument_parser.convert_value(name, value)
+            except ValueError as e:
+                raise RequestException(INVALID_PARAMS, str(e))
+            setattr(args, name, value)
+        try:
+            self.argument_parser.check_args(args)
+        except Exception as e:
+            raise RequestException(INVALID_PARAMS, str(e))
+        _set_settings(args)
+        return args
+
+    def _get_program(self, code: str):
+        """
+        Returns the normalized program for the given code together with its RecBuilder and solvers.
+        """
+        key = (code, tuple(getattr(settings, s) for s in KEY_SETTINGS))
+        if key in self.programs:
+            self.programs.move_to_end(key)
+            return self.programs[key]
+        program = normalize_program(Parser().parse_string(code))
+        entry = (program, RecBuilder(program), {})
+        self.programs[key] = entry
+        if len(self.programs) > self.max_programs:
+            self.programs.popitem(last=False)
+        return entry
+
+    def handle_goals(self, params):
+        args = self._get_args(params)
+        args.output_format = "ndjson"
+        program, rec_builder, solvers = self._get_program(params["program"])
+        action = GoalsAction(args)
+        action.initialize_program(program, rec_builder)
+        # solvers for a fixed n are only valid for the current request
+        action.solvers = {} if args.at_n_direct else solvers
+        output = io.StringIO()
+        with redirect_stdout(output):
+            action.handle_all_goals()
+        return {"records": [json.loads(r) for r in output.getvalue().splitlines()]}
+
+    def handle_run(self, params):
+        args = self._get_args(params)
+        with tempfile.NamedTemporaryFile("w", suffix=".prob", delete=False) as file:
+            file.write(params["program"])
+        output = io.StringIO()
+        try:
+            with redirect_stdout(output):
+                ActionFactory.create_action(args)(file.name)
+        finally:
+            os.remove(file.name)
+        return {"output": output.getvalue()}
+
+    def serve_stream(self, input=sys.stdin, output=sys.stdout):
+        """
+        Reads requests line by line from input and writes the responses line by line to output.
+        """
+        for line in input:
+            if not line.strip():
+                continue
+            response = self.handle_line(line)
+            if response is not None:
+                output.write(response + "\n")
+                output.flush()
+            if not self.running:
+                break
+
+    def serve_socket(self, path: str):
+        """
+        Listens on a Unix socket. Connections are handled one after another, every connection can send
+        any number of requests (one per line).
+        """
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    response = server.handle_line(line.decode())
+                    if response is not None:
+                        self.wfile.write((response + "\n").encode())
+                        self.wfile.flush()
+                    if not server.running:
+                        break
+
+        if os.path.exists(path):
+            os.remove(path)
+        with socketserver.UnixStreamServer(path, Handler) as socket_server:
+            while self.running:
+                socket_server.handle_request()
+        os.remove(path)
@@ -1,13 +1,27 @@
 import os
+from functools import lru_cache
+from typing import Optional
 from lark import Lark
 
+import settings
 from program import Program
+from utils import build_lalr_parser
 from .structure_transformer import StructureTransformer
 from .arithmetic_transformer import ArithmeticToStringTransformer
 
 GRAMMAR_FILE_PATH = os.path.dirname(__file__) + "/syntax.lark"
 
 
+@lru_cache(maxsize=None)
+def get_lark_parser(cache_dir: Optional[str] = None) -> Lark:
+    """
+    Returns the LALR parser for programs. It is only built once per process and cache directory.
+    """
+    return build_lalr_parser(
+        GRAMMAR_FILE_PATH, ArithmeticToStringTransformer, cache_dir
+    )
+
+
 class Parser:
     """
     Parsers which takes a .prob source file and returns the program in a form such that it can be used further.
@@ -19,13 +33,8 @@ class Parser:
         return program
 
     def parse_string(self, code: str) -> Program:
-        with open(GRAMMAR_FILE_PATH) as grammar_file:
-            parser = Lark(
-                grammar_file, transformer=ArithmeticToStringTransformer, parser="lalr"
-            )
-            tree = parser.parse(code)
-            program = StructureTransformer().transform(tree)
-        return program
+        tree = get_lark_parser(settings.cache_dir).parse(code)
+        return StructureTransformer().transform(tree)
 
 
 def parse_program(benchmark: str) -> Program:
@@ -43,22 +43,17 @@ class RunsPlot(Plot):
         ax.set_yscale(self.yscale)
         plt.xlabel("n")
         exact_resolution = 4
-        iterations = len(self.simulation_result.samples[0])
-        samples = self.simulation_result.samples
+        iterations = self.simulation_result.number_states
+        number_samples = self.simulation_result.number_samples
         first_moment = self.first_moment
         second_moment = self.second_moment if self.is_probabilistic else None
-        store = [[] for _ in range(iterations)]
         labels = []
 
-        run_data = []
-        for run in samples:
-            data = [state[goal] for state in run]
-            for i in range(len(data)):
-                store[i].append(data[i])
-            run_data.append(data)
+        # one row per run
+        run_data = self.simulation_result.get_prepared_data(goal).T
         labels.append(Line2D([0], [0], label="Samples", color="grey"))
 
-        xs = np.linspace(0, len(samples[0]), iterations * exact_resolution)
+        xs = np.linspace(0, iterations, iterations * exact_resolution)
         if first_moment is not None:
             expectation_data = [float(eval_re(x, first_moment)) for x in xs]
             text = (
@@ -178,7 +173,7 @@ class RunsPlot(Plot):
             if first_moment is not None and second_moment is not None:
                 ax.plot(xs, std_data_1, ":", color="red", linewidth=1.5)
                 ax.plot(xs, std_data_2, ":", color="red", linewidth=1.5)
-            number_real_frames = len(samples) * iterations
+            number_real_frames = number_samples * iterations
             self.fps = min(int(number_real_frames / self.anim_time), 30)
             number_rendered_frames = int(self.fps * self.anim_time)
             frames_factor = number_real_frames / number_rendered_frames
@@ -5,6 +5,7 @@
 This runnable script allows the user to run Polar on probabilistic programs stored in files
 For the command line arguments run the script with "--help".
 """
+import sys
 import time
 from cli import logo, ArgumentParser
 from cli.actions import ActionFactory
@@ -12,12 +13,37 @@ from termcolor import colored
 
 
 def main():
-    print(colored(logo, "green"))
-    print()
-    print()
-
     start = time.time()
     args = ArgumentParser().parse_args()
+    # machine-readable output must not contain anything else on stdout
+    is_server = args.server or args.server_socket is not None
+    is_batch_summary = args.batch and args.batch_summary is None
+    quiet = args.output_format == "ndjson" or is_server or is_batch_summary
+    if not quiet:
+        print(colored(logo, "green"))
+        print()
+        print()
+
+    if is_server:
+        from cli.server import AnalysisServer
+
+        server = AnalysisServer(args)
+        if args.server_socket is not None:
+            server.serve_socket(args.server_socket)
+        else:
+            server.serve_stream()
+        return
+
+    if args.batch:
+        from cli.batch_runner import BatchRunner, write_summary, OK
+
+        runner = BatchRunner(
+            args, args.batch_workers, args.batch_timeout, args.batch_memory
+        )
+        results = runner.run(args.benchmarks)
+        write_summary(results, args.batch_summary)
+        print(f"Elapsed time: {time.time() - start} s", file=sys.stderr)
+        exit(0 if all(r["status"] == OK for r in results) else 1)
 
     try:
         action = ActionFactory.create_action(args)
@@ -28,7 +54,8 @@ def main():
         print(e)
         exit()
 
-    print(f"Elapsed time: {time.time() - start} s")
+    if not quiet:
+        print(f"Elapsed time: {time.time() - start} s")
 
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import Union, Tuple, Set, Dict, TYPE_CHECKING
+import numpy as np
 
 if TYPE_CHECKING:
     from recurrences import RecBuilderContext
@@ -14,11 +15,14 @@ class Assignment(ABC):
         Condition  # a condition which has to hold in order for tha assignment to happen
     )
     default: Symbol  # the value to assign if condition is false
+    # memoized (expanded) moments by power, arithmetic condition and rest, invalidated by subs
+    moments: Dict[Tuple[int, Expr, Expr], Expr]
 
     def __init__(self, variable, condition=TrueCond(), default=None):
         self.variable = Symbol(str(variable))
         self.condition = condition
         self.default = Symbol(str(default)) if default else self.variable
+        self.moments = {}
 
     def add_to_condition(self, cond: Condition):
         self.condition = And(self.condition, cond)
@@ -39,14 +43,44 @@ class Assignment(ABC):
         state[self.variable] = float(result)
         return state
 
-    @abstractmethod
+    def evaluate_batch(self, state: Dict[Symbol, np.ndarray], size: int):
+        """
+        Vectorized counterpart of "evaluate". The state maps variables to arrays holding
+        the values of size many independent samples.
+        """
+        mask = self.condition.evaluate_batch(state, size)
+        if mask.all():
+            result = self.evaluate_right_side_batch(state, size)
+        else:
+            if self.default not in state:
+                raise EvaluationException(
+                    f"Tried to evaluate {self.default} which is not set in the given batch of states"
+                )
+            result = state[self.default]
+            if mask.any():
+                result = np.where(
+                    mask, self.evaluate_right_side_batch(state, size), result
+                )
+
+        state[self.variable] = np.asarray(result, dtype=float)
+        return state
+
     def subs(self, substitutions):
+        self.moments = {}
+        self._subs(substitutions)
+
+    @abstractmethod
+    def _subs(self, substitutions):
         pass
 
     @abstractmethod
     def evaluate_right_side(self, state: Dict[Symbol, float]):
         pass
 
+    @abstractmethod
+    def evaluate_right_side_batch(self, state: Dict[Symbol, np.ndarray], size: int):
+        pass
+
     @abstractmethod
     def get_free_symbols(self, with_condition=True, with_default=True) -> Set[Symbol]:
         """
@@ -81,3 +115,22 @@ class Assignment(ABC):
         with the dist-assignment of their argument.
         """
         pass
+
+    def get_moment_cached(
+        self,
+        k: int,
+        rec_builder_context: "RecBuilderContext",
+        arithm_cond: Expr = 1,
+        rest: Expr = 1,
+    ):
+        """
+        Memoized and expanded version of get_moment. When building the recurrences for all monomials of a
+        system, the same powers of an assignment are needed over and over again. The moment only depends on the
+        power, the condition and rest, as the context only determines which variables in rest are evaluated
+        together with the assignment.
+        """
+        key = (k, arithm_cond, rest)
+        if key not in self.moments:
+            moment = self.get_moment(k, rec_builder_context, arithm_cond, rest)
+            self.moments[key] = moment.expand()
+        return self.moments[key]
@@ -31,7 +31,7 @@ class DistAssignment(Assignment):
             symbols.add(self.default)
         return symbols
 
-    def subs(self, substitutions):
+    def _subs(self, substitutions):
         self.default = self.default.subs(substitutions)
         self.condition.subs(substitutions)
         self.distribution.subs(substitutions)
@@ -39,6 +39,9 @@ class DistAssignment(Assignment):
     def evaluate_right_side(self, state):
         return self.distribution.sample(state)
 
+    def evaluate_right_side_batch(self, state, size):
+        return self.distribution.sample_batch(state, size)
+
     def get_support(self):
         result = self.distribution.get_support()
         if not self.condition.is_implied_by_loop_guard():
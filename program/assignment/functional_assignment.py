@@ -14,6 +14,7 @@ from symengine.lib.symengine_wrapper import (
 )
 from sympy import I, N, re, im, Rational, diff, Symbol as SSymbol
 import math
+import numpy as np
 
 if TYPE_CHECKING:
     from recurrences import RecBuilderContext
@@ -21,7 +22,7 @@ if TYPE_CHECKING:
 from .assignment import Assignment
 from program.condition import TrueCond
 from program.distribution import Distribution
-from .exceptions import FunctionalAssignmentException
+from .exceptions import FunctionalAssignmentException, EvaluationException
 
 
 class FunctionalAssignment(Assignment):
@@ -53,7 +54,7 @@ class FunctionalAssignment(Assignment):
             symbols.add(self.default)
         return symbols
 
-    def subs(self, substitutions):
+    def _subs(self, substitutions):
         self.default = self.default.subs(substitutions)
         self.condition.subs(substitutions)
         self.argument.subs(substitutions)
@@ -70,6 +71,23 @@ class FunctionalAssignment(Assignment):
             return math.exp(arg_value)
         raise FunctionalAssignmentException(f"Function {self.func} not supported.")
 
+    def evaluate_right_side_batch(self, state, size):
+        if self.argument.is_Number:
+            arg_values = np.full(size, float(self.argument))
+        elif self.argument in state:
+            arg_values = state[self.argument]
+        else:
+            raise EvaluationException(
+                f"Tried to evaluate {self.argument} which is not set in the given batch of states"
+            )
+        if self.func == "Sin":
+            return np.sin(arg_values)
+        if self.func == "Cos":
+            return np.cos(arg_values)
+        if self.func == "Exp":
+            return np.exp(arg_values)
+        raise FunctionalAssignmentException(f"Function {self.func} not supported.")
+
     def get_support(self):
         if self.func == "Sin" or self.func == "Cos":
             return {(-One(), One())}
@@ -98,6 +116,19 @@ class FunctionalAssignment(Assignment):
         if_not_cond = (1 - arithm_cond) * (self.default**k) * rest
         return if_cond + if_not_cond
 
+    def get_moment_cached(
+        self,
+        k: int,
+        rec_builder_context: "RecBuilderContext",
+        arithm_cond: Expr = 1,
+        rest: Expr = 1,
+    ):
+        # the context needs to be updated even if the moment is already memoized
+        if not self.argument.is_Number:
+            rec_builder_context.add_func_assignments(self)
+            rec_builder_context.add_trigger(self.argument, self.variable)
+        return super().get_moment_cached(k, rec_builder_context, arithm_cond, rest)
+
     def get_const_moment(self, k: int):
         if self.func == "Sin":
             return self.convert_func_moment(sin(self.argument) ** k)
@@ -1,8 +1,9 @@
 from typing import List
 import random
+import numpy as np
 from symengine.lib.symengine_wrapper import Expr, sympify
 
-from utils import float_to_rational, get_monoms
+from utils import float_to_rational, get_monoms, eval_batch, sample_categorical_batch
 from .assignment import Assignment
 from program.condition import TrueCond
 from .exceptions import EvaluationException
@@ -55,7 +56,7 @@ class PolyAssignment(Assignment):
             result += "  |  " + str(self.condition) + "  :  " + str(self.default)
         return result
 
-    def subs(self, substitutions):
+    def _subs(self, substitutions):
         self.default = self.default.subs(substitutions)
         self.condition.subs(substitutions)
         self.polynomials = [p.subs(substitutions) for p in self.polynomials]
@@ -98,6 +99,30 @@ class PolyAssignment(Assignment):
 
         return random.choices(polynomials, weights=probabilities, k=1)[0]
 
+    def evaluate_right_side_batch(self, state, size):
+        polynomials = []
+        for pol in self.polynomials:
+            p = eval_batch(pol, state, size)
+            if p is None:
+                raise EvaluationException(
+                    f"Polynomial {pol} doesn't evaluate to numbers with the given batch of states"
+                )
+            polynomials.append(p)
+        if len(polynomials) == 1:
+            return polynomials[0]
+
+        probabilities = []
+        for prob in self.probabilities:
+            p = eval_batch(prob, state, size)
+            if p is None:
+                raise EvaluationException(
+                    f"Probability {prob} doesn't evaluate to numbers with the given batch of states"
+                )
+            probabilities.append(p)
+
+        choices = sample_categorical_batch(probabilities)
+        return np.stack(polynomials, axis=1)[np.arange(size), choices]
+
     def get_moment(
         self, k: int, rec_builder_context, arithm_cond: Expr = 1, rest: Expr = 1
     ):
@@ -1,3 +1,4 @@
+import numpy as np
 from .condition import Condition
 from .true_cond import TrueCond
 
@@ -34,6 +35,12 @@ class And(Condition):
     def evaluate(self, state):
         return self.cond1.evaluate(state) and self.cond2.evaluate(state)
 
+    def evaluate_batch(self, state, size):
+        return np.logical_and(
+            self.cond1.evaluate_batch(state, size),
+            self.cond2.evaluate_batch(state, size),
+        )
+
     def get_conjuncts(self):
         return self.cond1.get_conjuncts() + self.cond2.get_conjuncts()
 
@@ -10,7 +10,7 @@ from .exceptions import (
     NormalizingException,
     EvaluationException,
 )
-from utils import get_unique_var, get_valid_values, evaluate_cop
+from utils import get_unique_var, get_valid_values, evaluate_cop, eval_batch
 from program.type import Finite
 
 
@@ -37,6 +37,15 @@ class Atom(Condition):
         result = evaluate_cop(float(poly1), self.cop, float(poly2))
         return result
 
+    def evaluate_batch(self, state, size):
+        poly1 = eval_batch(self.poly1, state, size)
+        poly2 = eval_batch(self.poly2, state, size)
+        if poly1 is None or poly2 is None:
+            raise EvaluationException(
+                f"Atom {self} cannot be fully evaluated with the given batch of states"
+            )
+        return evaluate_cop(poly1, self.cop, poly2)
+
     def is_reduced(self):
         return self.poly1.is_Symbol and self.poly2.is_Integer
 
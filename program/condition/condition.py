@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import List, Tuple, Dict
+import numpy as np
 from symengine.lib.symengine_wrapper import Expr, Symbol
 
 
@@ -42,6 +43,13 @@ class Condition(ABC):
     def evaluate(self, state: Dict[Symbol, float]):
         pass
 
+    @abstractmethod
+    def evaluate_batch(self, state: Dict[Symbol, np.ndarray], size: int) -> np.ndarray:
+        """
+        Evaluates the condition for a whole batch of states and returns a boolean array of length size.
+        """
+        pass
+
     @abstractmethod
     def to_arithm(self, program) -> Expr:
         pass
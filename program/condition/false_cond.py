@@ -1,3 +1,4 @@
+import numpy as np
 from symengine.lib.symengine_wrapper import sympify, Expr
 from .condition import Condition
 
@@ -18,6 +19,9 @@ class FalseCond(Condition):
     def evaluate(self, state):
         return False
 
+    def evaluate_batch(self, state, size):
+        return np.zeros(size, dtype=bool)
+
     def to_arithm(self, _) -> Expr:
         return sympify(0)
 
@@ -1,3 +1,4 @@
+import numpy as np
 from .condition import Condition
 
 
@@ -24,6 +25,9 @@ class Not(Condition):
     def evaluate(self, state):
         return not self.cond.evaluate(state)
 
+    def evaluate_batch(self, state, size):
+        return np.logical_not(self.cond.evaluate_batch(state, size))
+
     def to_arithm(self, p):
         return 1 - self.cond.to_arithm(p)
 
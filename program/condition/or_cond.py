@@ -1,3 +1,4 @@
+import numpy as np
 from .condition import Condition
 from .false_cond import FalseCond
 
@@ -34,6 +35,12 @@ class Or(Condition):
     def evaluate(self, state):
         return self.cond1.evaluate(state) or self.cond2.evaluate(state)
 
+    def evaluate_batch(self, state, size):
+        return np.logical_or(
+            self.cond1.evaluate_batch(state, size),
+            self.cond2.evaluate_batch(state, size),
+        )
+
     def to_arithm(self, p):
         not_cond1 = 1 - self.cond1.to_arithm(p)
         not_cond2 = 1 - self.cond2.to_arithm(p)
@@ -1,3 +1,4 @@
+import numpy as np
 from symengine.lib.symengine_wrapper import sympify
 from .condition import Condition
 
@@ -26,6 +27,9 @@ class TrueCond(Condition):
     def evaluate(self, state):
         return True
 
+    def evaluate_batch(self, state, size):
+        return np.ones(size, dtype=bool)
+
     def get_free_symbols(self):
         return set()
 
@@ -1,7 +1,7 @@
 from symengine.lib.symengine_wrapper import Expr, Zero, One
 from .distribution import Distribution
+from utils import eval_batch
 from .exceptions import EvaluationException
-from scipy.stats import bernoulli
 from sympy import I, E, sympify
 
 
@@ -23,6 +23,8 @@ class Bernoulli(Distribution):
         self.p = self.p.subs(substitutions)
 
     def sample(self, state):
+        from scipy.stats import bernoulli
+
         p = self.p.subs(state)
         if not p.is_Number:
             raise EvaluationException(
@@ -30,6 +32,16 @@ class Bernoulli(Distribution):
             )
         return bernoulli.rvs(float(p))
 
+    def sample_batch(self, state, size):
+        from scipy.stats import bernoulli
+
+        p = eval_batch(self.p, state, size)
+        if p is None:
+            raise EvaluationException(
+                f"Parameter {self.p} doesn't evaluate to numbers with the given batch of states"
+            )
+        return bernoulli.rvs(p, size=size).astype(float)
+
     def cf(self, t: Expr):
         p = sympify(self.p)
         t = sympify(t)
@@ -2,10 +2,9 @@ from functools import lru_cache
 
 from symengine.lib.symengine_wrapper import Expr, sympy2symengine, One, Zero
 from .distribution import Distribution
+from utils import eval_batch
 from .exceptions import EvaluationException
-from scipy.stats import beta
 from sympy import sympify, Rational, E, I
-from sympy.stats import Beta as BetaDist, E as EV
 
 
 class Beta(Distribution):
@@ -27,6 +26,8 @@ class Beta(Distribution):
 
     @lru_cache()
     def get_moment(self, k: int):
+        from sympy.stats import Beta as BetaDist, E as EV
+
         a = sympify(self.a)
         b = sympify(self.b)
         scale = sympify(self.scale)
@@ -42,6 +43,8 @@ class Beta(Distribution):
         self.scale = self.scale.subs(substitutions)
 
     def sample(self, state):
+        from scipy.stats import beta
+
         a = self.a.subs(state)
         b = self.b.subs(state)
         scale = self.scale.subs(state)
@@ -55,7 +58,25 @@ class Beta(Distribution):
             )
         return scale * beta.rvs(float(a), float(b))
 
+    def sample_batch(self, state, size):
+        from scipy.stats import beta
+
+        a = eval_batch(self.a, state, size)
+        b = eval_batch(self.b, state, size)
+        scale = eval_batch(self.scale, state, size)
+        if a is None or b is None:
+            raise EvaluationException(
+                f"Parameters {self.a}, {self.b} don't evaluate to numbers with the given batch of states"
+            )
+        if scale is None:
+            raise EvaluationException(
+                f"Parameter {self.scale}, does not evaluate to numbers with the given batch of states"
+            )
+        return scale * beta.rvs(a, b, size=size)
+
     def cf(self, t: Expr):
+        from sympy.stats import Beta as BetaDist, E as EV
+
         a = sympify(self.a)
         b = sympify(self.b)
         scale = sympify(self.scale)
@@ -64,6 +85,8 @@ class Beta(Distribution):
         return EV(E ** (I * t * scale * x))
 
     def mgf(self, t: Expr):
+        from sympy.stats import Beta as BetaDist, E as EV
+
         a = sympify(self.a)
         b = sympify(self.b)
         scale = sympify(self.scale)
@@ -4,6 +4,7 @@ import random
 
 from symengine.lib.symengine_wrapper import Expr, sympify
 from .distribution import Distribution
+from utils import eval_batch, sample_categorical_batch
 from .exceptions import EvaluationException
 
 
@@ -51,6 +52,18 @@ class Categorical(Distribution):
 
         return random.choices(range(len(probabilities)), weights=probabilities, k=1)[0]
 
+    def sample_batch(self, state, size):
+        probabilities = []
+        for prob in self.probabilities:
+            p = eval_batch(prob, state, size)
+            if p is None:
+                raise EvaluationException(
+                    f"Probability {prob} doesn't evaluate to numbers with the given batch of states"
+                )
+            probabilities.append(p)
+
+        return sample_categorical_batch(probabilities).astype(float)
+
     def subs(self, substitutions):
         self.probabilities = [p.subs(substitutions) for p in self.probabilities]
 
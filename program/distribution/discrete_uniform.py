@@ -1,6 +1,7 @@
 from functools import lru_cache
 from typing import List
 import random
+import numpy as np
 
 from symengine.lib.symengine_wrapper import sympify, Expr, Rational
 from sympy import I, E, sympify as ssympify
@@ -44,6 +45,10 @@ class DiscreteUniform(Distribution):
     def sample(self, state):
         return random.choice(self.values)
 
+    def sample_batch(self, state, size):
+        low, high = int(self.values[0]), int(self.values[-1])
+        return np.random.randint(low, high + 1, size=size).astype(float)
+
     def cf(self, t: Expr):
         a = ssympify(self.values[0])
         b = ssympify(self.values[-1])
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import Union, Tuple, Set, Dict
+import numpy as np
 from symengine.lib.symengine_wrapper import Expr, Symbol, sympify
 from utils import float_to_rational
 
@@ -31,6 +32,13 @@ class Distribution(ABC):
     def sample(self, state: Dict[Symbol, float]):
         pass
 
+    @abstractmethod
+    def sample_batch(self, state: Dict[Symbol, np.ndarray], size: int) -> np.ndarray:
+        """
+        Vectorized counterpart of "sample". Draws one sample for each of the size many states in the batch.
+        """
+        pass
+
     def cf(self, t: Expr):
         raise NotImplementedError()
 
@@ -2,8 +2,8 @@ from functools import lru_cache
 from symengine.lib.symengine_wrapper import Expr, oo, Zero, factorial
 from sympy import sympify, I
 from .distribution import Distribution
+from utils import eval_batch
 from .exceptions import EvaluationException
-from scipy.stats import expon
 
 
 class Exponential(Distribution):
@@ -25,6 +25,8 @@ class Exponential(Distribution):
         self.lamb = self.lamb.subs(substitutions)
 
     def sample(self, state):
+        from scipy.stats import expon
+
         lamb = self.lamb.subs(state)
         if not lamb.is_Number:
             raise EvaluationException(
@@ -32,6 +34,16 @@ class Exponential(Distribution):
             )
         return expon.rvs(scale=1 / float(lamb))
 
+    def sample_batch(self, state, size):
+        from scipy.stats import expon
+
+        lamb = eval_batch(self.lamb, state, size)
+        if lamb is None:
+            raise EvaluationException(
+                f"Parameter {self.lamb} doesn't evaluate to numbers with the given batch of states"
+            )
+        return expon.rvs(scale=1 / lamb, size=size)
+
     def get_free_symbols(self):
         return self.lamb.free_symbols
 
@@ -2,10 +2,9 @@ from functools import lru_cache
 
 from symengine.lib.symengine_wrapper import Expr, sympy2symengine, oo
 from .distribution import Distribution
+from utils import eval_batch
 from .exceptions import EvaluationException
-from scipy.stats import gamma
 from sympy import sympify, Rational, I
-from sympy.stats import Gamma as GammaDist, E as EV
 
 
 class Gamma(Distribution):
@@ -20,6 +19,8 @@ class Gamma(Distribution):
 
     @lru_cache()
     def get_moment(self, p: int):
+        from sympy.stats import Gamma as GammaDist, E as EV
+
         k = sympify(self.k)
         theta = sympify(self.theta)
         x = GammaDist("x", k, theta)
@@ -33,6 +34,8 @@ class Gamma(Distribution):
         self.theta = self.theta.subs(substitutions)
 
     def sample(self, state):
+        from scipy.stats import gamma
+
         k = self.k.subs(state)
         theta = self.theta.subs(state)
         if not k.is_Number or not theta.is_Number:
@@ -41,6 +44,17 @@ class Gamma(Distribution):
             )
         return gamma.rvs(float(k), scale=float(theta))
 
+    def sample_batch(self, state, size):
+        from scipy.stats import gamma
+
+        k = eval_batch(self.k, state, size)
+        theta = eval_batch(self.theta, state, size)
+        if k is None or theta is None:
+            raise EvaluationException(
+                f"Parameters {self.k}, {self.theta} don't evaluate to numbers with the given batch of states"
+            )
+        return gamma.rvs(k, scale=theta, size=size)
+
     def cf(self, t: Expr):
         theta = sympify(self.theta)
         k = sympify(self.k)
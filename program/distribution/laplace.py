@@ -2,10 +2,9 @@ from functools import lru_cache
 
 from symengine.lib.symengine_wrapper import Expr, oo, sympy2symengine
 from .distribution import Distribution
+from utils import eval_batch
 from .exceptions import EvaluationException
-from scipy.stats import laplace
 from sympy import Rational, sympify, I, E, Abs
-from sympy.stats import E as EV, Laplace as LaplaceRV
 
 
 class Laplace(Distribution):
@@ -20,6 +19,8 @@ class Laplace(Distribution):
 
     @lru_cache()
     def get_moment(self, k: int):
+        from sympy.stats import E as EV, Laplace as LaplaceRV
+
         x = LaplaceRV("x", self.mu, self.b)
         return sympy2symengine(Rational(EV(x**k)))
 
@@ -31,6 +32,8 @@ class Laplace(Distribution):
         self.b = self.b.subs(substitutions)
 
     def sample(self, state):
+        from scipy.stats import laplace
+
         mu = self.mu.subs(state)
         b = self.b.subs(state)
         if not mu.is_Number or not b.is_Number:
@@ -39,6 +42,17 @@ class Laplace(Distribution):
             )
         return laplace.rvs(scale=float(b), loc=float(mu))
 
+    def sample_batch(self, state, size):
+        from scipy.stats import laplace
+
+        mu = eval_batch(self.mu, state, size)
+        b = eval_batch(self.b, state, size)
+        if mu is None or b is None:
+            raise EvaluationException(
+                f"Parameters {self.mu}, {self.b} don't evaluate to numbers with the given batch of states"
+            )
+        return laplace.rvs(scale=b, loc=mu, size=size)
+
     def cf(self, t: Expr):
         mu = sympify(self.mu)
         b = sympify(self.b)
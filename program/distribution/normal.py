@@ -2,11 +2,11 @@ from functools import lru_cache
 
 from symengine.lib.symengine_wrapper import Expr, oo, sympy2symengine
 from .distribution import Distribution
+from utils import eval_batch
 from .exceptions import EvaluationException
-from scipy.stats import norm
 from sympy import sympify, Rational, E, I
-from sympy.stats import Normal as NormalDist, E as EV
 import math
+import numpy as np
 
 
 class Normal(Distribution):
@@ -21,6 +21,8 @@ class Normal(Distribution):
 
     @lru_cache()
     def get_moment(self, k: int):
+        from sympy.stats import Normal as NormalDist, E as EV
+
         mu = sympify(self.mu)
         sigma = sympify(f"({self.sigma2}) ** (1/2)")
         x = NormalDist("x", mu, sigma)
@@ -34,6 +36,8 @@ class Normal(Distribution):
         self.sigma2 = self.sigma2.subs(substitutions)
 
     def sample(self, state):
+        from scipy.stats import norm
+
         mu = sympify(self.mu.subs(state))
         sigma2 = sympify(self.sigma2.subs(state))
         if not mu.is_real or not sigma2.is_real:
@@ -42,6 +46,17 @@ class Normal(Distribution):
             )
         return norm.rvs(loc=float(mu), scale=math.sqrt(float(sigma2)))
 
+    def sample_batch(self, state, size):
+        from scipy.stats import norm
+
+        mu = eval_batch(self.mu, state, size)
+        sigma2 = eval_batch(self.sigma2, state, size)
+        if mu is None or sigma2 is None:
+            raise EvaluationException(
+                f"Parameters {self.mu}, {self.sigma2} don't evaluate to numbers with the given batch of states"
+            )
+        return norm.rvs(loc=mu, scale=np.sqrt(sigma2), size=size)
+
     def cf(self, t: Expr):
         mu = sympify(self.mu)
         sigma2 = sympify(self.sigma2)
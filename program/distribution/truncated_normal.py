@@ -3,10 +3,10 @@ from functools import lru_cache
 from symengine.lib.symengine_wrapper import Expr, sqrt, sympy2symengine, one, zero
 from program.distribution import Distribution
 from program.distribution.exceptions import EvaluationException
-from scipy.stats import truncnorm
+from utils import eval_batch
 from sympy import sympify, Rational, E, I
-from sympy.stats import Normal, density, cdf
 import math
+import numpy as np
 
 
 class TruncNormal(Distribution):
@@ -35,6 +35,8 @@ class TruncNormal(Distribution):
         Implements the recursive definition of the central moments in:
         https://people.smp.uq.edu.au/YoniNazarathy/teaching_projects/studentWork/EricOrjebin_TruncatedNormalMoments.pdf
         """
+        from sympy.stats import Normal, density, cdf
+
         mu = self.mu
         a = self.a
         b = self.b
@@ -62,6 +64,8 @@ class TruncNormal(Distribution):
         return sympy2symengine(Rational(str(float(m[k].simplify()))))
 
     def mgf(self, t: Expr):
+        from sympy.stats import Normal, cdf
+
         t = sympify(t)
         mu = sympify(self.mu)
         sigma2 = sympify(self.sigma2)
@@ -94,6 +98,8 @@ class TruncNormal(Distribution):
         self.b = self.b.subs(substitutions)
 
     def sample(self, state):
+        from scipy.stats import truncnorm
+
         mu = self.mu.subs(state).simplify()
         sigma2 = self.sigma2.subs(state).simplify()
         a = self.a.subs(state).simplify()
@@ -111,6 +117,19 @@ class TruncNormal(Distribution):
             float(a), float(b), loc=float(mu), scale=math.sqrt(float(sigma2))
         )
 
+    def sample_batch(self, state, size):
+        from scipy.stats import truncnorm
+
+        mu = eval_batch(self.mu, state, size)
+        sigma2 = eval_batch(self.sigma2, state, size)
+        a = eval_batch(self.a, state, size)
+        b = eval_batch(self.b, state, size)
+        if mu is None or sigma2 is None or a is None or b is None:
+            raise EvaluationException(
+                f"Parameters {self.mu}, {self.sigma2}, {self.a}, {self.b} don't evaluate to numbers with the given batch of states"
+            )
+        return truncnorm.rvs(a, b, loc=mu, scale=np.sqrt(sigma2), size=size)
+
     def get_free_symbols(self):
         symbols = self.mu.free_symbols
         symbols = symbols.union(self.sigma2.free_symbols)
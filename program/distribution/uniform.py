@@ -3,8 +3,8 @@ from functools import lru_cache
 from sympy import sympify, E, I, Piecewise
 from symengine.lib.symengine_wrapper import Expr
 from .distribution import Distribution
+from utils import eval_batch
 from .exceptions import EvaluationException
-from scipy.stats import uniform
 
 
 class Uniform(Distribution):
@@ -35,6 +35,8 @@ class Uniform(Distribution):
         return {(self.a, self.b)}
 
     def sample(self, state):
+        from scipy.stats import uniform
+
         a = sympify(self.a.subs(state))
         b = sympify(self.b.subs(state))
         if not a.is_real or not b.is_real:
@@ -43,6 +45,17 @@ class Uniform(Distribution):
             )
         return uniform.rvs(loc=float(a), scale=float(b) - float(a))
 
+    def sample_batch(self, state, size):
+        from scipy.stats import uniform
+
+        a = eval_batch(self.a, state, size)
+        b = eval_batch(self.b, state, size)
+        if a is None or b is None:
+            raise EvaluationException(
+                f"Parameters {self.a}, {self.b} don't evaluate to numbers with the given batch of states"
+            )
+        return uniform.rvs(loc=a, scale=b - a, size=size)
+
     def cf(self, t: Expr):
         if t == 0:
             return sympify(1)
@@ -2,3 +2,4 @@ from .rec_builder import RecBuilder
 from .diff_rec_builder import DiffRecBuilder
 from .recurrences import Recurrences
 from .rec_builder_context import RecBuilderContext
+from .disk_cache import DiskCache, get_disk_cache, get_cache_key, get_content_key
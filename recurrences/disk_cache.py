@@ -0,0 +1,130 @@
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import Dict, Optional
+from sympy import sympify as sympy_sympify
+from program import Program
+import settings
+
+# Increase whenever the format or the semantics of cached entries change
+CACHE_VERSION = 2
+
+# The settings which influence recurrences and their solutions
+KEY_SETTINGS = [
+    "transform_categoricals",
+    "cond2arithm",
+    "disable_type_inference",
+    "type_fp_iterations",
+    "numeric_roots",
+    "numeric_croots",
+    "numeric_eps",
+    "numeric_solver",
+    "precision",
+    "trivial_guard",
+    "exact_func_moments",
+]
+
+
+class DiskCache:
+    """
+    Persistent content-addressed cache. Every entry is stored as a pickle file named by its key.
+    The modification time of a file marks its last use. If the total size exceeds max_size (in bytes),
+    the least recently used entries are evicted.
+    """
+
+    directory: str
+    max_size: int
+
+    def __init__(self, directory: str, max_size: int):
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+
+    def _get_path(self, key: str):
+        return os.path.join(self.directory, f"{key}.pickle")
+
+    def get(self, key: str):
+        """
+        Returns the entry for the given key or None if there is no (readable) entry.
+        """
+        path = self._get_path(key)
+        try:
+            with open(path, "rb") as file:
+                value = pickle.load(file)
+            os.utime(path)
+        except Exception:
+            return None
+        return value
+
+    def put(self, key: str, value):
+        self.put_all({key: value})
+
+    def put_all(self, entries: Dict[str, object]):
+        """
+        Stores multiple entries at once, old entries are only evicted once afterwards.
+        """
+        for key, value in entries.items():
+            # write to a temporary file first, such that concurrent processes never read partial entries
+            file_descriptor, tmp_path = tempfile.mkstemp(
+                dir=self.directory, suffix=".tmp"
+            )
+            with os.fdopen(file_descriptor, "wb") as file:
+                pickle.dump(value, file)
+            os.replace(tmp_path, self._get_path(key))
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        total_size = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pickle"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_size += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total_size -= size
+
+
+def get_disk_cache() -> Optional[DiskCache]:
+    """
+    Returns the persistent cache configured in the settings or None if it is disabled.
+    """
+    if settings.cache_dir is None:
+        return None
+    return DiskCache(settings.cache_dir, settings.cache_max_size)
+
+
+def get_cache_key(program: Program, kind: str, monomial) -> str:
+    """
+    Returns the key of an entry of the given kind (e.g. "recurrences") for a monomial in the given program.
+    The key is the hash of the normalized program, the relevant settings and the monomial.
+    """
+    return get_content_key(
+        kind,
+        "\n".join(
+            [
+                str(program),
+                str(sorted(program.symbols, key=str)),
+                str(sympy_sympify(monomial)),
+            ]
+        ),
+    )
+
+
+def get_content_key(kind: str, content: str) -> str:
+    """
+    Returns the key of an entry of the given kind which only depends on the given content and the relevant
+    settings. Unlike get_cache_key, the whole program is not part of the key. Hence, if the content only
+    describes the parts of a program an entry depends on, the entry survives edits of other parts.
+    """
+    flags = [f"{s}={getattr(settings, s)}" for s in KEY_SETTINGS]
+    content = "\n".join([str(CACHE_VERSION), kind, *flags, content])
+    return hashlib.sha256(content.encode()).hexdigest()
@@ -1,13 +1,18 @@
-from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from math import prod
-from typing import Set, List
-from symengine.lib.symengine_wrapper import Expr, Symbol, sympify, One, Zero
+from multiprocessing import get_context
+from typing import Dict, FrozenSet, Set, List
+from symengine.lib.symengine_wrapper import Expr, Symbol, sympify, Integer, One
+from sympy import sympify as sympy_sympify
 from program import Program
 from program.assignment import Assignment
-from program.type import Finite
 from .recurrences import Recurrences
 from .rec_builder_context import RecBuilderContext
-from utils import get_terms_with_var, get_terms_with_vars, get_monoms
+from .disk_cache import DiskCache, get_disk_cache, get_cache_key, get_content_key
+from .sparse_poly import SparsePoly
+from utils import get_terms_with_vars, get_monoms
+import settings
 
 
 class RecBuilder:
@@ -27,14 +32,46 @@ class RecBuilder:
         """
         Constructs a complete system of linear recurrences (over expected values) completely describing
         the expected value of "monomial".
+        If the persistent cache is enabled, the recurrences and initial values are looked up there first.
         """
-        monomial = sympify(monomial)
-        to_process = {monomial}
+        return self.get_combined_recurrences(frozenset({sympify(monomial)}))
+
+    @lru_cache(maxsize=None)
+    def get_combined_recurrences(self, monomials: FrozenSet[Expr]) -> Recurrences:
+        """
+        Constructs a single complete system of linear recurrences describing the expected values of all given
+        monomials. Monomials shared by the closures of multiple monomials are only processed once.
+        """
+        monomials = frozenset(sympify(m) for m in monomials)
+        cache = get_disk_cache()
+        if cache is not None:
+            if len(monomials) == 1:
+                key_monomials = next(iter(monomials))
+            else:
+                key_monomials = tuple(sorted(monomials, key=str))
+            key = get_cache_key(self.program, "recurrences", key_monomials)
+            cached = cache.get(key)
+            if cached is not None:
+                return Recurrences(*cached, self.program)
+
+        # entries of the recurrences and initial values of single monomials, stored after the closure is complete
+        new_entries = {}
+        get_recurrence = self.get_recurrence
+        if settings.recurrence_workers > 1:
+            get_recurrence = self._get_recurrences_parallel(
+                monomials, cache, new_entries
+            ).__getitem__
+        elif cache is not None:
+            get_recurrence = partial(
+                self._get_recurrence_incremental, cache, new_entries
+            )
+
+        to_process = set(monomials)
         processed = set()
         recurrence_dict = {}
         while to_process:
             next_monom = to_process.pop()
-            recurrence_dict[next_monom] = self.get_recurrence(next_monom)
+            recurrence_dict[next_monom] = get_recurrence(next_monom)
             processed.add(next_monom)
             monoms = get_monoms(
                 recurrence_dict[next_monom], constant_symbols=self.program.symbols
@@ -43,8 +80,141 @@ class RecBuilder:
                 if monom not in processed:
                     to_process.add(monom)
 
-        init_values_dict = self.get_initial_values(processed)
-        return Recurrences(recurrence_dict, init_values_dict, self.program)
+        if cache is None:
+            init_values_dict = self.get_initial_values(processed)
+        else:
+            init_values_dict = {
+                m: self._get_initial_value_incremental(cache, new_entries, m)
+                for m in processed
+            }
+        recurrences = Recurrences(recurrence_dict, init_values_dict, self.program)
+        if cache is not None:
+            new_entries[key] = (
+                recurrences.recurrence_dict,
+                recurrences.init_values_dict,
+            )
+            cache.put_all(new_entries)
+        return recurrences
+
+    def _get_recurrence_fingerprint(self, monomial: Expr) -> str:
+        """
+        Returns a fingerprint of all parts of the program the recurrence of the monomial depends on. The bottom-up
+        substitution can only reach the assignments of variables the monomial (transitively) depends on. For all
+        other assignments, only their variables matter, as they decide which assignments are substituted.
+        """
+        reachable = set(monomial.free_symbols)
+        parts = [str(sympy_sympify(monomial))]
+        last_assign_index = self._get_last_assign_index(monomial.free_symbols)
+        for i in reversed(range(last_assign_index + 1)):
+            assignment = self.program.loop_body[i]
+            if assignment.variable in reachable:
+                reachable |= assignment.get_free_symbols()
+                parts.append(str(assignment))
+            else:
+                parts.append(str(assignment.variable))
+        return "\n".join(parts + self._get_context_fingerprint(reachable))
+
+    def _get_initial_value_fingerprint(self, monomial: Expr) -> str:
+        """
+        Returns a fingerprint of all parts of the program the initial value of the monomial depends on
+        """
+        reachable = set(monomial.free_symbols)
+        parts = [str(sympy_sympify(monomial))]
+        for assignment in reversed(self.program.initial):
+            if assignment.variable in reachable:
+                reachable |= assignment.get_free_symbols()
+                parts.append(str(assignment))
+            else:
+                parts.append(str(assignment.variable))
+        return "\n".join(parts + self._get_context_fingerprint(reachable))
+
+    def _get_context_fingerprint(self, variables: Set[Symbol]) -> List[str]:
+        types = [self.program.get_type(v) for v in sorted(variables, key=str)]
+        return [
+            *[str(t) for t in types if t is not None],
+            str(sorted(self.program.symbols, key=str)),
+            str(sorted(self.program.abstracted_const_store.items(), key=str)),
+        ]
+
+    def _get_cached_recurrence(self, cache: DiskCache, monomial: Expr):
+        if cache is None:
+            return None
+        key = get_content_key("recurrence", self._get_recurrence_fingerprint(monomial))
+        cached = cache.get(key)
+        return None if cached is None else sympify(cached)
+
+    def _add_recurrence_entry(self, new_entries, monomial: Expr, recurrence: Expr):
+        key = get_content_key("recurrence", self._get_recurrence_fingerprint(monomial))
+        new_entries[key] = sympy_sympify(recurrence)
+
+    def _get_recurrence_incremental(
+        self, cache: DiskCache, new_entries, monomial: Expr
+    ) -> Expr:
+        """
+        Returns the recurrence of the monomial. After an edit of the program, it is only constructed again if the
+        edit touches the parts of the program it depends on.
+        """
+        recurrence = self._get_cached_recurrence(cache, monomial)
+        if recurrence is None:
+            recurrence = self.get_recurrence(monomial)
+            self._add_recurrence_entry(new_entries, monomial, recurrence)
+        return recurrence
+
+    def _get_initial_value_incremental(
+        self, cache: DiskCache, new_entries, monomial: Expr
+    ) -> Expr:
+        key = get_content_key(
+            "initial value", self._get_initial_value_fingerprint(monomial)
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            return sympify(cached)
+        value = self.get_initial_value(monomial)
+        new_entries[key] = sympy_sympify(value)
+        return value
+
+    def _get_recurrences_parallel(
+        self, monomials: FrozenSet[Expr], cache: DiskCache = None, new_entries=None
+    ) -> Dict[Expr, Expr]:
+        """
+        Constructs the recurrences of all monomials in the closure of the given monomials by a pool of worker
+        processes. The closure is explored in waves: all monomials newly discovered by the recurrences of one wave
+        form the next wave. The program is only sent to the workers once (they are forked).
+        The caller walks the closure in the same order as without workers, hence the result is identical.
+        Recurrences found in the persistent cache are not sent to the workers.
+        """
+        recurrences = {}
+        wave = set(monomials)
+        with ProcessPoolExecutor(
+            max_workers=settings.recurrence_workers,
+            mp_context=get_context("fork"),
+            initializer=_init_worker,
+            initargs=(self.program,),
+        ) as executor:
+            while wave:
+                wave = sorted(wave, key=str)
+                missing = []
+                for m in wave:
+                    cached = self._get_cached_recurrence(cache, m)
+                    if cached is None:
+                        missing.append(m)
+                    else:
+                        recurrences[m] = cached
+                chunksize = max(1, len(missing) // (4 * settings.recurrence_workers))
+                results = executor.map(_get_recurrence, missing, chunksize=chunksize)
+                for m, recurrence in zip(missing, results):
+                    recurrences[m] = recurrence
+                    if cache is not None:
+                        self._add_recurrence_entry(new_entries, m, recurrence)
+                wave = {
+                    monom
+                    for m in wave
+                    for _, monom in get_monoms(
+                        recurrences[m], constant_symbols=self.program.symbols
+                    )
+                    if monom not in recurrences
+                }
+        return recurrences
 
     def get_recurrence_poly(self, poly: Expr, variables: List[Symbol]):
         """
@@ -68,19 +238,31 @@ class RecBuilder:
         """
         Constructs a single recurrence (the moment recurrence) for a given monomial, by bottom up substitution,
         and reducing the powers of finite-valued variables.
+        The substitution works on sparse polynomials and only the final result is converted back to symengine.
         """
         self.context = RecBuilderContext()
-        right_side = monomial
+        gens, gen_index = self._get_generators(monomial)
+        right_side = SparsePoly.from_expr(monomial, gens, gen_index)
         last_assign_index = self._get_last_assign_index(monomial.free_symbols)
         for i in reversed(range(last_assign_index + 1)):
             assignment = self.program.loop_body[i]
             if self._assign_replace_is_necessary(assignment, right_side):
-                right_side = right_side.expand()
-                right_side = self._replace_assign(right_side, assignment).expand()
+                right_side = self._replace_assign(right_side, assignment)
                 right_side = self._reduce_powers(right_side)
 
         right_side = self._reduce_powers(right_side)
-        return right_side.simplify().expand()
+        return right_side.simplify_coefficients().to_expr().expand()
+
+    def _get_generators(self, monomial: Expr):
+        """
+        Returns the generators of the sparse polynomials used to construct the recurrence or initial value of the
+        given monomial.
+        """
+        symbols = set(self.program.variables) | set(self.program.symbols)
+        symbols |= {a.variable for a in self.program.initial}
+        symbols |= {a.variable for a in self.program.loop_body}
+        symbols |= monomial.free_symbols
+        return SparsePoly.get_generators(symbols)
 
     def _assign_replace_is_necessary(self, assign: Assignment, poly: Expr):
         """
@@ -103,52 +285,45 @@ class RecBuilder:
                 max_index = self.program.var_to_index[v]
         return max_index
 
-    def _replace_assign(self, poly: Expr, assign: Assignment):
+    def _replace_assign(self, poly: SparsePoly, assign: Assignment):
         """
         Intuitively, the method returns the expected value of "poly" after executing assign.
         You can also think of the result as wp(assign, poly) (where wp is the weakest pre-expectation).
         The concrete operation very much depends on the type of the assignment.
         Hence, the method goes through all relevant monomials of poly and hands them to the assignment object.
+        The moment of an assignment is linear in the part of a monomial not containing assign.variable (or its
+        triggers). Hence, monomials with the same powers of these variables are handled together.
         """
         cond = assign.condition.to_arithm(self.program)
         # if poly doesn't contain triggers of assign.variables, we only need to worry about assign.variable itself
         if not self.context.var_has_triggers_in_expr(assign.variable, poly):
-            terms_with_var, rest_without_var = get_terms_with_var(poly, assign.variable)
-            result = rest_without_var
-            for var_power, rest in terms_with_var:
-                result += assign.get_moment(var_power, self.context, cond, rest)
-            return result
+            triggers = []
         # if poly contains triggers of assign.variable, we need to consider all monomials contain assign.variable
         # or any trigger variables.
         else:
             triggers = list(self.context.triggers[assign.variable])
-            variables = [assign.variable] + triggers
-            terms_with_vars, rest_without_vars = get_terms_with_vars(poly, variables)
-            result = rest_without_vars
-            for var_powers, rest in terms_with_vars:
-                var_power = var_powers[0]
-                trigger_monom = prod([v**p for v, p in zip(triggers, var_powers[1:])])
-                result += assign.get_moment(
-                    var_power, self.context, cond, trigger_monom * rest
-                )
-            return result
-
-    def _reduce_powers(self, poly: Expr):
-        """
-        Reduces the power of finite-valued variables in a given expression.
-        """
-        terms_with_vars, rest_without_vars = get_terms_with_vars(
-            poly, self.program.finite_variables
-        )
-        finite_types: List[Finite] = [
-            self.program.get_type(v) for v in self.program.finite_variables
-        ]
-        result = rest_without_vars
-        for var_powers, rest in terms_with_vars:
-            term = rest
-            for i in range(len(var_powers)):
-                term *= finite_types[i].reduce_power(var_powers[i])
-            result += term.expand()
+        groups, result = poly.split([assign.variable] + triggers)
+        for var_powers, rest in groups.items():
+            trigger_monom = prod([v**p for v, p in zip(triggers, var_powers[1:])])
+            moment = assign.get_moment_cached(
+                Integer(var_powers[0]), self.context, cond, sympify(trigger_monom)
+            )
+            result += SparsePoly.from_expr(moment, poly.gens, poly.gen_index) * rest
+        return result
+
+    def _reduce_powers(self, poly: SparsePoly):
+        """
+        Reduces the power of finite-valued variables in a given polynomial.
+        """
+        if not self.program.finite_variables:
+            return poly
+        groups, result = poly.split(self.program.finite_variables)
+        for var_powers, rest in groups.items():
+            term = One()
+            for v, p in zip(self.program.finite_variables, var_powers):
+                if p != 0:
+                    term *= self.program.get_type(v).reduce_power(Integer(p))
+            result += SparsePoly.from_expr(term, poly.gens, poly.gen_index) * rest
         return result
 
     def get_initial_value(self, monom: Expr):
@@ -157,12 +332,13 @@ class RecBuilder:
         assignments block.
         """
         self.context = RecBuilderContext()
-        result = monom
+        gens, gen_index = self._get_generators(monom)
+        result = SparsePoly.from_expr(monom, gens, gen_index)
         for assign in reversed(self.program.initial):
             if self._assign_replace_is_necessary(assign, result):
                 result = self._replace_assign(result, assign)
-                result = result.expand()
 
+        result = result.to_expr()
         for sym in monom.free_symbols.difference(self.program.symbols):
             result = result.xreplace({sym: Symbol(f"{sym}0")})
 
@@ -195,4 +371,24 @@ class RecBuilder:
     def get_solution(self, monom: Expr, solvers):
         # just lookup the solution
         solver = solvers[monom]
-        return solver.get(monom), solver.is_exact
+        solution = solver.get(monom)
+        return solution, solver.is_exact_for(monom)
+
+    def get_value_at(self, monom: Expr, n: int) -> Expr:
+        """
+        Computes the exact expected value of a monomial after n iterations without solving any recurrences.
+        """
+        return self.get_recurrences(monom).get_values_at(n)[sympy_sympify(monom)]
+
+
+# the RecBuilder of a worker process constructing recurrences in parallel
+_worker_rec_builder: RecBuilder = None
+
+
+def _init_worker(program: Program):
+    global _worker_rec_builder
+    _worker_rec_builder = RecBuilder(program)
+
+
+def _get_recurrence(monomial: Expr) -> Expr:
+    return _worker_rec_builder.get_recurrence(monomial)
@@ -1,6 +1,7 @@
 from typing import Dict, List, Set
 
-from sympy import sympify, Expr, Matrix, Symbol
+from sympy import sympify, Add, Expr, Matrix, Symbol
+from sympy.polys.matrices import DomainMatrix
 
 from program import Program
 from utils import get_monoms
@@ -15,8 +16,7 @@ class Recurrences:
     program: Program
     recurrence_dict: Dict[Expr, Expr]
     init_values_dict: Dict[Expr, Expr]
-    recurrence_matrix: Matrix
-    init_values_vector: Matrix
+    recurrence_rows: Dict[Expr, Dict[Expr, Expr]]
     monomials: List[Expr]
     dependencies: Dict[Expr, Set[Expr]]
     is_acyclic: bool
@@ -48,46 +48,109 @@ class Recurrences:
 
     def _init_data(self):
         """
-        Initializes the recurrence matrix as well as the initial value vector
+        Initializes the sparse rows of the recurrence matrix. The row of a monomial maps every monomial it depends on
+        (and 1 for the constant inhomogeneous part) to its non-zero coefficient.
         """
-        coefficients = []
-        default = {w: sympify(0) for w in self.monomials}
+        constant_symbols = {sympify(s) for s in self.constant_symbols}
+        self.recurrence_rows = {}
         for v in self.monomials:
-            # Every monomial is described by one recurrence relation depending on other monomial
-            # So in every row we collect the dependency coefficients
-            current_coeffs = default.copy()
             monoms = get_monoms(
                 self.recurrence_dict[v],
-                constant_symbols={sympify(s) for s in self.constant_symbols},
+                constant_symbols=constant_symbols,
                 with_constant=True,
                 zero=sympify(0),
                 one=sympify(1),
             )
-            self.dependencies[v] = set()
+            # one monom might appear multiple times in monoms
+            row = {}
             for coeff, monom in monoms:
-                # one monom might appear multiple times in monoms
-                if monom == 1:
-                    current_coeffs[monom] = coeff
-                    self.is_inhomogeneous = True
-                else:
-                    if monom != v:
-                        self.dependencies[v].add(monom)
-                    current_coeffs[monom] += coeff
-            coefficients.append([c.expand() for c in current_coeffs.values()])
+                row[monom] = row.get(monom, sympify(0)) + coeff
+            row = {monom: coeff.expand() for monom, coeff in row.items()}
+            self.recurrence_rows[v] = {m: c for m, c in row.items() if c != 0}
+            self.dependencies[v] = {m for m in self.recurrence_rows[v] if m != 1}
+            self.dependencies[v].discard(v)
+            if 1 in self.recurrence_rows[v]:
+                self.is_inhomogeneous = True
+
+    def evaluate_row(self, monomial: Expr, values: Dict[Expr, Expr]) -> Expr:
+        """
+        Returns the value of the given monomial after one iteration, given the values of all monomials before it
+        """
+        terms = [
+            coeff if m == 1 else coeff * values[m]
+            for m, coeff in self.recurrence_rows[monomial].items()
+        ]
+        return Add(*terms)
+
+    def step(self, values: Dict[Expr, Expr]) -> Dict[Expr, Expr]:
+        """
+        Applies all recurrences once to the given values of the monomials
+        """
+        return {m: self.evaluate_row(m, values) for m in self.monomials}
 
-        initial_values = [self.init_values_dict[v] for v in self.monomials]
+    def get_values_at(self, n: int) -> Dict[Expr, Expr]:
+        """
+        Returns the values of all monomials after n iterations without solving the recurrences.
+        For large n, the recurrence matrix (augmented by the constant inhomogeneous part) is raised to the n-th
+        power by repeated squaring over the smallest domain containing all entries (QQ without symbolic constants).
+        """
+        if n < len(self.monomials):
+            values = self.init_values_dict
+            for _ in range(n):
+                values = self.step(values)
+            return {m: v.expand() for m, v in values.items()}
 
-        # If the system is inhomogeneous (constant inhomogeneous part). Then we need to fill
-        # up those recurrence coefficients which are homogeneous with "0".
+        columns = list(self.monomials)
+        if self.is_inhomogeneous:
+            columns.append(sympify(1))
+        rows = [
+            [self.recurrence_rows[v].get(w, 0) for w in columns] for v in self.monomials
+        ]
+        initial_values = [[self.init_values_dict[m]] for m in self.monomials]
         if self.is_inhomogeneous:
-            initial_values.append(sympify(1))
-            for cs in coefficients:
-                if len(cs) == len(self.monomials):
-                    cs.append(sympify(0))
-            coefficients.append([sympify(0) for _ in self.monomials] + [sympify(1)])
+            rows.append([0] * len(self.monomials) + [1])
+            initial_values.append([1])
+        matrix = DomainMatrix.from_list_sympy(
+            len(columns), len(columns), rows, field=True
+        ).to_sparse()
+        vector = DomainMatrix.from_list_sympy(
+            len(columns), 1, initial_values, field=True
+        ).to_sparse()
+        matrix, vector = matrix.unify(vector)
+        while n > 0:
+            if n % 2 == 1:
+                vector = matrix * vector
+            n //= 2
+            if n > 0:
+                matrix = matrix * matrix
+        values = vector.to_Matrix()
+        return {m: values[i, 0] for i, m in enumerate(self.monomials)}
 
-        self.init_values_vector = Matrix(initial_values)
-        self.recurrence_matrix = Matrix(coefficients)
+    def get_fingerprint(self, monomial: Expr) -> str:
+        """
+        Returns a fingerprint of the part of the system the solution of the given monomial depends on, i.e. the
+        recurrences and initial values of all monomials it (transitively) depends on. The fingerprint doesn't
+        change if only other components of the system change.
+        """
+        reachable = set()
+        todo = [sympify(monomial)]
+        while todo:
+            m = todo.pop()
+            if m not in reachable:
+                reachable.add(m)
+                todo.extend(self.dependencies[m])
+        return "\n".join(
+            f"{m}: {self.recurrence_dict[m]}; {self.init_values_dict[m]}"
+            for m in sorted(reachable, key=str)
+        )
+
+    def get_block(self, monomials: List[Expr]) -> Matrix:
+        """
+        Returns the (dense) recurrence matrix restricted to the given monomials
+        """
+        return Matrix(
+            [[self.recurrence_rows[v].get(w, 0) for w in monomials] for v in monomials]
+        )
 
     def _init_is_acyclic(self):
         self.is_acyclic = True
@@ -103,3 +166,48 @@ class Recurrences:
             dependencies.pop(next_var)
             for _, ds in dependencies.items():
                 ds.discard(next_var)
+
+    def get_components(self) -> List[List[Expr]]:
+        """
+        Returns the strongly connected components of the dependency graph (Tarjan's algorithm) in topological
+        order. That is, every component only depends on monomials in itself and in components before it.
+        """
+        index = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+        components = []
+        for root in self.monomials:
+            if root in index:
+                continue
+            # iterative depth-first search, every frame holds a monomial and the iterator over its dependencies
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            frames = [(root, iter(self.dependencies[root]))]
+            while frames:
+                v, ds = frames[-1]
+                for w in ds:
+                    if w not in index:
+                        index[w] = lowlink[w] = len(index)
+                        stack.append(w)
+                        on_stack.add(w)
+                        frames.append((w, iter(self.dependencies[w])))
+                        break
+                    if w in on_stack:
+                        lowlink[v] = min(lowlink[v], index[w])
+                else:
+                    frames.pop()
+                    if frames:
+                        parent = frames[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[v])
+                    if lowlink[v] == index[v]:
+                        component = []
+                        while True:
+                            w = stack.pop()
+                            on_stack.remove(w)
+                            component.append(w)
+                            if w == v:
+                                break
+                        components.append(component)
+        return components
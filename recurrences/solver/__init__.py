@@ -1 +1,3 @@
 from .recurrence_solver import RecurrenceSolver
+from .direct_solver import DirectSolver
+from .numeric_solver import NumericRecurrenceSolver
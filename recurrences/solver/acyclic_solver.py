@@ -1,6 +1,7 @@
 from functools import lru_cache
+from typing import List, Optional, Tuple
 
-from sympy import sympify, symbols, summation, Piecewise
+from sympy import sympify, symbols, summation, Piecewise, Add, Mul, Expr, binomial
 
 from .solver import Solver
 from recurrences import Recurrences
@@ -12,10 +13,6 @@ class AcyclicSolver(Solver):
 
     def __init__(self, recurrences: Recurrences):
         self.recurrences = recurrences
-        self.monom_to_index = {
-            m: i
-            for m, i in zip(recurrences.monomials, range(len(recurrences.monomials)))
-        }
         self.n = symbols("n", integer=True)
 
     @property
@@ -25,10 +22,9 @@ class AcyclicSolver(Solver):
     @lru_cache(maxsize=None)
     def get(self, monomial):
         monomial = sympify(monomial)
-        monom_index = self.monom_to_index[monomial]
         solution = self._get_without_zero(monomial)
         solution = Piecewise(
-            (self.recurrences.init_values_vector[monom_index], self.n <= 0),
+            (self.recurrences.init_values_dict[monomial], self.n <= 0),
             (solution, True),
         )
         return solution
@@ -36,33 +32,42 @@ class AcyclicSolver(Solver):
     @lru_cache(maxsize=None)
     def _get_without_zero(self, monomial):
         monomial = sympify(monomial)
-        monom_index = self.monom_to_index[monomial]
         rec_coeff = sympify(0)
         inhom_part = sympify(0)
-        for i in range(len(self.recurrences.monomials)):
-            coeff = self.recurrences.recurrence_matrix[monom_index, i]
-            if coeff == 0:
-                continue
-            if i == monom_index:
+        for m, coeff in self.recurrences.recurrence_rows[monomial].items():
+            if m == monomial:
                 rec_coeff = coeff
-                continue
-            sol = self._get_without_zero(self.recurrences.monomials[i])
-            inhom_part += coeff * sol
-        if self.recurrences.is_inhomogeneous:
-            inhom_part += self.recurrences.recurrence_matrix[monom_index, -1]
+            elif m == 1:
+                inhom_part += coeff
+            else:
+                inhom_part += coeff * self._get_without_zero(m)
 
         inhom_part = inhom_part.expand()
         if rec_coeff == 0:
             return inhom_part.xreplace({self.n: self.n - 1}).simplify()
 
-        first_value = (
-            self.recurrences.recurrence_matrix * self.recurrences.init_values_vector
-        )[monom_index]
+        first_value = self.recurrences.evaluate_row(
+            monomial, self.recurrences.init_values_dict
+        )
         return self._solve_rec_by_summing(rec_coeff, first_value, inhom_part)
 
     @lru_cache(maxsize=None)
     def _solve_rec_by_summing(self, rec_coeff, first_value, inhom_part):
         hom_solution = (rec_coeff ** (self.n - 1)) * first_value
+        terms = self._get_exponential_terms(inhom_part)
+        # for symbolic or irrational ratios, sympy finds simpler closed forms
+        if terms is not None and all((b / rec_coeff).is_Rational for _, _, b in terms):
+            # sum_{k=1}^{n-1} a^(n-k-1) * c * k^d * r^k = c * a^(n-1) * sum_{k=1}^{n-1} k^d * (r/a)^k
+            particular_solution = Add(
+                *[
+                    coeff
+                    * rec_coeff ** (self.n - 1)
+                    * sum_poly_exp(degree, base / rec_coeff, self.n)
+                    for coeff, degree, base in terms
+                ]
+            )
+            return (hom_solution + particular_solution).expand()
+
         k = symbols("_k", integer=True)
         summand = (
             (rec_coeff ** (self.n - k - 1)) * inhom_part.xreplace({self.n: k})
@@ -70,3 +75,59 @@ class AcyclicSolver(Solver):
         particular_solution = summation(summand, (k, 1, self.n - 1))
         particular_solution = without_piecewise(particular_solution)
         return (hom_solution + particular_solution).simplify()
+
+    def _get_exponential_terms(
+        self, expression: Expr
+    ) -> Optional[List[Tuple[Expr, int, Expr]]]:
+        """
+        Decomposes an expanded expression into terms c * n^d * r^n with c and r not depending on n.
+        Returns the triples (c, d, r) or None if the expression is not of this form.
+        """
+        terms = []
+        for term in Add.make_args(expression):
+            coeff, degree, base = sympify(1), 0, sympify(1)
+            for factor in Mul.make_args(term):
+                if not factor.has(self.n):
+                    coeff *= factor
+                    continue
+                b, e = factor.as_base_exp()
+                if b == self.n and e.is_Integer and e > 0:
+                    degree += int(e)
+                    continue
+                if b.has(self.n):
+                    return None
+                # the exponent has to be linear in n, b^(s*n + t) = b^t * (b^s)^n
+                constant, linear = e.as_independent(self.n, as_Add=True)
+                slope, rest = linear.as_independent(self.n, as_Add=False)
+                if rest != self.n:
+                    return None
+                coeff *= b**constant
+                base *= b**slope
+            terms.append((coeff, degree, base))
+        return terms
+
+
+def sum_poly_exp(degree: int, ratio: Expr, n: Expr) -> Expr:
+    """
+    Returns a closed form of sum_{k=1}^{n-1} k^degree * ratio^k.
+    There is a polynomial P with ratio * P(k+1) - P(k) = k^degree. Then F(k) = ratio^k * P(k) satisfies
+    F(k+1) - F(k) = k^degree * ratio^k and the sum telescopes to F(n) - F(1). For ratio = 1, P has degree
+    degree + 1 (Faulhaber's formula), otherwise degree. In both cases its coefficients follow from comparing the
+    coefficients of k^m from the highest power down. A symbolic ratio is assumed to be different from 1.
+    """
+    if ratio == 1:
+        # P(k+1) - P(k) = k^degree, the coefficient of k^m on the left is sum_{i>m} p_i * binomial(i, m)
+        p = [sympify(0)] * (degree + 2)
+        for m in reversed(range(degree + 1)):
+            rest = Add(*[p[i] * binomial(i, m) for i in range(m + 2, degree + 2)])
+            p[m + 1] = ((1 if m == degree else 0) - rest) / (m + 1)
+        poly = Add(*[c * n**i for i, c in enumerate(p)])
+        return (poly - poly.xreplace({n: 1})).expand()
+
+    # the coefficient of k^m in ratio * P(k+1) - P(k) is (ratio - 1) * p_m + ratio * sum_{i>m} p_i * binomial(i, m)
+    p = [sympify(0)] * (degree + 1)
+    for m in reversed(range(degree + 1)):
+        rest = Add(*[p[i] * binomial(i, m) for i in range(m + 1, degree + 1)])
+        p[m] = ((1 if m == degree else 0) - ratio * rest) / (ratio - 1)
+    poly = Add(*[c * n**i for i, c in enumerate(p)])
+    return ratio**n * poly - ratio * poly.xreplace({n: 1})
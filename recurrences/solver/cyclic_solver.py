@@ -1,24 +1,31 @@
-from functools import lru_cache
-from typing import List, Set
+from functools import lru_cache, reduce
+from operator import mul
+from typing import Dict, FrozenSet, List, Set, Tuple
 
-from sympy import symbols, Symbol, Expr, Poly, sympify, Piecewise
+from sympy import symbols, Symbol, Expr, PurePoly, sympify, Piecewise, Add
 
 from .solver import Solver
-from utils import get_all_roots, solve_linear
+from utils import get_all_roots, get_charpoly, solve_linear_multiple
 from recurrences.exceptions import SolverException
 from recurrences import Recurrences
 import settings
 
 
 class CyclicSolver(Solver):
+    """
+    Solves recurrences with cycles via the roots of the characteristic polynomial.
+    The system is decomposed into the strongly connected components of its dependency graph. The recurrence matrix
+    restricted to the components a monomial (transitively) depends on is block-triangular. Hence, its characteristic
+    polynomial is the product of the characteristic polynomials of the components and only these small blocks are
+    ever handed to charpoly().
+    """
+
     n: Symbol
-    t: Symbol
     monomials: Set[Expr]
     recurrences: Recurrences
-    characteristic_poly: Poly
-    general_solution: Expr
-    gen_sol_unknowns: List[Symbol]
-    gen_sol_unknowns_set: Set[Symbol]
+    values: List[Dict[Expr, Expr]]
+    components: List[List[Expr]]
+    component_index: Dict[Expr, int]
     numeric_roots: bool
     numeric_croots: bool
     numeric_eps: float
@@ -41,41 +48,107 @@ class CyclicSolver(Solver):
         )
         self.numeric_eps = settings.numeric_eps if numeric_eps is None else numeric_eps
         self.monomials = set(recurrences.monomials)
-        self.monom_to_index = {
-            m: i
-            for m, i in zip(recurrences.monomials, range(len(recurrences.monomials)))
+        self.values = [recurrences.init_values_dict]
+        self.components = recurrences.get_components()
+        self.component_index = {
+            m: i for i, component in enumerate(self.components) for m in component
         }
-        self.characteristic_poly = self.recurrences.recurrence_matrix.charpoly()
-        self._compute_general_solution()
+        self._is_exact = True
+
+    @lru_cache(maxsize=None)
+    def _get_reachable_components(self, monomial: Expr) -> FrozenSet[int]:
+        reachable = set()
+        todo = [self.component_index[monomial]]
+        while todo:
+            component = todo.pop()
+            if component in reachable:
+                continue
+            reachable.add(component)
+            for m in self.components[component]:
+                todo.extend(
+                    self.component_index[d] for d in self.recurrences.dependencies[m]
+                )
+        return frozenset(reachable)
+
+    def _get_values(self, n: int) -> Dict[Expr, Expr]:
+        """
+        Returns the values of all monomials after n iterations. The values are shared by all monomials.
+        """
+        while len(self.values) <= n:
+            self.values.append(self.recurrences.step(self.values[-1]))
+        return self.values[n]
+
+    @lru_cache(maxsize=None)
+    def _get_component_poly(self, component: int) -> PurePoly:
+        return get_charpoly(self.recurrences.get_block(self.components[component]))
 
-    def _compute_general_solution(self):
-        unknowns = []
-        roots, self._is_exact = get_all_roots(
-            self.characteristic_poly,
+    @lru_cache(maxsize=None)
+    def _get_characteristic_poly(self, components: FrozenSet[int]) -> PurePoly:
+        polys = [self._get_component_poly(c) for c in sorted(components)]
+        characteristic_poly = reduce(mul, polys)
+        if self.recurrences.is_inhomogeneous:
+            # the constant inhomogeneous part contributes the root 1
+            if any(
+                1 in self.recurrences.recurrence_rows[m]
+                for c in components
+                for m in self.components[c]
+            ):
+                lamb = characteristic_poly.gen
+                characteristic_poly *= PurePoly(lamb - 1, lamb)
+        return characteristic_poly
+
+    @lru_cache(maxsize=None)
+    def _get_roots(
+        self, components: FrozenSet[int]
+    ) -> Tuple[List[Tuple[Expr, int]], bool]:
+        """
+        Returns the roots of the characteristic polynomial of the given components together with their
+        multiplicities and whether the roots are exact.
+        """
+        return get_all_roots(
+            self._get_characteristic_poly(components),
             self.numeric_roots,
             self.numeric_croots,
             self.numeric_eps,
         )
-        solution = sympify(0)
-        count = 0
+
+    @lru_cache(maxsize=None)
+    def _get_general_solution(
+        self, components: FrozenSet[int]
+    ) -> Tuple[List[Expr], int, bool]:
+        """
+        Returns the terms n^i * r^n of the general solution of all monomials depending on exactly the given
+        components, together with the degree of the characteristic polynomial and whether the roots are exact.
+        """
+        characteristic_poly = self._get_characteristic_poly(components)
+        roots, is_exact = self._get_roots(components)
+        terms = []
         for root, multiplicity in roots:
+            if root == 0:
+                continue
             for i in range(multiplicity):
-                if root != 0:
-                    new_unknown = symbols(f"C{count}")
-                    unknowns.append(new_unknown)
-                    term = new_unknown * (self.n**i)
-                    if root != 1:
-                        term = term * (root**self.n)
-                    solution += term
-                    count += 1
-        self.gen_sol_unknowns = unknowns
-        self.gen_sol_unknowns_set = set(unknowns)
-        self.general_solution = solution
+                term = self.n**i
+                if root != 1:
+                    term = term * (root**self.n)
+                terms.append(term)
+        return terms, characteristic_poly.degree(), is_exact
 
     @property
     def is_exact(self) -> bool:
         return self._is_exact
 
+    def is_exact_for(self, monomial) -> bool:
+        components = self._get_reachable_components(sympify(monomial))
+        _, _, is_exact = self._get_general_solution(components)
+        return is_exact
+
+    def is_acyclic_for(self, monomial) -> bool:
+        """
+        Returns whether the monomial only (transitively) depends on monomials not contained in any cycle.
+        """
+        components = self._get_reachable_components(sympify(monomial))
+        return all(len(self.components[c]) == 1 for c in components)
+
     @lru_cache(maxsize=None)
     def get(self, monomial):
         monomial = sympify(monomial)
@@ -84,66 +157,58 @@ class CyclicSolver(Solver):
                 f"Monomial {monomial} not in current system of recurrences"
             )
 
-        solution = self.general_solution
-        if self.gen_sol_unknowns:
-            concrete_unknowns = self._solve_for_unknowns(monomial)
-            unknown_subs = {
-                u: s for u, s in zip(self.gen_sol_unknowns, concrete_unknowns)
-            }
-            solution = self.general_solution.xreplace(unknown_subs)
+        components = self._get_reachable_components(monomial)
+        terms, degree, is_exact = self._get_general_solution(components)
+        self._is_exact = self._is_exact and is_exact
+        solution = sympify(0)
+        if terms:
+            coefficients = self._solve_for_coefficients(components)[monomial]
+            solution = Add(*[c * t for c, t in zip(coefficients, terms)])
 
-        solution = self._add_beginning_values(solution, self.monom_to_index[monomial])
+        solution = self._add_beginning_values(solution, monomial, degree)
 
         return solution.expand()
 
-    def _solve_for_unknowns(self, monomial: Expr):
-        number_equations = len(self.gen_sol_unknowns)
-        monom_index = self.monom_to_index[monomial]
-        concrete_values = [self.recurrences.init_values_vector]
-        equations = []
-        for n in range(1, number_equations + 1):
-            concrete_values.append(
-                self.recurrences.recurrence_matrix * concrete_values[-1]
-            )
-            eq = (
-                self.general_solution.xreplace({self.n: n})
-                - concrete_values[n][monom_index]
-            ).expand()
-            equations.append(eq)
-        concrete_unknowns = solve_linear(equations, self.gen_sol_unknowns)
-
-        not_solved = self._any_is_still_unknown(concrete_unknowns)
-        next_n = number_equations + 1
-        while not_solved:
-            concrete_values.append(
-                self.recurrences.recurrence_matrix * concrete_values[-1]
-            )
-            eq = (
-                self.general_solution.xreplace({self.n: next_n})
-                - concrete_values[-1][monom_index]
-            ).expand()
-            equations.append(eq)
-            next_n += 1
-            concrete_unknowns = solve_linear(equations, self.gen_sol_unknowns)
-            not_solved = self._any_is_still_unknown(concrete_unknowns)
-
-        return concrete_unknowns
-
-    def _add_beginning_values(self, solution, monom_index):
-        beginning_values = [self.recurrences.init_values_vector]
-        for _ in range(self.characteristic_poly.degree() - 1):
-            beginning_values.append(
-                self.recurrences.recurrence_matrix * beginning_values[-1]
-            )
+    @lru_cache(maxsize=None)
+    def _solve_for_coefficients(
+        self, components: FrozenSet[int]
+    ) -> Dict[Expr, List[Expr]]:
+        """
+        Determines the coefficients of the terms of the general solution of the given components. The general
+        solution is shared by all monomials of the topmost component (the only monomials reaching exactly these
+        components). Their equations have the same coefficient matrix (the terms evaluated at n = 1, 2, ..., a
+        generalized Vandermonde matrix) and only differ in the concrete values. Hence, the coefficients of all these
+        monomials are determined by a single elimination with one right-hand side per monomial.
+        """
+        terms, _, _ = self._get_general_solution(components)
+        monomials = self.components[max(components)]
+        matrix, right_hand_sides = [], []
+
+        def add_equations(number: int):
+            while len(matrix) < number:
+                n = len(matrix) + 1
+                matrix.append(
+                    [t.xreplace({self.n: sympify(n)}).expand() for t in terms]
+                )
+                values = self._get_values(n)
+                right_hand_sides.append([values[m].expand() for m in monomials])
+
+        number_equations = len(terms)
+        add_equations(number_equations)
+        solutions = solve_linear_multiple(matrix, right_hand_sides)
+        while solutions is None:
+            number_equations += 1
+            add_equations(number_equations)
+            solutions = solve_linear_multiple(matrix, right_hand_sides)
+
+        return {
+            m: [solutions[j][i] for j in range(len(terms))]
+            for i, m in enumerate(monomials)
+        }
 
+    def _add_beginning_values(self, solution, monomial, degree):
         pieces = []
-        for i, v in enumerate(beginning_values):
-            pieces.append((v[monom_index], self.n <= i))
+        for i in range(max(degree, 1)):
+            pieces.append((self._get_values(i)[monomial], self.n <= i))
         pieces.append((solution, True))
         return Piecewise(*pieces)
-
-    def _any_is_still_unknown(self, solutions):
-        for s in solutions:
-            if s.free_symbols & set(self.gen_sol_unknowns_set):
-                return True
-        return False
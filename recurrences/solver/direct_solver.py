@@ -0,0 +1,40 @@
+from functools import lru_cache
+from typing import Dict
+
+from sympy import sympify, Expr
+
+from .solver import Solver
+from recurrences import Recurrences
+from recurrences.exceptions import SolverException
+
+
+class DirectSolver(Solver):
+    """
+    Evaluates recurrences at a fixed iteration n without computing closed forms.
+    The values of all monomials are computed at once by powering the recurrence matrix. Hence, no roots are needed
+    and the result is always exact.
+    """
+
+    recurrences: Recurrences
+    n: int
+
+    def __init__(self, recurrences: Recurrences, n: int):
+        self.recurrences = recurrences
+        self.n = n
+
+    @property
+    def is_exact(self) -> bool:
+        return True
+
+    @lru_cache(maxsize=None)
+    def _get_values(self) -> Dict[Expr, Expr]:
+        return self.recurrences.get_values_at(self.n)
+
+    def get(self, monomial):
+        monomial = sympify(monomial)
+        values = self._get_values()
+        if monomial not in values:
+            raise SolverException(
+                f"Monomial {monomial} not in current system of recurrences"
+            )
+        return values[monomial]
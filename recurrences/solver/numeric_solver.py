@@ -0,0 +1,236 @@
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+import numpy as np
+from sympy import symbols, sympify, Expr, Symbol, Float, Piecewise, Add, cos, sin
+
+from .solver import Solver
+from recurrences import Recurrences
+from recurrences.exceptions import SolverException
+
+
+class NumericRecurrenceSolver(Solver):
+    """
+    Solves a system of recurrences without symbolic constants in floating-point arithmetic. The recurrence matrix
+    (augmented by the constant inhomogeneous part) is converted to a NumPy array and the closed forms of all
+    monomials are determined at once.
+    If the matrix is diagonalizable (with a well-conditioned eigenvector matrix), the closed forms are read off its
+    eigendecomposition. Otherwise, e.g. for polynomial growth, the eigenvalues are taken from the diagonal blocks of
+    the strongly connected components and the coefficients of the terms n^i * r^n are fitted to the iterates.
+    The deviation of the closed forms from the iterates at the first iterations serves as an error estimate.
+    """
+
+    n: Symbol
+    recurrences: Recurrences
+    monomials: List[Expr]
+    index: Dict[Expr, int]
+    matrix: np.ndarray
+    initial_values: np.ndarray
+    terms: List[Tuple[complex, int]]
+    coefficients: np.ndarray
+    start: int
+    max_condition: float
+    eps: float
+    errors: np.ndarray
+
+    def __init__(
+        self, recurrences: Recurrences, max_condition: float = 1e8, eps: float = 1e-9
+    ):
+        if not self.is_applicable(recurrences):
+            raise SolverException(
+                "Recurrences with symbolic constants can't be solved numerically"
+            )
+        self.n = symbols("n", integer=True)
+        self.recurrences = recurrences
+        self.monomials = list(recurrences.monomials)
+        self.index = {m: i for i, m in enumerate(self.monomials)}
+        self.max_condition = max_condition
+        self.eps = eps
+        self.values = [recurrences.init_values_dict]
+        self._init_matrix()
+        if not self._init_from_eigendecomposition():
+            self._init_from_iterates()
+        self._init_errors()
+
+    @staticmethod
+    def is_applicable(recurrences: Recurrences) -> bool:
+        """
+        Returns whether all coefficients and initial values of the recurrences are numbers
+        """
+        coefficients = [
+            c for row in recurrences.recurrence_rows.values() for c in row.values()
+        ]
+        values = list(recurrences.init_values_dict.values())
+        return all(sympify(v).is_number for v in coefficients + values)
+
+    def _init_matrix(self):
+        dimension = len(self.monomials) + int(self.recurrences.is_inhomogeneous)
+        self.matrix = np.zeros((dimension, dimension))
+        self.initial_values = np.ones(dimension)
+        for v, row in self.recurrences.recurrence_rows.items():
+            for w, coeff in row.items():
+                column = dimension - 1 if w == 1 else self.index[w]
+                self.matrix[self.index[v], column] = float(coeff)
+        if self.recurrences.is_inhomogeneous:
+            self.matrix[-1, -1] = 1
+        for m, value in self.recurrences.init_values_dict.items():
+            if m in self.index:
+                self.initial_values[self.index[m]] = float(value)
+
+    def _is_zero(self, root: complex) -> bool:
+        return abs(root) <= self.eps
+
+    def _init_from_eigendecomposition(self) -> bool:
+        """
+        Determines the closed forms from the eigendecomposition of the matrix. Returns False if the matrix is
+        (numerically) not diagonalizable.
+        """
+        roots, vectors = np.linalg.eig(self.matrix)
+        if np.linalg.cond(vectors) > self.max_condition:
+            return False
+        weights = np.linalg.solve(vectors, self.initial_values.astype(complex))
+        # zero roots only contribute to the initial values
+        nonzero = [j for j, r in enumerate(roots) if not self._is_zero(r)]
+        self.terms = [(complex(roots[j]), 0) for j in nonzero]
+        self.coefficients = vectors[:, nonzero] * weights[nonzero]
+        self.start = 1
+        return True
+
+    def _get_roots(self) -> List[Tuple[complex, int]]:
+        """
+        Returns the distinct eigenvalues of the matrix together with their multiplicities. The matrix is
+        block-triangular with respect to the strongly connected components, hence the eigenvalues are the
+        eigenvalues of the small diagonal blocks. Equal eigenvalues of different blocks are identified.
+        """
+        eigenvalues = [1.0] if self.recurrences.is_inhomogeneous else []
+        for component in self.recurrences.get_components():
+            indices = [self.index[m] for m in component]
+            block = self.matrix[np.ix_(indices, indices)]
+            eigenvalues.extend(complex(r) for r in np.linalg.eigvals(block))
+
+        roots = []
+        for eigenvalue in sorted(eigenvalues, key=lambda r: (r.real, r.imag)):
+            for i, (root, multiplicity) in enumerate(roots):
+                if abs(eigenvalue - root) <= self.eps * max(1, abs(root)):
+                    roots[i] = (root, multiplicity + 1)
+                    break
+            else:
+                roots.append((complex(eigenvalue), 1))
+        return roots
+
+    def _init_from_iterates(self):
+        """
+        Fits the coefficients of the terms n^i * r^n of all monomials to the iterates by a single least squares
+        solve with one right-hand side per monomial.
+        """
+        roots = self._get_roots()
+        zero_multiplicity = sum(m for r, m in roots if self._is_zero(r))
+        self.terms = [
+            (root, i)
+            for root, multiplicity in roots
+            if not self._is_zero(root)
+            for i in range(multiplicity)
+        ]
+        # the contribution of the zero roots vanishes after as many iterations as their multiplicity
+        self.start = max(1, zero_multiplicity)
+        ns = np.arange(self.start, self.start + 2 * len(self.terms))
+        system = self._get_term_values(ns)
+        # scaling the columns improves the condition of the (generalized Vandermonde) system
+        scale = np.abs(system).max(axis=0)
+        scale[scale == 0] = 1
+        right_hand_sides = self._get_iterates(ns[-1] + 1)[ns]
+        solution, _, _, _ = np.linalg.lstsq(
+            system / scale, right_hand_sides.astype(complex), rcond=None
+        )
+        self.coefficients = (solution / scale[:, None]).T
+
+    def _get_iterates(self, number: int) -> np.ndarray:
+        """
+        Returns the values of all monomials (and the constant 1) for the first number iterations
+        """
+        iterates = np.empty((number, len(self.initial_values)))
+        iterates[0] = self.initial_values
+        for i in range(1, number):
+            iterates[i] = self.matrix @ iterates[i - 1]
+        return iterates
+
+    def _get_term_values(self, ns: np.ndarray) -> np.ndarray:
+        ns = np.asarray(ns, dtype=float)
+        roots = np.array([r for r, _ in self.terms], dtype=complex)
+        powers = np.array([i for _, i in self.terms], dtype=float)
+        return ns[:, None] ** powers * roots ** ns[:, None]
+
+    def _init_errors(self):
+        number = self.start + 3 * max(len(self.terms), 1)
+        iterates = self._get_iterates(number)
+        approximations = self.evaluate(np.arange(number))
+        deviations = np.abs(approximations - iterates[:, : len(self.monomials)])
+        self.errors = (
+            deviations / np.maximum(1, np.abs(iterates[:, : len(self.monomials)]))
+        ).max(axis=0)
+
+    def evaluate(self, ns) -> np.ndarray:
+        """
+        Evaluates the closed forms of all monomials at the given iterations at once. Returns an array with one row
+        per iteration and one column per monomial (in the order of self.monomials).
+        """
+        ns = np.asarray(ns, dtype=int)
+        result = np.real(self._get_term_values(ns) @ self.coefficients.T)
+        result = result[:, : len(self.monomials)]
+        early = ns < self.start
+        if early.any():
+            beginning = self._get_iterates(self.start)
+            result[early] = beginning[ns[early], : len(self.monomials)]
+        return result
+
+    def get_error(self, monomial) -> float:
+        """
+        Returns the estimated relative error of the closed form of the given monomial
+        """
+        return float(self.errors[self.index[sympify(monomial)]])
+
+    @property
+    def is_exact(self) -> bool:
+        return False
+
+    def _get_values(self, n: int) -> Dict[Expr, Expr]:
+        while len(self.values) <= n:
+            self.values.append(self.recurrences.step(self.values[-1]))
+        return self.values[n]
+
+    @lru_cache(maxsize=None)
+    def get(self, monomial):
+        monomial = sympify(monomial)
+        if monomial not in self.index:
+            raise SolverException(
+                f"Monomial {monomial} not in current system of recurrences"
+            )
+
+        coefficients = self.coefficients[self.index[monomial]]
+        summands = []
+        for (root, power), coeff in zip(self.terms, coefficients):
+            if root == 1:
+                summand = Float(float(coeff.real))
+            elif abs(root.imag) <= self.eps:
+                summand = Float(float(coeff.real)) * Float(root.real) ** self.n
+            elif root.imag > 0:
+                # together with the term of the conjugate root
+                angle = np.angle(root)
+                summand = (
+                    2
+                    * Float(abs(root)) ** self.n
+                    * (
+                        Float(float(coeff.real)) * cos(Float(float(angle)) * self.n)
+                        - Float(float(coeff.imag)) * sin(Float(float(angle)) * self.n)
+                    )
+                )
+            else:
+                continue
+            summands.append(self.n**power * summand)
+        solution = Add(*summands)
+
+        pieces = [
+            (self._get_values(i)[monomial], self.n <= i) for i in range(self.start)
+        ]
+        pieces.append((solution, True))
+        return Piecewise(*pieces)
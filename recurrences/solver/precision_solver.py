@@ -0,0 +1,311 @@
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Tuple
+
+from mpmath import mp, iv
+from mpmath.libmp import NoConvergence
+from sympy import Expr, Float, I, PurePoly, Rational, sympify
+
+from .cyclic_solver import CyclicSolver
+from recurrences import Recurrences
+from recurrences.exceptions import SolverException
+
+# Additional digits used internally, such that the results are accurate to the requested precision
+GUARD_DIGITS = 10
+
+
+class PrecisionSolver(CyclicSolver):
+    """
+    Solves recurrences with cycles and rational coefficients with a given number of significant digits.
+    Rational roots of the characteristic polynomial are exact. The roots of the remaining irreducible factors are
+    computed with mpmath.polyroots at the given precision instead of being isolated symbolically. The coefficients of
+    the general solution are determined by a single numeric linear solve per system.
+    Every root comes with a radius of a disk certainly containing the exact root. Together with a bound on the error
+    of the linear solve, this yields certified interval bounds for the values of the monomials (see get_bounds).
+    """
+
+    precision: int
+    root_enclosures: Dict[Expr, Tuple[mp.mpc, mp.mpf]]
+
+    def __init__(self, recurrences: Recurrences, precision: int):
+        if not self.is_applicable(recurrences):
+            raise SolverException(
+                "Only recurrences with rational coefficients can be solved with a given precision"
+            )
+        super().__init__(recurrences)
+        self.precision = precision
+        self.root_enclosures = {}
+
+    @staticmethod
+    def is_applicable(recurrences: Recurrences) -> bool:
+        """
+        Returns whether all coefficients and initial values of the recurrences are rational numbers
+        """
+        coefficients = [
+            c for row in recurrences.recurrence_rows.values() for c in row.values()
+        ]
+        values = list(recurrences.init_values_dict.values())
+        return all(sympify(v).is_Rational for v in coefficients + values)
+
+    @lru_cache(maxsize=None)
+    def _get_roots(
+        self, components: FrozenSet[int]
+    ) -> Tuple[List[Tuple[Expr, int]], bool]:
+        characteristic_poly = self._get_characteristic_poly(components)
+        roots = []
+        is_exact = True
+        for square_free, multiplicity in characteristic_poly.sqf_list()[1]:
+            for factor, _ in square_free.factor_list()[1]:
+                if factor.degree() == 1:
+                    roots.append((-factor.nth(0) / factor.nth(1), multiplicity))
+                    continue
+                is_exact = False
+                for center, radius in self._isolate_roots(factor):
+                    if center.imag == 0:
+                        root = Float(center.real, self.precision)
+                    else:
+                        root = Float(center.real, self.precision) + I * Float(
+                            center.imag, self.precision
+                        )
+                    self.root_enclosures[root] = (center, radius)
+                    roots.append((root, multiplicity))
+        return roots, is_exact
+
+    def _isolate_roots(self, poly: PurePoly) -> List[Tuple[mp.mpc, mp.mpf]]:
+        """
+        Approximates the roots of an irreducible polynomial with rational coefficients. Every root is returned
+        together with a radius r, such that the disk of radius r around it contains a root. The radius is the
+        classical bound degree * |p(z)| / |p'(z)|, evaluated in interval arithmetic. If the disks are not disjoint,
+        the roots are not separated at the given precision.
+        """
+        coefficients = [Rational(c) for c in poly.all_coeffs()]
+        degree = poly.degree()
+        with mp.workdps(self.precision + GUARD_DIGITS):
+            try:
+                centers = mp.polyroots(
+                    [mp.mpf(c.p) / c.q for c in coefficients],
+                    maxsteps=max(50, 10 * degree),
+                    extraprec=4 * (self.precision + GUARD_DIGITS),
+                )
+            except NoConvergence:
+                raise SolverException(
+                    f"Roots of {poly.as_expr()} did not converge with precision {self.precision}"
+                )
+            centers = [mp.mpc(c) for c in centers]
+
+        enclosures = []
+        with interval_dps(self.precision + GUARD_DIGITS):
+            interval_coefficients = [iv.mpf(c.p) / c.q for c in coefficients]
+            derivative = [
+                c * (degree - i) for i, c in enumerate(interval_coefficients[:-1])
+            ]
+            for center in centers:
+                z = iv.mpc(center.real, center.imag)
+                value = abs(_horner(interval_coefficients, z))
+                slope = abs(_horner(derivative, z))
+                if slope.a <= 0:
+                    raise SolverException(
+                        f"Roots of {poly.as_expr()} could not be certified with precision {self.precision}"
+                    )
+                enclosures.append((center, mp.mpf((degree * value / slope).b)))
+
+        with interval_dps(self.precision + GUARD_DIGITS):
+            disks = [(iv.mpc(c.real, c.imag), r) for c, r in enclosures]
+        for i, (c1, r1) in enumerate(disks):
+            for c2, r2 in disks[i + 1 :]:
+                if abs(c1 - c2).a <= r1 + r2:
+                    raise SolverException(
+                        f"Roots of {poly.as_expr()} could not be separated with precision {self.precision}"
+                    )
+        return enclosures
+
+    def _get_term_structure(self, components: FrozenSet[int]) -> List[Tuple[Expr, int]]:
+        """
+        Returns the roots and powers of n of the terms n^i * r^n of the general solution, in the same order as the
+        terms returned by _get_general_solution.
+        """
+        roots, _ = self._get_roots(components)
+        return [(r, i) for r, m in roots if r != 0 for i in range(m)]
+
+    def _get_first_equation(self, components: FrozenSet[int]) -> int:
+        # the contribution of the root 0 vanishes after as many iterations as its multiplicity
+        roots, _ = self._get_roots(components)
+        return max([1] + [m for r, m in roots if r == 0])
+
+    def _to_mp(self, root: Expr) -> mp.mpc:
+        if root in self.root_enclosures:
+            return self.root_enclosures[root][0]
+        return mp.mpf(root.p) / root.q
+
+    def _to_iv(self, root: Expr) -> iv.mpc:
+        if root in self.root_enclosures:
+            center, radius = self.root_enclosures[root]
+            return _widen(iv.mpc(center.real, center.imag), radius)
+        return iv.mpf(root.p) / root.q
+
+    @lru_cache(maxsize=None)
+    def _solve_for_coefficients(
+        self, components: FrozenSet[int]
+    ) -> Dict[Expr, List[Expr]]:
+        """
+        Determines the coefficients of the terms of the general solution for all monomials of the topmost component
+        by multiplying the values at the first iterations with the numeric inverse of the generalized Vandermonde
+        matrix.
+        """
+        coefficients = self._solve_numerically(components)[1]
+        result = {}
+        for m, cs in coefficients.items():
+            result[m] = [
+                Float(c.real, self.precision) + I * Float(c.imag, self.precision)
+                for c in cs
+            ]
+        return result
+
+    @lru_cache(maxsize=None)
+    def _solve_numerically(
+        self, components: FrozenSet[int]
+    ) -> Tuple[mp.matrix, Dict[Expr, List[mp.mpc]]]:
+        """
+        Returns the approximate inverse of the generalized Vandermonde matrix and the coefficients of all monomials
+        of the topmost component.
+        """
+        structure = self._get_term_structure(components)
+        first = self._get_first_equation(components)
+        monomials = self.components[max(components)]
+        with mp.workdps(self.precision + GUARD_DIGITS):
+            roots = [self._to_mp(r) for r, _ in structure]
+            matrix = mp.matrix(
+                [
+                    [
+                        mp.mpf(n) ** i * roots[j] ** n
+                        for j, (_, i) in enumerate(structure)
+                    ]
+                    for n in range(first, first + len(structure))
+                ]
+            )
+            try:
+                inverse = mp.inverse(matrix)
+            except ZeroDivisionError:
+                raise SolverException(
+                    f"The general solution could not be determined with precision {self.precision}"
+                )
+            coefficients = {}
+            for m in monomials:
+                values = [
+                    mp.mpf(v.p) / v.q
+                    for v in self._get_right_hand_side(m, first, len(structure))
+                ]
+                solution = inverse * mp.matrix(values)
+                coefficients[m] = [mp.mpc(solution[j]) for j in range(len(structure))]
+        return inverse, coefficients
+
+    def _get_right_hand_side(self, monomial: Expr, first: int, number: int):
+        return [
+            Rational(self._get_values(n)[monomial].expand())
+            for n in range(first, first + number)
+        ]
+
+    @lru_cache(maxsize=None)
+    def _get_coefficient_errors(self, components: FrozenSet[int]) -> Dict[Expr, mp.mpf]:
+        """
+        Bounds the errors of the coefficients of all monomials of the topmost component. With R the approximate
+        inverse and M the generalized Vandermonde matrix (in interval arithmetic, containing the exact roots),
+        the error of an approximate solution c of Mx = b is at most |R(b - Mc)| / (1 - |I - RM|) if |I - RM| < 1.
+        """
+        structure = self._get_term_structure(components)
+        first = self._get_first_equation(components)
+        inverse, coefficients = self._solve_numerically(components)
+        size = len(structure)
+        with interval_dps(self.precision + GUARD_DIGITS):
+            roots = [self._to_iv(r) for r, _ in structure]
+            matrix = [
+                [iv.mpf(n) ** i * roots[j] ** n for j, (_, i) in enumerate(structure)]
+                for n in range(first, first + size)
+            ]
+            inverse = [
+                [iv.mpc(inverse[i, j].real, inverse[i, j].imag) for j in range(size)]
+                for i in range(size)
+            ]
+            product = _multiply(inverse, matrix)
+            contraction = max(
+                sum(
+                    (abs(product[i][j] - (1 if i == j else 0)) for j in range(size)),
+                    iv.mpf(0),
+                ).b
+                for i in range(size)
+            )
+            if contraction >= 1:
+                raise SolverException(
+                    f"The general solution could not be certified with precision {self.precision}"
+                )
+            errors = {}
+            for m, cs in coefficients.items():
+                values = [
+                    iv.mpf(v.p) / v.q for v in self._get_right_hand_side(m, first, size)
+                ]
+                cs = [iv.mpc(c.real, c.imag) for c in cs]
+                residual = [
+                    [values[i] - sum((matrix[i][j] * cs[j] for j in range(size)), 0)]
+                    for i in range(size)
+                ]
+                correction = _multiply(inverse, residual)
+                norm = max(abs(row[0]).b for row in correction)
+                errors[m] = mp.mpf((norm / (1 - iv.mpf(contraction))).b)
+        return errors
+
+    def get_bounds(self, monomial, n: int):
+        """
+        Returns an interval certainly containing the value of the monomial after n iterations
+        """
+        monomial = sympify(monomial)
+        components = self._get_reachable_components(monomial)
+        _, degree, _ = self._get_general_solution(components)
+        if n < max(degree, 1):
+            value = Rational(self._get_values(n)[monomial].expand())
+            with interval_dps(self.precision + GUARD_DIGITS):
+                return iv.mpf(value.p) / value.q
+        structure = self._get_term_structure(components)
+        if not structure:
+            return iv.mpf(0)
+
+        coefficients = self._solve_numerically(components)[1][monomial]
+        error = self._get_coefficient_errors(components)[monomial]
+        with interval_dps(self.precision + GUARD_DIGITS):
+            value = iv.mpf(0)
+            for (root, i), c in zip(structure, coefficients):
+                coefficient = _widen(iv.mpc(c.real, c.imag), error)
+                value += coefficient * iv.mpf(n) ** i * self._to_iv(root) ** n
+            return value.real
+
+
+@contextmanager
+def interval_dps(dps: int):
+    # unlike mp, the interval context has no workdps
+    previous = iv.dps
+    iv.dps = dps
+    try:
+        yield
+    finally:
+        iv.dps = previous
+
+
+def _widen(z: iv.mpc, radius: mp.mpf) -> iv.mpc:
+    """
+    Returns a complex interval containing the disk with the given radius around z
+    """
+    deviation = iv.mpf([-radius, radius])
+    return z + iv.mpc(deviation, deviation)
+
+
+def _horner(coefficients, z):
+    result = 0
+    for c in coefficients:
+        result = result * z + c
+    return result
+
+
+def _multiply(a, b):
+    return [
+        [sum((a[i][k] * b[k][j] for k in range(len(b))), 0) for j in range(len(b[0]))]
+        for i in range(len(a))
+    ]
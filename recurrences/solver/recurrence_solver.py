@@ -1,11 +1,23 @@
+from sympy import sympify
+
 from recurrences import Recurrences
 from .acyclic_solver import AcyclicSolver
 from .cyclic_solver import CyclicSolver
+from .precision_solver import PrecisionSolver
 from .solver import Solver
+import settings
 
 
 class RecurrenceSolver(Solver):
-    solver: Solver
+    """
+    Solves a system of recurrences. Monomials only depending on acyclic parts of the system are solved by the
+    AcyclicSolver, even if other parts of the system (e.g. when it is shared by multiple goals) are cyclic.
+    If a precision is given, the cyclic parts of systems with rational coefficients are solved by the PrecisionSolver.
+    """
+
+    recurrences: Recurrences
+    acyclic_solver: AcyclicSolver
+    cyclic_solver: CyclicSolver
 
     def __init__(
         self,
@@ -14,17 +26,46 @@ class RecurrenceSolver(Solver):
         numeric_croots: bool = None,
         numeric_eps: float = None,
         force_cyclic_solver: bool = False,
+        precision: int = None,
     ):
+        self.recurrences = recurrences
+        self.acyclic_solver = None
+        self.cyclic_solver = None
+        precision = settings.precision if precision is None else precision
         if recurrences.is_acyclic and not force_cyclic_solver:
-            self.solver = AcyclicSolver(recurrences)
+            self.acyclic_solver = AcyclicSolver(recurrences)
+        elif precision is not None and PrecisionSolver.is_applicable(recurrences):
+            self.cyclic_solver = PrecisionSolver(recurrences, precision)
+            if not force_cyclic_solver:
+                self.acyclic_solver = AcyclicSolver(recurrences)
         else:
-            self.solver = CyclicSolver(
+            self.cyclic_solver = CyclicSolver(
                 recurrences, numeric_roots, numeric_croots, numeric_eps
             )
+            if not force_cyclic_solver:
+                self.acyclic_solver = AcyclicSolver(recurrences)
+
+    def _get_solver(self, monomial) -> Solver:
+        if self.cyclic_solver is None:
+            return self.acyclic_solver
+        if self.acyclic_solver is None or monomial not in self.cyclic_solver.monomials:
+            return self.cyclic_solver
+        if self.cyclic_solver.is_acyclic_for(monomial):
+            return self.acyclic_solver
+        return self.cyclic_solver
 
     @property
     def is_exact(self) -> bool:
-        return self.solver.is_exact
+        return self.cyclic_solver is None or self.cyclic_solver.is_exact
+
+    def is_exact_for(self, monomial) -> bool:
+        monomial = sympify(monomial)
+        return self._get_solver(monomial).is_exact_for(monomial)
 
     def get(self, monomial):
-        return self.solver.get(monomial)
+        monomial = sympify(monomial)
+        return self._get_solver(monomial).get(monomial)
+
+    def get_bounds(self, monomial, n: int):
+        monomial = sympify(monomial)
+        return self._get_solver(monomial).get_bounds(monomial, n)
@@ -1,5 +1,9 @@
 from abc import ABC, abstractmethod
 
+from mpmath import iv
+
+from utils import eval_re
+
 
 class Solver(ABC):
     @property
@@ -10,3 +14,22 @@ class Solver(ABC):
     @abstractmethod
     def get(self, monomial):
         pass
+
+    def is_exact_for(self, monomial) -> bool:
+        """
+        Returns whether the solution of the given monomial is exact. By default, this is the case if all solutions
+        computed so far are exact.
+        """
+        return self.is_exact
+
+    def get_bounds(self, monomial, n: int):
+        """
+        Returns an interval certainly containing the value of the given monomial after n iterations or None if the
+        solver can't certify one. By default, only exact rational values are certified.
+        """
+        if not self.is_exact_for(monomial):
+            return None
+        value = eval_re(n, self.get(monomial))
+        if not value.is_Rational:
+            return None
+        return iv.mpf(value.p) / value.q
@@ -0,0 +1,150 @@
+from typing import Dict, List, Set, Tuple
+
+from symengine.lib.symengine_wrapper import Expr, Symbol, Add, Mul, One, Zero
+
+
+class SparsePoly:
+    """
+    Sparse polynomial used while constructing recurrences. A polynomial maps exponent tuples over a fixed
+    list of generators (the program variables and symbolic constants) to their coefficients. In contrast to
+    symengine expressions, terms can be split by the powers of variables and multiplied without expanding or
+    re-collecting the whole expression. Parts of terms which are not integer powers of generators (e.g. sqrt(2) or
+    exp(p)) are kept in the coefficients.
+    """
+
+    gens: Tuple[Symbol, ...]
+    gen_index: Dict[Symbol, int]
+    terms: Dict[Tuple[int, ...], Expr]
+
+    def __init__(
+        self,
+        gens: Tuple[Symbol, ...],
+        gen_index: Dict[Symbol, int],
+        terms: Dict[Tuple[int, ...], Expr] = None,
+    ):
+        self.gens = gens
+        self.gen_index = gen_index
+        self.terms = {} if terms is None else terms
+
+    @classmethod
+    def get_generators(cls, symbols) -> Tuple[Tuple[Symbol, ...], Dict[Symbol, int]]:
+        """
+        Returns the generators (in a fixed order) together with the index of every generator.
+        """
+        gens = tuple(sorted(symbols, key=str))
+        return gens, {g: i for i, g in enumerate(gens)}
+
+    @classmethod
+    def from_expr(
+        cls, expr: Expr, gens: Tuple[Symbol, ...], gen_index: Dict[Symbol, int]
+    ) -> "SparsePoly":
+        poly = cls(gens, gen_index)
+        expr = expr.expand()
+        terms = expr.args if expr.is_Add else [expr]
+        for term in terms:
+            exponents = [0] * len(gens)
+            coeff = One()
+            parts = term.args if term.is_Mul else [term]
+            for part in parts:
+                if part.is_Symbol and part in gen_index:
+                    exponents[gen_index[part]] += 1
+                elif (
+                    part.is_Pow
+                    and part.args[0] in gen_index
+                    and part.args[1].is_Integer
+                ):
+                    exponents[gen_index[part.args[0]]] += int(part.args[1])
+                else:
+                    coeff *= part
+            poly._add_term(tuple(exponents), coeff)
+        return poly
+
+    def to_expr(self) -> Expr:
+        terms = []
+        for exponents, coeff in self.terms.items():
+            factors = [coeff]
+            for g, e in zip(self.gens, exponents):
+                if e == 1:
+                    factors.append(g)
+                elif e != 0:
+                    factors.append(g**e)
+            terms.append(Mul(*factors))
+        return Add(*terms) if terms else Zero()
+
+    def simplify_coefficients(self) -> "SparsePoly":
+        """
+        Simplifies all non-numeric coefficients. Simplifying the coefficients instead of the whole expression
+        avoids handing the (possibly large) polynomial to sympy.
+        """
+        result = SparsePoly(self.gens, self.gen_index)
+        for exponents, coeff in self.terms.items():
+            if not coeff.is_Number:
+                coeff = coeff.simplify()
+            result._add_term(exponents, coeff)
+        return result
+
+    def _add_term(self, exponents: Tuple[int, ...], coeff: Expr):
+        coeff = self.terms.get(exponents, Zero()) + coeff
+        if coeff == 0:
+            self.terms.pop(exponents, None)
+        else:
+            self.terms[exponents] = coeff
+
+    @property
+    def free_symbols(self) -> Set[Symbol]:
+        """
+        The generators occurring in the polynomial together with the free symbols of non-numeric coefficients.
+        """
+        present = [False] * len(self.gens)
+        symbols = set()
+        for exponents, coeff in self.terms.items():
+            for i, e in enumerate(exponents):
+                if e != 0:
+                    present[i] = True
+            if not coeff.is_Number:
+                symbols |= coeff.free_symbols
+        symbols.update(g for g, p in zip(self.gens, present) if p)
+        return symbols
+
+    def split(
+        self, variables: List[Symbol]
+    ) -> Tuple[Dict[Tuple[int, ...], "SparsePoly"], "SparsePoly"]:
+        """
+        Groups the terms containing any of the given variables by the powers of these variables. Returns the
+        groups (with the variables removed) and the polynomial of the terms without the variables.
+        Compared to get_terms_with_vars, terms with equal powers of the variables are collected into one group.
+        """
+        indices = [self.gen_index[v] for v in variables]
+        groups = {}
+        rest = SparsePoly(self.gens, self.gen_index)
+        for exponents, coeff in self.terms.items():
+            powers = tuple(exponents[i] for i in indices)
+            if not any(powers):
+                rest.terms[exponents] = coeff
+                continue
+            reduced = list(exponents)
+            for i in indices:
+                reduced[i] = 0
+            if powers not in groups:
+                groups[powers] = SparsePoly(self.gens, self.gen_index)
+            groups[powers].terms[tuple(reduced)] = coeff
+        return groups, rest
+
+    def __add__(self, other: "SparsePoly") -> "SparsePoly":
+        result = SparsePoly(self.gens, self.gen_index, dict(self.terms))
+        for exponents, coeff in other.terms.items():
+            result._add_term(exponents, coeff)
+        return result
+
+    def __iadd__(self, other: "SparsePoly") -> "SparsePoly":
+        for exponents, coeff in other.terms.items():
+            self._add_term(exponents, coeff)
+        return self
+
+    def __mul__(self, other: "SparsePoly") -> "SparsePoly":
+        result = SparsePoly(self.gens, self.gen_index)
+        for exponents1, coeff1 in self.terms.items():
+            for exponents2, coeff2 in other.terms.items():
+                exponents = tuple(e1 + e2 for e1, e2 in zip(exponents1, exponents2))
+                result._add_term(exponents, coeff1 * coeff2)
+        return result
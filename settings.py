@@ -16,6 +16,12 @@ numeric_roots: bool = False
 # If true, the complex roots in the recurrence computation will be computed numerically
 numeric_croots: bool = False
 
+# If true, recurrences without symbolic constants are solved in floating-point arithmetic
+numeric_solver: bool = False
+
+# If set, the cyclic parts of recurrences are solved numerically with this many significant digits
+precision: int = None
+
 # Interval epsilon for the potential approximation of roots
 numeric_eps: float = 1e-10
 
@@ -24,3 +30,12 @@ trivial_guard: bool = False
 
 # If true, moments of functions of distributions which would be transcendental won't be approximated by rationals
 exact_func_moments: bool = False
+
+# Directory of the persistent cache of recurrences and their solutions. If None, nothing is cached on disk
+cache_dir: str = None
+
+# Maximum size of the persistent cache in bytes, least recently used entries are evicted first
+cache_max_size: int = 256 * 1024 * 1024
+
+# Number of worker processes constructing the recurrences of monomials in parallel
+recurrence_workers: int = 1
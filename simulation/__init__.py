@@ -1,2 +1,7 @@
 from .simulator import Simulator
+from .vectorized_simulator import VectorizedSimulator
+from .sharded_simulator import ShardedSimulator
+from .adaptive_simulator import AdaptiveSimulator
 from .simulation_result import SimulationResult
+from .streaming_simulation_result import StreamingSimulationResult
+from .moment_accumulator import MomentAccumulator
@@ -0,0 +1,62 @@
+import time
+from typing import List, Optional, Union
+import numpy as np
+from program import Program
+from .simulator import Simulator
+from .vectorized_simulator import VectorizedSimulator
+from .sharded_simulator import accumulate_shard
+from .streaming_simulation_result import StreamingSimulationResult
+
+
+class AdaptiveSimulator:
+    """
+    Simulates a program in batches until the confidence intervals of all goals at the final iteration are
+    narrower than a tolerance or the budget is exhausted. The budget is given by the maximum number of samples
+    and optionally a maximum time in seconds. As in streaming mode, only the accumulated moments are kept.
+    Every batch is seeded deterministically, hence the result is reproducible if a seed is given.
+    """
+
+    simulator: Union[Simulator, VectorizedSimulator]
+    tolerance: float
+    confidence: float
+    batch_size: int
+    max_time: Optional[float]
+    seed: Optional[int]
+
+    def __init__(
+        self,
+        simulator: Union[Simulator, VectorizedSimulator],
+        tolerance: float,
+        confidence: float = 0.95,
+        batch_size: int = 1000,
+        max_time: Optional[float] = None,
+        seed: Optional[int] = None,
+    ):
+        self.simulator = simulator
+        self.tolerance = tolerance
+        self.confidence = confidence
+        self.batch_size = batch_size
+        self.max_time = max_time
+        self.seed = seed
+
+    def simulate(self, program: Program, goals: List, samples: int):
+        """
+        Simulates at most samples many runs and returns a StreamingSimulationResult.
+        """
+        start = time.time()
+        result = StreamingSimulationResult(goals, self.simulator.iterations + 1)
+        seed_sequence = np.random.SeedSequence(self.seed)
+        while result.number_samples < samples:
+            size = min(self.batch_size, samples - result.number_samples)
+            seed = int(seed_sequence.spawn(1)[0].generate_state(1)[0])
+            batch = accumulate_shard(self.simulator, program, size, seed, result.goals)
+            result.merge(batch)
+            if self.is_precise(result):
+                break
+            if self.max_time is not None and time.time() - start >= self.max_time:
+                break
+        return result
+
+    def is_precise(self, result: StreamingSimulationResult):
+        half_widths = result.get_confidence_half_widths(self.confidence)
+        return all(h <= self.tolerance for h in half_widths.values())
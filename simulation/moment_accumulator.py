@@ -0,0 +1,102 @@
+import numpy as np
+
+
+class MomentAccumulator:
+    """
+    Streaming accumulator for the mean and the central moments up to order 4 of a quantity over a fixed number
+    of iterations. Batches of samples are folded in using the pairwise update formulas by Chan et al. and Pébay
+    (https://www.osti.gov/biblio/1028931), such that the samples themselves never need to be stored.
+    The memory is linear in the number of iterations.
+    """
+
+    count: int
+    mean: np.ndarray
+    # m2, m3, m4 are the sums of the 2nd, 3rd and 4th powers of the deviations from the mean
+    m2: np.ndarray
+    m3: np.ndarray
+    m4: np.ndarray
+
+    def __init__(self, number_states: int):
+        self.count = 0
+        self.mean = np.zeros(number_states)
+        self.m2 = np.zeros(number_states)
+        self.m3 = np.zeros(number_states)
+        self.m4 = np.zeros(number_states)
+
+    def update(self, values: np.ndarray):
+        """
+        Folds in a batch of samples given as array of shape (samples, number_states).
+        """
+        if len(values) == 0:
+            return
+        batch = MomentAccumulator(values.shape[1])
+        batch.count = len(values)
+        batch.mean = values.mean(axis=0)
+        deviations = values - batch.mean
+        batch.m2 = (deviations**2).sum(axis=0)
+        batch.m3 = (deviations**3).sum(axis=0)
+        batch.m4 = (deviations**4).sum(axis=0)
+        self.merge(batch)
+
+    def merge(self, other: "MomentAccumulator"):
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count = other.count
+            self.mean, self.m2, self.m3, self.m4 = (
+                other.mean.copy(),
+                other.m2.copy(),
+                other.m3.copy(),
+                other.m4.copy(),
+            )
+            return
+
+        na, nb = self.count, other.count
+        n = na + nb
+        delta = other.mean - self.mean
+        mean = self.mean + delta * nb / n
+        m2 = self.m2 + other.m2 + delta**2 * na * nb / n
+        m3 = (
+            self.m3
+            + other.m3
+            + delta**3 * na * nb * (na - nb) / n**2
+            + 3 * delta * (na * other.m2 - nb * self.m2) / n
+        )
+        m4 = (
+            self.m4
+            + other.m4
+            + delta**4 * na * nb * (na**2 - na * nb + nb**2) / n**3
+            + 6 * delta**2 * (na**2 * other.m2 + nb**2 * self.m2) / n**2
+            + 4 * delta * (na * other.m3 - nb * self.m3) / n
+        )
+        self.count, self.mean, self.m2, self.m3, self.m4 = n, mean, m2, m3, m4
+
+    def get_central_moment(self, k: int) -> np.ndarray:
+        """
+        Returns the (biased) k-th central moment for every iteration.
+        """
+        if k == 1:
+            return np.zeros_like(self.mean)
+        if k == 2:
+            return self.m2 / self.count
+        if k == 3:
+            return self.m3 / self.count
+        if k == 4:
+            return self.m4 / self.count
+        raise ValueError(f"Central moments are only accumulated up to order 4, not {k}")
+
+    @property
+    def variance(self) -> np.ndarray:
+        """
+        The unbiased sample variance for every iteration.
+        """
+        if self.count < 2:
+            return np.full_like(self.mean, np.nan)
+        return self.m2 / (self.count - 1)
+
+    @property
+    def standard_error(self) -> np.ndarray:
+        """
+        The standard error of the mean for every iteration.
+        """
+        return np.sqrt(self.variance / self.count)
@@ -0,0 +1,133 @@
+import copy
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Union
+import numpy as np
+from symengine.lib.symengine_wrapper import Symbol
+from program import Program
+from .simulator import Simulator
+from .vectorized_simulator import VectorizedSimulator
+from .simulation_result import SimulationResult, allocate_array
+from .streaming_simulation_result import StreamingSimulationResult
+from progress.bar import Bar
+
+Trajectories = Dict[Symbol, np.ndarray]
+
+
+class ShardedSimulator:
+    """
+    Simulates a program by splitting the samples into shards of a fixed size which are simulated by a pool of
+    worker processes. Every shard is seeded deterministically by a seed derived from a SeedSequence.
+    As the shards do not depend on the number of workers, the result is reproducible for any worker count.
+    In streaming mode, every shard is immediately reduced to accumulated moments of the goals and
+    no trajectories are kept.
+    """
+
+    simulator: Union[Simulator, VectorizedSimulator]
+    workers: int
+    seed: Optional[int]
+    shard_size: int
+    streaming: bool
+
+    def __init__(
+        self,
+        simulator: Union[Simulator, VectorizedSimulator],
+        workers: int = 1,
+        seed: Optional[int] = None,
+        shard_size: int = 1000,
+        streaming: bool = False,
+    ):
+        self.simulator = simulator
+        self.workers = workers
+        self.seed = seed
+        self.shard_size = shard_size
+        self.streaming = streaming
+
+    def simulate(self, program: Program, goals: List, samples: int):
+        if self.streaming:
+            result = StreamingSimulationResult(goals, self.simulator.iterations + 1)
+            for shard in self._run_shards(
+                accumulate_shard, program, samples, result.goals
+            ):
+                result.merge(shard)
+            return result
+        trajectories = self.simulate_trajectories(program, samples)
+        return SimulationResult(trajectories, goals, self.simulator.storage_dir)
+
+    def simulate_trajectories(self, program: Program, samples: int) -> Trajectories:
+        shards = list(self._run_shards(_simulate_shard, program, samples))
+        return self._merge_shards(shards, self._get_shard_sizes(samples))
+
+    def _get_shard_sizes(self, samples: int):
+        shard_sizes = [self.shard_size] * (samples // self.shard_size)
+        if samples % self.shard_size:
+            shard_sizes.append(samples % self.shard_size)
+        return shard_sizes
+
+    def _run_shards(self, shard_function, program: Program, samples: int, *args):
+        """
+        Runs shard_function for every shard (possibly in parallel) and yields the results in shard order.
+        """
+        shard_sizes = self._get_shard_sizes(samples)
+        seed_sequences = np.random.SeedSequence(self.seed).spawn(len(shard_sizes))
+        shard_seeds = [int(s.generate_state(1)[0]) for s in seed_sequences]
+
+        shard_bar = Bar("Computing shards", max=len(shard_sizes))
+        if self.workers <= 1:
+            for size, seed in zip(shard_sizes, shard_seeds):
+                yield shard_function(self.simulator, program, size, seed, *args)
+                shard_bar.next()
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                futures = [
+                    executor.submit(
+                        shard_function, self.simulator, program, size, seed, *args
+                    )
+                    for size, seed in zip(shard_sizes, shard_seeds)
+                ]
+                for future in futures:
+                    yield future.result()
+                    shard_bar.next()
+        shard_bar.finish()
+
+    def _merge_shards(self, shards: List[Trajectories], shard_sizes: List[int]):
+        """
+        Concatenates the trajectories of all shards (in shard order).
+        Variables which are never set in a shard have NaN values for all samples of the shard.
+        """
+        variables = set()
+        for shard in shards:
+            variables |= shard.keys()
+        shape = (sum(shard_sizes), self.simulator.iterations + 1)
+        merged = {}
+        for v in variables:
+            merged[v] = allocate_array(shape, self.simulator.storage_dir)
+            start = 0
+            for shard, size in zip(shards, shard_sizes):
+                if v in shard:
+                    merged[v][start : start + size] = shard[v]
+                start += size
+        return merged
+
+
+def _simulate_shard(simulator, program: Program, samples: int, seed: int):
+    """
+    Simulates a single shard. Only the arrays of trajectories are sent back to the parent process.
+    Shards are kept in memory, only the merged arrays are backed by files.
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    simulator = copy.copy(simulator)
+    simulator.show_progress = False
+    simulator.storage_dir = None
+    return simulator.simulate_trajectories(program, samples)
+
+
+def accumulate_shard(simulator, program: Program, samples: int, seed: int, goals):
+    """
+    Simulates a single shard and only keeps the accumulated moments of the goals.
+    """
+    trajectories = _simulate_shard(simulator, program, samples, seed)
+    result = StreamingSimulationResult(goals, simulator.iterations + 1)
+    result.update(trajectories)
+    return result
@@ -1,56 +1,100 @@
+import tempfile
 import numpy as np
-from typing import Dict, List
-from statistics import mean
+from typing import Dict, List, Optional, Tuple
 from symengine.lib.symengine_wrapper import sympify, Expr
+from utils import eval_batch
 
-State = Dict[Expr, float]
-Run = List[State]
+
+def allocate_array(
+    shape: Tuple[int, int], storage_dir: Optional[str] = None, order="C"
+):
+    """
+    Returns a float64 array of the given shape filled with NaN.
+    If storage_dir is given, the array is backed by an (already unlinked) temporary file in this directory
+    such that large arrays can spill to disk.
+    """
+    if storage_dir is None:
+        return np.full(shape, np.nan, order=order)
+    # the mapping keeps the file open, it gets deleted as soon as the array is freed
+    with tempfile.TemporaryFile(dir=storage_dir) as file:
+        array = np.memmap(file, dtype=np.float64, mode="w+", shape=shape, order=order)
+    array[:] = np.nan
+    return array
+
+
+def get_goal_trajectories(goal, trajectories: Dict[Expr, np.ndarray]) -> np.ndarray:
+    """
+    Evaluates a goal over arrays of trajectories of shape (samples, iterations + 1) for every variable.
+    Entries where the goal cannot be evaluated are NaN.
+    """
+    shape = next(iter(trajectories.values())).shape
+    state = {v: np.asarray(values).ravel() for v, values in trajectories.items()}
+    with np.errstate(all="ignore"):
+        values = eval_batch(goal, state, shape[0] * shape[1])
+    if values is None:
+        return np.full(shape, np.nan)
+    return values.reshape(shape)
 
 
 class SimulationResult:
     """
     Provides the functionality to compute statistics for the result of simulating a program.
+    The result is stored column-wise: for every variable and goal there is one float64 array of shape
+    (samples, iterations + 1).
     """
 
-    samples: List[Run]
+    data: Dict[Expr, np.ndarray]
     goals: List[Expr]
+    storage_dir: Optional[str]
+    block_size: int = 10000
 
-    def __init__(self, samples: List[Run], goals: List):
-        self.samples = samples
+    def __init__(
+        self,
+        trajectories: Dict[Expr, np.ndarray],
+        goals: List,
+        storage_dir: Optional[str] = None,
+    ):
+        self.data = {sympify(v): values for v, values in trajectories.items()}
         self.goals = [sympify(g) for g in goals]
-        self._preprocess_samples()
-
-    def _preprocess_samples(self):
-        new_samples = []
-        for run in self.samples:
-            new_run = []
-            for state in run:
-                state = {sympify(k): v for k, v in state.items()}
-                goal_values = {g: self._goal_to_float(g, state) for g in self.goals}
-                state.update(goal_values)
-                new_run.append(state)
-            new_samples.append(new_run)
-        self.samples = new_samples
-
-    def _goal_to_float(self, goal, state):
-        result = sympify(goal).subs(state)
-        if not result.is_Number:
-            return float("nan")
-        return float(result)
+        self.storage_dir = storage_dir
+        self._add_goal_data()
+
+    @property
+    def number_samples(self) -> int:
+        return next(iter(self.data.values())).shape[0]
+
+    @property
+    def number_states(self) -> int:
+        return next(iter(self.data.values())).shape[1]
+
+    def _add_goal_data(self):
+        """
+        Evaluates every goal over the arrays of the variables. Goals are compiled once into NumPy functions and
+        evaluated for blocks of samples, such that memory-mapped results are never fully loaded into memory.
+        """
+        variables = list(self.data.keys())
+        shape = (self.number_samples, self.number_states)
+        for goal in self.goals:
+            if goal in self.data:
+                continue
+            values = allocate_array(shape, self.storage_dir)
+            for start in range(0, shape[0], self.block_size):
+                block = {
+                    v: self.data[v][start : start + self.block_size] for v in variables
+                }
+                values[start : start + self.block_size] = get_goal_trajectories(
+                    goal, block
+                )
+            self.data[goal] = values
 
     def get_average_goals(self, iteration=-1):
         result = {}
         for goal in self.goals:
-            result[goal] = mean([run[iteration][goal] for run in self.samples])
+            result[goal] = float(np.mean(self.data[goal][:, iteration]))
         return result
 
     def get_prepared_data(self, goal):
-        goal = sympify(goal)
-        data = []
-        for run in self.samples:
-            run_data = []
-            for state in run:
-                run_data.append(state[goal])
-            data.append(run_data)
-
-        return np.array(data).T
+        """
+        Returns the values of a goal or variable as array of shape (iterations + 1, samples).
+        """
+        return np.asarray(self.data[sympify(goal)]).T
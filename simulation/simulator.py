@@ -1,26 +1,45 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
+import numpy as np
 from singledispatchmethod import singledispatchmethod
 from symengine.lib.symengine_wrapper import Symbol
 from program import Program
 from program.assignment import Assignment
 from program.ifstatem import IfStatem
-from .simulation_result import SimulationResult
+from .simulation_result import SimulationResult, allocate_array
 from progress.bar import Bar
 
 
 class Simulator:
     """
     Class to simulate a program for a given number of iterations and collect the results.
+    If storage_dir is set, the arrays of the result are backed by temporary files in this directory.
     """
 
     iterations: int
+    show_progress: bool
+    storage_dir: Optional[str]
 
-    def __init__(self, iterations: int):
+    def __init__(
+        self,
+        iterations: int,
+        show_progress: bool = True,
+        storage_dir: Optional[str] = None,
+    ):
         self.iterations = iterations
+        self.show_progress = show_progress
+        self.storage_dir = storage_dir
 
     def simulate(self, program: Program, goals: List, samples: int):
-        result = []
-        sample_bar = Bar("Computing samples", max=samples)
+        trajectories = self.simulate_trajectories(program, samples)
+        return SimulationResult(trajectories, goals, self.storage_dir)
+
+    def simulate_runs(self, program: Program, samples: int):
+        """
+        Yields the states of the runs one after another, such that only a single run is kept in memory.
+        """
+        sample_bar = (
+            Bar("Computing samples", max=samples) if self.show_progress else None
+        )
         for _ in range(samples):
             states = [self.execute(program.initial, {})]
             for _ in range(self.iterations):
@@ -28,10 +47,28 @@ class Simulator:
                     states.append(states[-1].copy())
                 else:
                     states.append(self.execute(program.loop_body, states[-1].copy()))
-            sample_bar.next()
-            result.append(states)
-        sample_bar.finish()
-        return SimulationResult(result, goals)
+            if sample_bar:
+                sample_bar.next()
+            yield states
+        if sample_bar:
+            sample_bar.finish()
+
+    def simulate_trajectories(self, program: Program, samples: int):
+        """
+        Returns a mapping from every program variable to an array of shape (samples, iterations + 1)
+        holding the values of the variable in all samples over all iterations.
+        Every run is written to the arrays as soon as it is simulated.
+        """
+        trajectories = {}
+        for i, run in enumerate(self.simulate_runs(program, samples)):
+            for iteration, state in enumerate(run):
+                for v, value in state.items():
+                    if v not in trajectories:
+                        trajectories[v] = allocate_array(
+                            (samples, self.iterations + 1), self.storage_dir
+                        )
+                    trajectories[v][i, iteration] = value
+        return trajectories
 
     @singledispatchmethod
     def execute(self, program_element, state: Dict[Symbol, float]):
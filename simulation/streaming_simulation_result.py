@@ -0,0 +1,59 @@
+import numpy as np
+from typing import Dict, List
+from symengine.lib.symengine_wrapper import sympify, Expr
+from .moment_accumulator import MomentAccumulator
+from .simulation_result import get_goal_trajectories
+
+
+class StreamingSimulationResult:
+    """
+    Result of simulating a program without storing the individual runs.
+    For every goal, only the running mean and central moments per iteration are kept.
+    """
+
+    goals: List[Expr]
+    accumulators: Dict[Expr, MomentAccumulator]
+    number_samples: int
+
+    def __init__(self, goals: List, number_states: int):
+        self.goals = [sympify(g) for g in goals]
+        self.accumulators = {g: MomentAccumulator(number_states) for g in self.goals}
+        self.number_samples = 0
+
+    def update(self, trajectories: Dict[Expr, np.ndarray]):
+        """
+        Folds in a batch of runs given as arrays of shape (samples, iterations + 1) for every variable.
+        """
+        self.number_samples += len(next(iter(trajectories.values())))
+        for goal in self.goals:
+            self.accumulators[goal].update(get_goal_trajectories(goal, trajectories))
+
+    def merge(self, other: "StreamingSimulationResult"):
+        self.number_samples += other.number_samples
+        for goal in self.goals:
+            self.accumulators[goal].merge(other.accumulators[goal])
+
+    def get_average_goals(self, iteration=-1):
+        return {g: float(self.accumulators[g].mean[iteration]) for g in self.goals}
+
+    def get_standard_errors(self, iteration=-1):
+        return {
+            g: float(self.accumulators[g].standard_error[iteration]) for g in self.goals
+        }
+
+    def get_central_moments(self, k: int, iteration=-1):
+        return {
+            g: float(self.accumulators[g].get_central_moment(k)[iteration])
+            for g in self.goals
+        }
+
+    def get_confidence_half_widths(self, confidence=0.95, iteration=-1):
+        """
+        Returns the half-widths of the (normal approximation) confidence intervals of the averages of the goals.
+        """
+        from scipy.stats import norm
+
+        z = norm.ppf((1 + confidence) / 2)
+        return {
+            g: z * error for g, error in self.get_standard_errors(iteration).items()
+        }
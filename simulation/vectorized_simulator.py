@@ -0,0 +1,118 @@
+from typing import Dict, List, Optional
+import numpy as np
+from singledispatchmethod import singledispatchmethod
+from symengine.lib.symengine_wrapper import Symbol
+from program import Program
+from program.assignment import Assignment
+from program.ifstatem import IfStatem
+from .simulation_result import SimulationResult, allocate_array
+from progress.bar import Bar
+
+BatchState = Dict[Symbol, np.ndarray]
+
+
+class VectorizedSimulator:
+    """
+    Class to simulate a program for a given number of iterations and collect the results.
+    In contrast to the Simulator, all samples are advanced together. A state maps every variable to
+    an array holding its values for all samples. Expressions are compiled once into NumPy kernels.
+    If storage_dir is set, the arrays of the result are backed by temporary files in this directory.
+    """
+
+    iterations: int
+    show_progress: bool
+    storage_dir: Optional[str]
+
+    def __init__(
+        self,
+        iterations: int,
+        show_progress: bool = True,
+        storage_dir: Optional[str] = None,
+    ):
+        self.iterations = iterations
+        self.show_progress = show_progress
+        self.storage_dir = storage_dir
+
+    def simulate(self, program: Program, goals: List, samples: int):
+        trajectories = self.simulate_trajectories(program, samples)
+        return SimulationResult(trajectories, goals, self.storage_dir)
+
+    def simulate_trajectories(self, program: Program, samples: int):
+        """
+        Returns a mapping from every program variable to an array of shape (samples, iterations + 1)
+        holding the values of the variable in all samples over all iterations.
+        """
+        trajectories = {}
+
+        def store(iteration, state):
+            for v, values in state.items():
+                if v not in trajectories:
+                    # column-major, such that storing a single iteration is contiguous
+                    trajectories[v] = allocate_array(
+                        (samples, self.iterations + 1), self.storage_dir, order="F"
+                    )
+                trajectories[v][:, iteration] = values
+
+        state = self.execute(program.initial, {}, samples)
+        store(0, state)
+        iteration_bar = None
+        if self.show_progress:
+            iteration_bar = Bar("Computing iterations", max=self.iterations)
+        for i in range(1, self.iterations + 1):
+            active = program.loop_guard.evaluate_batch(state, samples)
+            state = self._execute_masked(program.loop_body, state.copy(), active)
+            store(i, state)
+            if iteration_bar:
+                iteration_bar.next()
+        if iteration_bar:
+            iteration_bar.finish()
+        return trajectories
+
+    def _execute_masked(self, program_element, state: BatchState, mask: np.ndarray):
+        """
+        Executes the program element only for the samples selected by mask. All other samples keep their state.
+        """
+        if mask.all():
+            return self.execute(program_element, state, len(mask))
+        if not mask.any():
+            return state
+
+        sub_state = {v: values[mask] for v, values in state.items()}
+        sub_state = self.execute(program_element, sub_state, int(mask.sum()))
+        for v, values in sub_state.items():
+            merged = state[v].copy() if v in state else np.full(len(mask), np.nan)
+            merged[mask] = values
+            state[v] = merged
+        return state
+
+    @singledispatchmethod
+    def execute(self, program_element, state: BatchState, size: int):
+        raise RuntimeError(f"Unknown program element in simulation, {program_element}")
+
+    @execute.register
+    def _(self, program_element: list, state: BatchState, size: int):
+        for element in program_element:
+            state = self.execute(element, state, size)
+        return state
+
+    @execute.register
+    def _(self, program_element: IfStatem, state: BatchState, size: int):
+        # All conditions are evaluated before any branch gets executed. Hence, the masks of the branches
+        # are disjoint and every branch only ever sees the samples in the state before the if-statement.
+        remaining = np.ones(size, dtype=bool)
+        masks = []
+        for condition in program_element.conditions:
+            mask = condition.evaluate_batch(state, size) & remaining
+            remaining = remaining & ~mask
+            masks.append(mask)
+        branches = list(zip(masks, program_element.branches))
+        if program_element.else_branch:
+            branches.append((remaining, program_element.else_branch))
+
+        for mask, branch in branches:
+            state = self._execute_masked(branch, state, mask)
+        return state
+
+    @execute.register
+    def _(self, program_element: Assignment, state: BatchState, size: int):
+        return program_element.evaluate_batch(state, size)
@@ -0,0 +1,28 @@
+import unittest
+
+from symengine.lib.symengine_wrapper import sympify, Symbol
+
+from program.assignment import PolyAssignment
+from recurrences import RecBuilderContext
+
+
+class AssignmentMomentsTest(unittest.TestCase):
+    def test_memoized_moment(self):
+        assignment = PolyAssignment("x", ["x + a", "2"], ["1/2", "1/2"])
+        context = RecBuilderContext()
+        moment = assignment.get_moment_cached(2, context)
+        self.assertEqual(moment, sympify("(x + a)**2/2 + 2").expand())
+        self.assertIs(assignment.get_moment_cached(2, context), moment)
+
+    def test_subs_invalidates_moments(self):
+        assignment = PolyAssignment("x", ["x + a"], ["1"])
+        context = RecBuilderContext()
+        assignment.get_moment_cached(2, context)
+        assignment.subs({Symbol("a"): 1})
+        self.assertEqual(
+            assignment.get_moment_cached(2, context), sympify("x**2 + 2*x + 1")
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import os
+import tempfile
+import unittest
+
+from cli import ArgumentParser
+from cli.batch_runner import BatchRunner, OK, TIMEOUT, ERROR
+
+PROGRAM = """
+x = 0
+while true:
+    x = x + 1 {1/2} x - 1
+end
+"""
+
+
+class BatchRunnerTest(unittest.TestCase):
+    def test_outcomes(self):
+        args = ArgumentParser().get_defaults()
+        args.goals = ["E(x^2)"]
+        with tempfile.TemporaryDirectory() as directory:
+            ok = os.path.join(directory, "ok.prob")
+            with open(ok, "w") as file:
+                file.write(PROGRAM)
+            error = os.path.join(directory, "error.prob")
+            with open(error, "w") as file:
+                file.write(PROGRAM.replace("x - 1", "x -"))
+            slow = os.path.join(
+                os.path.dirname(__file__), "../benchmarks/defective/deg-500.prob"
+            )
+            runner = BatchRunner(args, workers=2, timeout=3)
+            results = runner.run([slow, ok, error], verbose=False)
+
+        self.assertEqual([r["benchmark"] for r in results], [slow, ok, error])
+        self.assertEqual([r["status"] for r in results], [TIMEOUT, OK, ERROR])
+        self.assertIn("E(x**2) = 0; n", results[1]["output"])
+        self.assertIsNotNone(results[2]["error"])
+        self.assertLess(results[0]["time"], 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
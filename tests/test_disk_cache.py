@@ -0,0 +1,126 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from symengine.lib.symengine_wrapper import sympify
+
+import settings
+from inputparser import Parser
+from program import normalize_program
+from recurrences import RecBuilder, DiskCache, get_cache_key
+from recurrences.solver import RecurrenceSolver
+from cli import ArgumentParser
+from cli.common import get_moment, get_moment_bounds
+
+PROGRAM = """
+x = 0
+y = 1
+while true:
+    x = x + 1 {1/2} x - 1
+    y = 2*y + x
+end
+"""
+
+
+def get_program(source=PROGRAM):
+    return normalize_program(Parser().parse_string(source))
+
+
+class DiskCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        settings.cache_dir = self.directory.name
+
+    def tearDown(self):
+        settings.cache_dir = None
+        self.directory.cleanup()
+
+    def test_cached_recurrences_are_equal(self):
+        monom = sympify("x*y")
+        expected = RecBuilder(get_program()).get_recurrences(monom)
+        program = get_program()
+        key = get_cache_key(program, "recurrences", monom)
+        self.assertTrue(
+            os.path.exists(os.path.join(self.directory.name, f"{key}.pickle"))
+        )
+
+        cached = RecBuilder(program).get_recurrences(monom)
+        self.assertEqual(expected.recurrence_dict, cached.recurrence_dict)
+        self.assertEqual(expected.init_values_dict, cached.init_values_dict)
+        self.assertEqual(
+            RecurrenceSolver(expected).get(monom), RecurrenceSolver(cached).get(monom)
+        )
+
+    def test_key_depends_on_program_and_settings(self):
+        program = get_program()
+        other = get_program(PROGRAM.replace("2*y", "3*y"))
+        monom = sympify("y")
+        key = get_cache_key(program, "recurrences", monom)
+        self.assertEqual(key, get_cache_key(program, "recurrences", monom))
+        self.assertNotEqual(key, get_cache_key(other, "recurrences", monom))
+        self.assertNotEqual(key, get_cache_key(program, "solution", monom))
+        settings.numeric_roots = True
+        try:
+            self.assertNotEqual(key, get_cache_key(program, "recurrences", monom))
+        finally:
+            settings.numeric_roots = False
+
+    def test_incremental_reanalysis(self):
+        # the system of x*y contains x**2, whose recurrence does not depend on the assignment of y
+        monom = sympify("x*y")
+        RecBuilder(get_program()).get_recurrences(monom)
+        edited = get_program(PROGRAM.replace("2*y", "3*y"))
+        rec_builder = RecBuilder(edited)
+        with patch.object(
+            RecBuilder, "get_recurrence", wraps=rec_builder.get_recurrence
+        ) as get_recurrence:
+            recurrences = rec_builder.get_recurrences(monom)
+        rebuilt = {call.args[0] for call in get_recurrence.call_args_list}
+        self.assertEqual(rebuilt, {monom})
+
+        settings.cache_dir = None
+        expected = RecBuilder(edited).get_recurrences(monom)
+        self.assertEqual(expected.recurrence_dict, recurrences.recurrence_dict)
+        self.assertEqual(expected.init_values_dict, recurrences.init_values_dict)
+
+    def test_bounds_of_cached_moments(self):
+        args = ArgumentParser().get_defaults()
+        args.at_n = 20
+        settings.precision = 30
+        try:
+            monom = sympify("y")
+            results = []
+            for _ in range(2):
+                program = get_program()
+                solvers = {}
+                rec_builder = RecBuilder(program)
+                moment, _ = get_moment(monom, solvers, rec_builder, args, program)
+                bounds = get_moment_bounds(
+                    monom, args.at_n, solvers, rec_builder, args, program
+                )
+                results.append((moment, bounds, solvers))
+        finally:
+            settings.precision = None
+        self.assertIsNotNone(results[0][1])
+        self.assertEqual(results[0][:2], results[1][:2])
+        # the second run is served from the cache entirely
+        self.assertEqual(results[1][2], {})
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = DiskCache(self.directory.name, max_size=2000)
+        for i in range(3):
+            cache.put(str(i), "a" * 500)
+            # make sure the modification times differ
+            path = os.path.join(self.directory.name, f"{i}.pickle")
+            os.utime(path, (i, i))
+        self.assertEqual(cache.get("0"), "a" * 500)
+        cache.put("3", "b" * 500)
+        cache.put("4", "c" * 500)
+        self.assertIsNotNone(cache.get("0"))
+        self.assertIsNone(cache.get("1"))
+        self.assertIsNotNone(cache.get("4"))
+
+
+if __name__ == "__main__":
+    unittest.main()
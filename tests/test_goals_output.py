@@ -0,0 +1,64 @@
+import io
+import json
+import os
+import unittest
+from contextlib import redirect_stdout
+
+from cli import ArgumentParser
+from cli.actions.goals_action import GoalsAction
+from inputparser import Parser
+from program import normalize_program
+from recurrences import RecBuilder
+
+BENCHMARK = os.path.join(os.path.dirname(__file__), "benchmarks/2dwalk.prob")
+
+# no if-statements or distributions, such that parsing does not draw unique variable names
+PROGRAM = """
+x = 0
+y = 0
+while true:
+    x = x + 1 {1/2} x - 1
+    y = y + x {1/2} y
+end
+"""
+
+
+class GoalsOutputTest(unittest.TestCase):
+    def test_ndjson_records(self):
+        args = ArgumentParser().get_defaults()
+        args.goals = ["E(x^2)", "c2(x)", "P(x >= 2) <= ?"]
+        args.at_n = 10
+        args.output_format = "ndjson"
+        output = io.StringIO()
+        with redirect_stdout(output):
+            GoalsAction(args)(BENCHMARK)
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+
+        self.assertEqual([r["goal"] for r in records], args.goals)
+        moment = records[0]
+        self.assertEqual(moment["type"], "moment")
+        self.assertEqual(moment["id"], "E(x**2)")
+        self.assertEqual(moment["closed_form"], "2*n/3")
+        self.assertEqual(moment["initial_cases"], ["0"])
+        self.assertTrue(moment["is_exact"])
+        self.assertEqual(moment["at_n"]["value"], "20/3")
+        self.assertAlmostEqual(moment["at_n"]["numeric"], 20 / 3)
+        self.assertIn("total", moment["timings"])
+        self.assertEqual(records[1]["closed_form"], "2*n/3")
+        self.assertEqual(len(records[2]["bounds"]), 2)
+
+    def test_shared_system(self):
+        args = ArgumentParser().get_defaults()
+        args.goals = ["E(x^3)", "E(x^2*y)", "k2(y)"]
+        args.output_format = "ndjson"
+        action = GoalsAction(args)
+        program = normalize_program(Parser().parse_string(PROGRAM))
+        action.initialize_program(program, RecBuilder(program))
+        with redirect_stdout(io.StringIO()):
+            action.handle_all_goals()
+        # all goals are answered by a single solver for the combined system
+        self.assertEqual(len({id(s) for s in action.solvers.values()}), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
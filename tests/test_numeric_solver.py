@@ -0,0 +1,62 @@
+import unittest
+
+from symengine import sympify
+from sympy import sympify as sympy_sympify
+
+from inputparser import Parser
+from program import normalize_program
+from recurrences import RecBuilder
+from recurrences.solver import RecurrenceSolver, NumericRecurrenceSolver
+from utils import eval_re
+
+# x grows polynomially (defective recurrence matrix), y and z rotate with complex eigenvalues
+PROGRAM = """
+x, y, z = 0, 1, 0
+while true:
+    y, z = y/2 - z/2, y/2 + z/2
+    x = x + y + 1 {1/2} x
+end
+"""
+
+# a diagonalizable recurrence matrix
+DIAGONAL_PROGRAM = """
+x = 1
+while true:
+    x = 2*x {1/3} x/2
+end
+"""
+
+
+def get_recurrences(source, monomial):
+    program = normalize_program(Parser().parse_string(source))
+    return RecBuilder(program).get_recurrences(sympify(monomial))
+
+
+class NumericSolverTest(unittest.TestCase):
+    def assert_close_to_exact(self, source, monomial):
+        recurrences = get_recurrences(source, monomial)
+        exact = RecurrenceSolver(recurrences, False, False, 0).get(monomial)
+        solver = NumericRecurrenceSolver(recurrences)
+        numeric = solver.get(monomial)
+        ns = [0, 1, 2, 7, 20]
+        values = solver.evaluate(ns)[:, solver.index[sympy_sympify(monomial)]]
+        for i, value in zip(ns, values):
+            expected = float(eval_re(i, exact))
+            self.assertAlmostEqual(float(eval_re(i, numeric)), expected, places=6)
+            self.assertAlmostEqual(value, expected, places=6)
+        self.assertLess(solver.get_error(monomial), 1e-8)
+        self.assertFalse(solver.is_exact)
+
+    def test_defective(self):
+        self.assert_close_to_exact(PROGRAM, "x**2")
+
+    def test_diagonalizable(self):
+        self.assert_close_to_exact(DIAGONAL_PROGRAM, "x**2")
+
+    def test_symbolic_constants(self):
+        recurrences = get_recurrences("x = 0\nwhile true:\n    x = x + a\nend", "x")
+        self.assertFalse(NumericRecurrenceSolver.is_applicable(recurrences))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+
+from inputparser import Parser
+from inputparser.parser import get_lark_parser, GRAMMAR_FILE_PATH
+from utils import build_lalr_parser
+from inputparser.arithmetic_transformer import ArithmeticToStringTransformer
+
+# no simultaneous assignments, such that parsing does not draw unique variable names
+PROGRAM = """
+x = 0
+y = 1
+while x < 10:
+    x = x + 1 {1/2} x - 1
+    if x > 3:
+        y = y * 2
+    end
+end
+"""
+
+
+class ParserCacheTest(unittest.TestCase):
+    def test_parser_is_built_once(self):
+        Parser().parse_string(PROGRAM)
+        hits = get_lark_parser.cache_info().hits
+        Parser().parse_string(PROGRAM)
+        self.assertEqual(get_lark_parser.cache_info().hits, hits + 1)
+
+    def test_serialized_tables_parse_equally(self):
+        expected = build_lalr_parser(
+            GRAMMAR_FILE_PATH, ArithmeticToStringTransformer
+        ).parse(PROGRAM)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for _ in range(2):
+                parser = build_lalr_parser(
+                    GRAMMAR_FILE_PATH, ArithmeticToStringTransformer, cache_dir
+                )
+                self.assertEqual(parser.parse(PROGRAM), expected)
+            self.assertEqual(len(os.listdir(os.path.join(cache_dir, "lark"))), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
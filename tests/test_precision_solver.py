@@ -0,0 +1,56 @@
+import unittest
+
+from mpmath import mpf, workdps
+from symengine import sympify
+from sympy import N
+
+from inputparser import Parser
+from program import normalize_program
+from recurrences import RecBuilder
+from recurrences.solver import RecurrenceSolver
+from recurrences.solver.cyclic_solver import CyclicSolver
+from recurrences.solver.precision_solver import PrecisionSolver
+from utils import eval_re
+
+# the characteristic polynomial of the cycle has three irrational roots
+PROGRAM = """
+x, y, z = 1, 0, 0
+while true:
+    x, y, z = x/3 + y/5 + z, x/7 + 2*y/3, x/2 + y + z/11
+    z = z + 1 {1/2} z
+end
+"""
+
+
+def get_recurrences(source, monomial):
+    program = normalize_program(Parser().parse_string(source))
+    return RecBuilder(program).get_recurrences(sympify(monomial))
+
+
+class PrecisionSolverTest(unittest.TestCase):
+    def test_certified_bounds(self):
+        recurrences = get_recurrences(PROGRAM, "x")
+        exact = RecurrenceSolver(recurrences, False, False, 0).get(sympify("x"))
+        solver = RecurrenceSolver(recurrences, precision=40)
+        self.assertIsInstance(solver.cyclic_solver, PrecisionSolver)
+        solution = solver.get(sympify("x"))
+        self.assertFalse(solver.is_exact)
+        for n in [0, 2, 10, 300]:
+            expected = N(eval_re(n, exact), 60)
+            bounds = solver.get_bounds(sympify("x"), n)
+            with workdps(60):
+                self.assertIn(mpf(str(expected)), bounds)
+            self.assertLess(bounds.delta / max(1, abs(bounds.mid)), 1e-30)
+            relative = abs(N(eval_re(n, solution), 60) - expected) / max(1, expected)
+            self.assertLess(relative, 1e-35)
+
+    def test_symbolic_constants(self):
+        recurrences = get_recurrences(PROGRAM.replace("z/11", "z*a"), "x")
+        self.assertFalse(PrecisionSolver.is_applicable(recurrences))
+        solver = RecurrenceSolver(recurrences, precision=40)
+        self.assertIsInstance(solver.cyclic_solver, CyclicSolver)
+        self.assertNotIsInstance(solver.cyclic_solver, PrecisionSolver)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import unittest
+
+from symengine import sympify
+from sympy import Rational, Symbol, symbols
+
+from inputparser import Parser
+from program import normalize_program
+from recurrences import RecBuilder
+from recurrences.solver import RecurrenceSolver
+import settings
+
+# a small cycle (y, z) feeding the acyclic monomials of x and w
+PROGRAM = """
+x, y, z, w = 0, 1, 0, 0
+while true:
+    y, z = z, y
+    x = x + y {1/2} x - 1
+    w = w + x {1/4} w
+end
+"""
+
+# a cycle without simultaneous assignments, such that parsing does not draw unique variable names
+COMBINED_PROGRAM = """
+x = 0
+y = 1
+z = 0
+while true:
+    y = y + z {1/2} z
+    z = y
+    x = x + y {1/2} x
+end
+"""
+
+
+def get_recurrences(monomial):
+    program = normalize_program(Parser().parse_string(PROGRAM))
+    return RecBuilder(program).get_recurrences(sympify(monomial))
+
+
+class RecurrenceComponentsTest(unittest.TestCase):
+    def test_components_in_topological_order(self):
+        recurrences = get_recurrences("w*x")
+        components = recurrences.get_components()
+        # only the swapped pairs are cyclic
+        self.assertEqual(max(len(c) for c in components), 2)
+        self.assertLess(len(components), len(recurrences.monomials))
+        position = {m: i for i, c in enumerate(components) for m in c}
+        for monomial, dependencies in recurrences.dependencies.items():
+            for d in dependencies:
+                self.assertLessEqual(position[d], position[monomial])
+
+    def test_sparse_rows(self):
+        recurrences = get_recurrences("x**2")
+        x, y, z = symbols("x y z")
+        # y is swapped before x is updated, hence E(x') = E(x) + 1/2 E(z) - 1/2
+        self.assertEqual(
+            recurrences.recurrence_rows[x],
+            {x: 1, z: Rational(1, 2), 1: Rational(-1, 2)},
+        )
+        values = recurrences.step(recurrences.init_values_dict)
+        self.assertEqual((values[y], values[z]), (0, 1))
+
+    def test_solution(self):
+        recurrences = get_recurrences("x**2")
+        self.assertFalse(recurrences.is_acyclic)
+        solver = RecurrenceSolver(recurrences, False, False, 0)
+        solution = solver.get(sympify("x**2"))
+        n = Symbol("n", integer=True)
+        self.assertTrue(solver.is_exact)
+        self.assertEqual(
+            [solution.subs({n: i}) for i in [0, 1, 2, 5, 9]],
+            [0, sympify("1/2"), sympify("3/2"), 5, sympify("23/2")],
+        )
+
+    def test_shared_solver(self):
+        # the coefficients of all monomials in a component are determined together
+        recurrences = get_recurrences("x**2")
+        shared = RecurrenceSolver(recurrences, False, False, 0)
+        for monomial in recurrences.monomials:
+            separate = RecurrenceSolver(recurrences, False, False, 0)
+            self.assertEqual(shared.get(monomial), separate.get(monomial))
+
+    def test_values_at(self):
+        recurrences = get_recurrences("w*x")
+        solver = RecurrenceSolver(recurrences, False, False, 0)
+        program = normalize_program(Parser().parse_string(PROGRAM))
+        rec_builder = RecBuilder(program)
+        n = Symbol("n", integer=True)
+        # small n are iterated, larger n use repeated squaring
+        for i in [0, 1, 2, len(recurrences.monomials), 37]:
+            values = recurrences.get_values_at(i)
+            for monomial in recurrences.monomials:
+                self.assertEqual(values[monomial], solver.get(monomial).subs({n: i}))
+            self.assertEqual(
+                rec_builder.get_value_at(sympify("w*x"), i),
+                values[Symbol("w") * Symbol("x")],
+            )
+
+    def test_combined_recurrences(self):
+        program = normalize_program(Parser().parse_string(COMBINED_PROGRAM))
+        rec_builder = RecBuilder(program)
+        monomials = [sympify("x**2"), sympify("x*z")]
+        combined = rec_builder.get_combined_recurrences(frozenset(monomials))
+        shared = RecurrenceSolver(combined, False, False, 0)
+        for monomial in monomials:
+            recurrences = rec_builder.get_recurrences(monomial)
+            self.assertLessEqual(set(recurrences.monomials), set(combined.monomials))
+            separate = RecurrenceSolver(recurrences, False, False, 0)
+            self.assertEqual(shared.get(monomial), separate.get(monomial))
+
+    def test_parallel_recurrences(self):
+        program = normalize_program(Parser().parse_string(COMBINED_PROGRAM))
+        monomial = sympify("x**2*z")
+        serial = RecBuilder(program).get_recurrences(monomial)
+        settings.recurrence_workers = 2
+        try:
+            parallel = RecBuilder(program).get_recurrences(monomial)
+        finally:
+            settings.recurrence_workers = 1
+        # same recurrences in the same order
+        self.assertEqual(
+            list(parallel.recurrence_dict.items()),
+            list(serial.recurrence_dict.items()),
+        )
+        self.assertEqual(parallel.init_values_dict, serial.init_values_dict)
+
+
+if __name__ == "__main__":
+    unittest.main()
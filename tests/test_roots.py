@@ -0,0 +1,37 @@
+import unittest
+
+from sympy import Matrix, Poly, Rational, Symbol, sqrt, symbols
+
+from utils import get_all_roots, get_charpoly
+
+
+class RootsTest(unittest.TestCase):
+    def test_rational_charpoly(self):
+        matrix = Matrix(
+            [
+                [Rational(1, 2), 1, 0],
+                [0, Rational(1, 2), 0],
+                [Rational(1, 3), 0, 2],
+            ]
+        )
+        charpoly = get_charpoly(matrix)
+        self.assertEqual(charpoly, matrix.charpoly())
+        self.assertTrue(charpoly.domain.is_QQ)
+
+    def test_symbolic_charpoly(self):
+        a = Symbol("a")
+        matrix = Matrix([[a, 1], [0, Rational(1, 2)]])
+        self.assertEqual(get_charpoly(matrix), matrix.charpoly())
+
+    def test_rational_roots(self):
+        x = symbols("x")
+        poly = Poly((x - Rational(1, 2)) ** 2 * (x**2 - 2) * (x - 3), x)
+        roots, is_exact = get_all_roots(poly)
+        self.assertTrue(is_exact)
+        self.assertEqual(
+            set(roots), {(Rational(1, 2), 2), (sqrt(2), 1), (-sqrt(2), 1), (3, 1)}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
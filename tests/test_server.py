@@ -0,0 +1,107 @@
+import io
+import json
+import unittest
+
+import settings
+from cli import ArgumentParser
+from cli.server import AnalysisServer, METHOD_NOT_FOUND, INVALID_PARAMS
+
+PROGRAM = """
+x = 0
+while true:
+    x = x + 1 {1/2} x - 1
+end
+"""
+
+
+def request(request_id, method, **params):
+    return json.dumps(
+        {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+    )
+
+
+class ServerTest(unittest.TestCase):
+    def tearDown(self):
+        # requests set the global settings
+        settings.cache_dir = None
+
+    def test_requests(self):
+        args = ArgumentParser().get_defaults()
+        args.no_cache = True
+        server = AnalysisServer(args)
+        requests = [
+            request(1, "goals", program=PROGRAM, goals=["E(x^2)"], at_n=4),
+            request(2, "goals", program=PROGRAM, goals=["E(x^2)", "c2(x)"]),
+            request(3, "goals", goals=["E(x)"]),
+            request(4, "unknown"),
+            request(5, "goals", program=PROGRAM, unknown_argument=1),
+            request(6, "shutdown"),
+            request(7, "goals", program=PROGRAM, goals=["E(x)"]),
+        ]
+        output = io.StringIO()
+        server.serve_stream(io.StringIO("\n".join(requests)), output)
+        responses = [json.loads(line) for line in output.getvalue().splitlines()]
+
+        self.assertEqual([r["id"] for r in responses], [1, 2, 3, 4, 5, 6])
+        records = responses[0]["result"]["records"]
+        self.assertEqual(records[0]["closed_form"], "n")
+        self.assertEqual(records[0]["at_n"]["value"], "4")
+        records = responses[1]["result"]["records"]
+        self.assertEqual([r["id"] for r in records], ["E(x**2)", "c2(x)"])
+        # the program is only parsed and normalized once
+        self.assertEqual(len(server.programs), 1)
+        self.assertEqual(responses[2]["error"]["code"], INVALID_PARAMS)
+        self.assertEqual(responses[3]["error"]["code"], METHOD_NOT_FOUND)
+        self.assertEqual(responses[4]["error"]["code"], INVALID_PARAMS)
+        self.assertFalse(server.running)
+
+    def test_params_are_converted_and_validated(self):
+        args = ArgumentParser().get_defaults()
+        args.no_cache = True
+        server = AnalysisServer(args)
+        requests = [
+            request(1, "goals", program=PROGRAM, goals="E(x)", at_n="4"),
+            request(2, "goals", program=PROGRAM, goals=["E(x)"], at_n="four"),
+            request(3, "goals", program=PROGRAM, goals=["E(x)"], at_n_direct=True),
+            request(4, "goals", program=PROGRAM, goals=[{"E": "x"}]),
+            request(5, "goals", program=PROGRAM, after_loop="yes"),
+            request(6, "run", program=PROGRAM, simulation_engine="parallel"),
+        ]
+        output = io.StringIO()
+        server.serve_stream(io.StringIO("\n".join(requests)), output)
+        responses = [json.loads(line) for line in output.getvalue().splitlines()]
+
+        records = responses[0]["result"]["records"]
+        self.assertEqual(records[0]["at_n"]["value"], "0")
+        for response in responses[1:]:
+            self.assertEqual(response["error"]["code"], INVALID_PARAMS)
+
+    def test_direct_and_closed_form_requests(self):
+        args = ArgumentParser().get_defaults()
+        args.no_cache = True
+        server = AnalysisServer(args)
+        program = "x = 0\nwhile true:\n    x = x + 1 {1/2} x + 2\nend\n"
+        requests = [
+            request(
+                1, "goals", program=program, goals=["E(x)"], at_n_direct=True, at_n=5
+            ),
+            request(2, "goals", program=program, goals=["E(x)"]),
+            request(3, "goals", program=program, goals=["E(x)"], at_n=7),
+            request(
+                4, "goals", program=program, goals=["E(x)"], at_n_direct=True, at_n=7
+            ),
+        ]
+        output = io.StringIO()
+        server.serve_stream(io.StringIO("\n".join(requests)), output)
+        responses = [json.loads(line) for line in output.getvalue().splitlines()]
+
+        records = [r["result"]["records"][0] for r in responses]
+        self.assertEqual(records[0]["at_n"]["value"], "15/2")
+        self.assertEqual(records[1]["closed_form"], "3*n/2")
+        self.assertEqual(records[2]["closed_form"], "3*n/2")
+        self.assertEqual(records[2]["at_n"]["value"], "21/2")
+        self.assertEqual(records[3]["at_n"]["value"], "21/2")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+import tempfile
+import unittest
+
+import numpy as np
+from sympy import sympify as sympy_sympify
+from symengine.lib.symengine_wrapper import sympify, Piecewise
+
+from inputparser import Parser
+from simulation import (
+    Simulator,
+    VectorizedSimulator,
+    ShardedSimulator,
+    AdaptiveSimulator,
+    MomentAccumulator,
+)
+
+DETERMINISTIC_PROGRAM = """
+a, b = 0, 1
+c = 0
+while a < 50:
+    a, b = b, a + b
+    if a > 10:
+        c = c + 1
+    else:
+        c = c - 1
+    end
+end
+"""
+
+RANDOM_WALK_PROGRAM = """
+x = 0
+y = 0
+while true:
+    x = x + 2 {1/2} x
+    s = Normal(0, 1)
+    if x > 4:
+        y = y + s
+    end
+end
+"""
+
+
+class SimulationTest(unittest.TestCase):
+    def test_vectorized_deterministic_equals_sequential(self):
+        goals = [sympify("a"), sympify("c"), sympify("a*b")]
+        program = Parser().parse_string(DETERMINISTIC_PROGRAM)
+        expected = Simulator(20).simulate(program, goals, 1)
+        program = Parser().parse_string(DETERMINISTIC_PROGRAM)
+        result = VectorizedSimulator(20).simulate(program, goals, 3)
+        for goal in goals:
+            expected_data = expected.get_prepared_data(goal)[:, 0]
+            for run in result.get_prepared_data(goal).T:
+                self.assertTrue(np.array_equal(expected_data, run))
+
+    def test_vectorized_matches_moments(self):
+        np.random.seed(0)
+        program = Parser().parse_string(RANDOM_WALK_PROGRAM)
+        goals = [sympify("x"), sympify("x**2"), sympify("y**2")]
+        result = VectorizedSimulator(10).simulate(program, goals, 20000)
+        averages = result.get_average_goals()
+        # E(x_n) = n, E(x_n^2) = n(n+1)
+        self.assertAlmostEqual(averages[goals[0]], 10, delta=0.1)
+        self.assertAlmostEqual(averages[goals[1]], 110, delta=2)
+        # y only moves in iterations in which x > 4
+        self.assertTrue(0 < averages[goals[2]] < 10)
+
+    def test_unset_variables_are_nan(self):
+        program = Parser().parse_string(RANDOM_WALK_PROGRAM)
+        trajectories = VectorizedSimulator(2).simulate_trajectories(program, 5)
+        self.assertTrue(np.isnan(trajectories[sympify("s")][:, 0]).all())
+        self.assertEqual(trajectories[sympify("x")].shape, (5, 3))
+
+    def test_sharded_is_reproducible_for_any_worker_count(self):
+        program = Parser().parse_string(RANDOM_WALK_PROGRAM)
+        for simulator in [Simulator(5), VectorizedSimulator(5)]:
+            results = []
+            for workers in [1, 2]:
+                sharded = ShardedSimulator(simulator, workers, seed=42, shard_size=7)
+                results.append(sharded.simulate_trajectories(program, 30))
+            self.assertEqual(results[0].keys(), results[1].keys())
+            for v in results[0]:
+                self.assertEqual(results[0][v].shape, (30, 6))
+                np.testing.assert_array_equal(results[0][v], results[1][v])
+
+    def test_moment_accumulator_matches_direct_computation(self):
+        values = np.random.default_rng(1).exponential(size=(1000, 4))
+        accumulator = MomentAccumulator(4)
+        for batch in np.array_split(values, [1, 10, 400, 401]):
+            accumulator.update(batch)
+        self.assertEqual(accumulator.count, 1000)
+        np.testing.assert_allclose(accumulator.mean, values.mean(axis=0))
+        np.testing.assert_allclose(accumulator.variance, values.var(axis=0, ddof=1))
+        for k in [2, 3, 4]:
+            central = ((values - values.mean(axis=0)) ** k).mean(axis=0)
+            np.testing.assert_allclose(accumulator.get_central_moment(k), central)
+
+    def test_streaming_matches_stored_runs(self):
+        program = Parser().parse_string(RANDOM_WALK_PROGRAM)
+        goals = [sympify("x"), sympify("y**2")]
+        results = []
+        for streaming in [False, True]:
+            simulator = ShardedSimulator(
+                VectorizedSimulator(5), seed=3, shard_size=40, streaming=streaming
+            )
+            results.append(simulator.simulate(program, goals, 100))
+        for iteration in [0, 2, -1]:
+            expected = results[0].get_average_goals(iteration)
+            actual = results[1].get_average_goals(iteration)
+            for goal in goals:
+                self.assertAlmostEqual(expected[goal], actual[goal])
+
+    def test_memory_mapped_storage_equals_in_memory(self):
+        program = Parser().parse_string(RANDOM_WALK_PROGRAM)
+        goals = [sympify("x"), sympify("x*y")]
+        results = []
+        with tempfile.TemporaryDirectory() as storage_dir:
+            for directory in [None, storage_dir]:
+                simulator = ShardedSimulator(
+                    Simulator(4, storage_dir=directory), seed=7, shard_size=6
+                )
+                results.append(simulator.simulate(program, goals, 15))
+            self.assertIsInstance(results[1].data[goals[1]], np.memmap)
+            for goal in goals:
+                self.assertEqual(results[1].data[goal].shape, (15, 5))
+                np.testing.assert_array_equal(
+                    results[0].get_prepared_data(goal),
+                    results[1].get_prepared_data(goal),
+                )
+
+    def test_compiled_goals_equal_substitution(self):
+        program = Parser().parse_string(RANDOM_WALK_PROGRAM)
+        x, y = sympify("x"), sympify("y")
+        goals = [
+            x**2 * y - 3,
+            Piecewise((1, x >= 4), (0, True)),
+            Piecewise((1, y > 0), (0, True)),
+            sympify("x + z"),
+        ]
+        result = VectorizedSimulator(6).simulate(program, goals, 10)
+        for goal in goals:
+            data = result.get_prepared_data(goal)
+            for n in range(7):
+                for i in range(10):
+                    state = {
+                        x: float(result.data[x][i, n]),
+                        y: float(result.data[y][i, n]),
+                    }
+                    # symengine compares integers and floats inexactly, e.g. 4 <= 4.0 is False
+                    expected = sympy_sympify(goal).subs(state)
+                    if expected.is_Number:
+                        self.assertAlmostEqual(data[n, i], float(expected))
+                    else:
+                        self.assertTrue(np.isnan(data[n, i]))
+
+    def test_adaptive_stops_at_tolerance_or_budget(self):
+        program = Parser().parse_string(RANDOM_WALK_PROGRAM)
+        goals = [sympify("x")]
+        simulator = AdaptiveSimulator(
+            VectorizedSimulator(10), tolerance=0.2, batch_size=100, seed=1
+        )
+        result = simulator.simulate(program, goals, 100000)
+        half_width = result.get_confidence_half_widths()[goals[0]]
+        self.assertLessEqual(half_width, 0.2)
+        self.assertLess(result.number_samples, 100000)
+        self.assertEqual(result.number_samples % 100, 0)
+        # the previous batch was not precise enough
+        previous = AdaptiveSimulator(
+            VectorizedSimulator(10), tolerance=0.2, batch_size=100, seed=1
+        ).simulate(program, goals, result.number_samples - 100)
+        self.assertGreater(previous.get_confidence_half_widths()[goals[0]], 0.2)
+
+        simulator.tolerance = 0
+        result = simulator.simulate(program, goals, 250)
+        self.assertEqual(result.number_samples, 250)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+
+from symengine.lib.symengine_wrapper import sympify, Symbol
+
+from recurrences.sparse_poly import SparsePoly
+
+x, y, p = Symbol("x"), Symbol("y"), Symbol("p")
+GENS, GEN_INDEX = SparsePoly.get_generators({x, y, p})
+
+
+def to_poly(expr: str) -> SparsePoly:
+    return SparsePoly.from_expr(sympify(expr), GENS, GEN_INDEX)
+
+
+class SparsePolyTest(unittest.TestCase):
+    def test_roundtrip(self):
+        expr = sympify("(x + 2*y*p)**2 - sqrt(2)*x/p + exp(p)*y + 3")
+        poly = SparsePoly.from_expr(expr, GENS, GEN_INDEX)
+        self.assertEqual(poly.to_expr().expand(), expr.expand())
+        self.assertEqual(poly.free_symbols, {x, y, p})
+        self.assertEqual(to_poly("x - x").terms, {})
+
+    def test_split(self):
+        groups, rest = to_poly("x**2*y + 3*x**2 - p*x*y + y + 1").split([x])
+        self.assertEqual(rest.to_expr(), sympify("y + 1"))
+        self.assertEqual(set(groups), {(2,), (1,)})
+        self.assertEqual(groups[(2,)].to_expr(), sympify("y + 3"))
+        self.assertEqual(groups[(1,)].to_expr(), sympify("-p*y"))
+
+    def test_arithmetic(self):
+        a, b = to_poly("x + p"), to_poly("x - p")
+        self.assertEqual((a * b).to_expr(), sympify("x**2 - p**2"))
+        self.assertEqual((a + b).to_expr(), sympify("2*x"))
+        a += b
+        self.assertEqual(a.to_expr(), sympify("2*x"))
+
+
+if __name__ == "__main__":
+    unittest.main()
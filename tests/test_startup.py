@@ -0,0 +1,65 @@
+import os
+import subprocess
+import sys
+import unittest
+
+POLAR = os.path.join(os.path.dirname(__file__), "../polar.py")
+BENCHMARK = os.path.join(os.path.dirname(__file__), "benchmarks/2dwalk.prob")
+
+
+def get_import_times(*cli_args):
+    """
+    Runs polar with "python -X importtime" and returns the cumulative import time in microseconds
+    for every imported module together with the total import time of the modules imported at the top level.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", POLAR, *cli_args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    total = 0
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, module = line[len("import time:") :].split("|")
+        times[module.strip()] = int(cumulative)
+        # nested imports are indented, their time is contained in the time of their parent
+        if not module.startswith("  "):
+            total += int(cumulative)
+    return times, total
+
+
+class StartupTest(unittest.TestCase):
+    """
+    Tracks which modules the common entry points load. Heavy dependencies must only be imported
+    by the actions that need them.
+    """
+
+    def test_help(self):
+        times, total = get_import_times("--help")
+        self.assertNotIn("sympy", times)
+        self.assertNotIn("symengine", times)
+        self.assertNotIn("cli.actions.goals_action", times)
+        # generous budget, the goals path needs about 15 times as long
+        _, goals_total = get_import_times(BENCHMARK, "--goals", "E(x)", "--no_cache")
+        self.assertLess(total, goals_total / 3)
+
+    def test_goals(self):
+        times, _ = get_import_times(BENCHMARK, "--goals", "E(x)", "--no_cache")
+        self.assertIn("cli.actions.goals_action", times)
+        for module in ["scipy.stats", "sympy.stats", "matplotlib", "cli.server"]:
+            self.assertNotIn(module, times)
+
+    def test_simulation(self):
+        times, _ = get_import_times(
+            BENCHMARK, "--simulate", "--simulation_iter", "10", "--number_samples", "10"
+        )
+        self.assertIn("cli.actions.simulation_action", times)
+        for module in ["matplotlib", "cli.actions.goals_action"]:
+            self.assertNotIn(module, times)
+
+
+if __name__ == "__main__":
+    unittest.main()
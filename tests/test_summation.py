@@ -0,0 +1,22 @@
+import unittest
+
+from sympy import Rational, Symbol, symbols
+
+from recurrences.solver.acyclic_solver import sum_poly_exp
+
+
+class SummationTest(unittest.TestCase):
+    def test_sum_poly_exp(self):
+        n = Symbol("n", integer=True)
+        for degree in range(5):
+            for ratio in [1, Rational(1, 2), 3, -2, symbols("q")]:
+                closed_form = sum_poly_exp(degree, ratio, n)
+                for value in [1, 2, 3, 8]:
+                    expected = sum(k**degree * ratio**k for k in range(1, value))
+                    self.assertEqual(
+                        (closed_form.xreplace({n: value}) - expected).simplify(), 0
+                    )
+
+
+if __name__ == "__main__":
+    unittest.main()
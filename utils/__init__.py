@@ -7,8 +7,11 @@ from .expressions import (
     get_monoms,
     get_all_roots,
     solve_linear,
+    solve_linear_multiple,
     without_piecewise,
     eval_re,
+    eval_batch,
+    get_array_kernel,
     is_solvable,
     numerify_croots,
     unpack_piecewise,
@@ -17,8 +20,13 @@ from .expressions import (
 )
 from .conditions import get_valid_values, evaluate_cop
 from .finite_power_reduction import get_reduced_powers
-from .matrix import characteristic_poly
-from .statistics import raw_moments_to_cumulants, raw_moments_to_centrals, comb
+from .matrix import characteristic_poly, get_charpoly
+from .statistics import (
+    raw_moments_to_cumulants,
+    raw_moments_to_centrals,
+    comb,
+    sample_categorical_batch,
+)
 from .special_polys import ce_bell_poly, prob_hermite_poly
 from .solvers import solve_rec_by_summing
 from .graph import Graph
@@ -27,3 +35,4 @@ from .algebraic_numbers import (
     faccin_bound,
     algebraic_number_equals_const,
 )
+from .parsing import build_lalr_parser
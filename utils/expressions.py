@@ -1,7 +1,16 @@
-from typing import List
+from functools import lru_cache
+from typing import List, Dict
 import math
 
-from symengine.lib.symengine_wrapper import sympy2symengine, Expr, Symbol, One, Zero
+import numpy as np
+from symengine.lib.symengine_wrapper import (
+    sympy2symengine,
+    Expr,
+    Symbol,
+    One,
+    Zero,
+    sympify,
+)
 from sympy import (
     Rational,
     linsolve,
@@ -13,7 +22,10 @@ from sympy import (
     Piecewise,
     LessThan,
     roots,
+    lambdify,
+    sympify as sympy_sympify,
 )
+from sympy.polys.matrices import DomainMatrix
 
 
 def float_to_rational(expr: Expr):
@@ -37,7 +49,10 @@ def get_all_roots(poly: Poly, numeric=False, numeric_croots=False, eps=1e-10):
         return result, exact
 
     try:
-        poly_roots = poly.all_roots(multiple=False)
+        if poly.domain.is_QQ or poly.domain.is_ZZ:
+            poly_roots = get_rational_poly_roots(poly)
+        else:
+            poly_roots = poly.all_roots(multiple=False)
     except Exception as e:
         if poly.degree() >= 5:
             raise e
@@ -54,11 +69,46 @@ def get_all_roots(poly: Poly, numeric=False, numeric_croots=False, eps=1e-10):
     return result, exact
 
 
+def get_rational_poly_roots(poly: Poly):
+    """
+    Returns all roots of a polynomial with rational coefficients together with their multiplicities.
+    The polynomial is first decomposed into square-free factors and then into irreducible factors. Rational roots
+    are read off the linear factors and only the remaining irreducible factors need root isolation.
+    """
+    result = []
+    for square_free, multiplicity in poly.sqf_list()[1]:
+        for factor, _ in square_free.factor_list()[1]:
+            if factor.degree() == 1:
+                result.append((-factor.nth(0) / factor.nth(1), multiplicity))
+            else:
+                result += [(r, multiplicity) for r in factor.all_roots()]
+    return result
+
+
 def solve_linear(equations, unknowns):
     sol = linsolve(equations, unknowns)
     return sol.args[0]
 
 
+def solve_linear_multiple(matrix: List[List], right_hand_sides: List[List]):
+    """
+    Solves the linear systems matrix * x = b for all columns b of right_hand_sides with a single elimination over
+    the smallest domain containing all entries. The matrix may have more rows than columns.
+    Returns the solutions as rows (one per unknown, one entry per right-hand side) or None if the matrix does not
+    have full column rank.
+    """
+    number_unknowns = len(matrix[0])
+    rows = [list(row) + list(rhs) for row, rhs in zip(matrix, right_hand_sides)]
+    augmented = DomainMatrix.from_list_sympy(
+        len(rows), len(rows[0]), rows, field=True, extension=True
+    )
+    reduced, pivots = augmented.rref()
+    if tuple(pivots[:number_unknowns]) != tuple(range(number_unknowns)):
+        return None
+    reduced = reduced.to_Matrix()
+    return [list(reduced[i, number_unknowns:]) for i in range(number_unknowns)]
+
+
 def without_piecewise(expr):
     """
     Removes the Piecewise from an expression by assuming that all restricting assumptions are false.
@@ -199,6 +249,33 @@ def eval_re(n, expression):
     return re(result.expand())
 
 
+@lru_cache(maxsize=None)
+def get_array_kernel(expr: Expr):
+    """
+    Compiles an expression once into a NumPy function.
+    Returns the function together with the (ordered) symbols it expects as arguments.
+    """
+    args = sorted(expr.free_symbols, key=str)
+    kernel = lambdify(
+        [sympy_sympify(a) for a in args], sympy_sympify(expr), modules="numpy"
+    )
+    return kernel, args
+
+
+def eval_batch(expr, state: Dict[Symbol, np.ndarray], size: int):
+    """
+    Evaluates an expression for a whole batch of states, given as a mapping from symbols to arrays of values.
+    Returns a float array of length size or None if the state does not determine the value of the expression.
+    """
+    kernel, args = get_array_kernel(sympify(expr))
+    if any(a not in state for a in args):
+        return None
+    values = np.asarray(kernel(*[state[a] for a in args]), dtype=float)
+    if values.shape != (size,):
+        values = np.broadcast_to(values, (size,)).copy()
+    return values
+
+
 def numerify_croots(expression):
     """
     Replaces every croot in an expression by a floating-point representation
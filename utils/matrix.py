@@ -1,6 +1,24 @@
 from symengine.lib.symengine_wrapper import Matrix, eye, Symbol
+from sympy import Matrix as SympyMatrix, PurePoly, QQ, Symbol as SympySymbol
+from sympy.polys.matrices import DomainMatrix
 
 
 def characteristic_poly(matrix: Matrix):
     t = Symbol("t")
     return ((eye(matrix.cols) * t) - matrix).det().simplify(), t
+
+
+def get_charpoly(matrix: SympyMatrix) -> PurePoly:
+    """
+    Returns the characteristic polynomial of a sympy matrix. If all entries are rational (no symbolic constants),
+    the polynomial is computed directly over QQ with DomainMatrix instead of constructing a domain from generic
+    expressions.
+    """
+    if not all(entry.is_Rational for entry in matrix):
+        return matrix.charpoly()
+    domain_matrix = DomainMatrix.from_list_sympy(
+        *matrix.shape, matrix.tolist()
+    ).convert_to(QQ)
+    return PurePoly.from_list(
+        domain_matrix.charpoly(), SympySymbol("lambda"), domain=QQ
+    )
@@ -0,0 +1,29 @@
+import hashlib
+import os
+from typing import Optional
+import lark
+from lark import Lark
+
+
+def build_lalr_parser(
+    grammar_path: str, transformer=None, cache_dir: Optional[str] = None
+) -> Lark:
+    """
+    Builds a LALR parser for the grammar in the given file.
+    If cache_dir is given, the parse tables are serialized to this directory and loaded from there the next time.
+    The file is named by the hash of the grammar, hence changing the grammar never loads outdated tables.
+    """
+    with open(grammar_path) as grammar_file:
+        grammar = grammar_file.read()
+    if cache_dir is None:
+        return Lark(grammar, transformer=transformer, parser="lalr")
+
+    digest = hashlib.sha256((grammar + lark.__version__).encode()).hexdigest()
+    tables_dir = os.path.join(cache_dir, "lark")
+    os.makedirs(tables_dir, exist_ok=True)
+    tables_path = os.path.join(tables_dir, f"{digest}.tables")
+    try:
+        return Lark(grammar, transformer=transformer, parser="lalr", cache=tables_path)
+    except Exception:
+        # the tables may be incomplete if another process is writing them at the same time
+        return Lark(grammar, transformer=transformer, parser="lalr")
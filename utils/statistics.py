@@ -1,4 +1,5 @@
-from typing import Dict
+from typing import Dict, List
+import numpy as np
 from sympy import Expr, sympify
 from math import factorial
 
@@ -26,3 +27,14 @@ def raw_moments_to_centrals(moments: Dict[int, Expr]):
 
 def comb(n, k):
     return 0 if k > n else int(factorial(n) / (factorial(k) * factorial(n - k)))
+
+
+def sample_categorical_batch(weights: List[np.ndarray]) -> np.ndarray:
+    """
+    For a list of k (possibly unnormalized) weight arrays of length n, draws n indices from {0,...,k-1},
+    where the i-th index is drawn according to the i-th entries of the weight arrays.
+    """
+    cumulative = np.cumsum(np.stack(weights, axis=1), axis=1)
+    u = np.random.random(cumulative.shape[0]) * cumulative[:, -1]
+    indices = (u[:, None] >= cumulative).sum(axis=1)
+    return np.minimum(indices, len(weights) - 1)